@@ -21,11 +21,13 @@ import asyncio
 from datetime import datetime
 import traceback
 
+from backend.core.config import settings
+from backend.utils import cassette
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-BLOCKCHAIN_URL = "https://authchaingo.onrender.com/api"
+BLOCKCHAIN_URL = settings.BLOCKCHAIN_URL
 
 router = APIRouter()
 
@@ -177,7 +179,9 @@ async def submit_critical_action(proposal: CriticalActionProposal):
     try:
         logger.info(f"[GOVERNANCE] Submitting proposal {proposal.thread_id} to blockchain")
 
-        resp = requests.post(
+        resp = cassette.post(
+            proposal.thread_id,
+            "submit_action",
             f"{BLOCKCHAIN_URL}/actions",
             json={
                 "proposal_id": proposal.thread_id,
@@ -248,7 +252,9 @@ async def user_approval(request: UserApprovalRequest, background_tasks: Backgrou
     proposal = pending_approvals[request.thread_id]
     
     try:
-        resp = requests.post(
+        resp = cassette.post(
+            request.thread_id,
+            "record_decision",
             BLOCKCHAIN_URL + "/blocks",
             json={
                 "proposal_id": request.thread_id,
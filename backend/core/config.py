@@ -11,6 +11,12 @@ class Settings(BaseSettings):
     Reads .env file
     - Gemini API Key
     - Local LLM usage flag and model name
+    - Blockchain governance service URL
+    - Per-session sandbox lifetime
+    - Cassette record/replay of LLM and blockchain calls
+    - Per-turn retrieval of generated tools and duplicate detection before generating new ones
+    - Worker processes and resource limits for generated tools
+    - Runtime budget candidate tools are benchmarked against before approval
     """
     USE_LOCAL_LLM: bool = os.getenv("USE_LOCAL_LLM", "False") 
     LOCAL_MODEL_NAME: str = "llama3.1"
@@ -21,4 +27,42 @@ class Settings(BaseSettings):
 
     CORS_ORIGINS: list = ["http://localhost:3000", "https://auth-chain-five.vercel.app/"]
 
+    BLOCKCHAIN_URL: str = "https://authchaingo.onrender.com/api"
+
+    # Per-session sandboxes are removed after this many idle seconds
+    SESSION_IDLE_TIMEOUT: int = 3600
+    SESSION_GC_INTERVAL: int = 60
+
+    # "off", "record" or "replay" - see backend/utils/cassette.py
+    CASSETTE_MODE: str = "off"
+    CASSETTE_DIR: str = "./cassettes"
+    CASSETTE_REPLAY_FILE: str = ""
+    # 0 replays at full speed, 1.0 sleeps for the recorded latency of each call
+    CASSETTE_REPLAY_LATENCY_SCALE: float = 0.0
+
+    # Generated tools bound per call_model turn (BM25 over the recent messages); core tools are always bound
+    TOOL_RETRIEVAL_TOP_K: int = 8
+    TOOL_RETRIEVAL_MESSAGES: int = 6
+    # Share (0-1, idf-weighted) of a tool request's terms an existing tool must cover to be reused instead of generated
+    TOOL_DEDUP_THRESHOLD: float = 0.75
+    # ...and share of the tool's own name or description terms the request must cover in turn
+    TOOL_DEDUP_TOOL_COVERAGE: float = 0.5
+
+    # Generated tools run in worker processes (services/tool_creation_service/worker_pool.py)
+    TOOL_SANDBOX: bool = True
+    TOOL_WORKERS: int = 2
+    TOOL_WORKER_MAX_CALLS: int = 200
+    TOOL_CPU_SECONDS: float = 5.0
+    TOOL_WALL_SECONDS: float = 10.0
+    # Address space a worker may grow by while running tools
+    TOOL_WORKER_MEMORY_MB: int = 512
+
+    # Candidate tools are timed on synthetic inputs of these sizes before approval (microbench.py);
+    # a call slower than TOOL_BENCH_MAX_SECONDS or peaking above TOOL_BENCH_MAX_PEAK_MB is rejected
+    TOOL_BENCHMARK: bool = True
+    TOOL_BENCH_SIZES: list = [10, 100, 1000]
+    TOOL_BENCH_REPEAT: int = 5
+    TOOL_BENCH_MAX_SECONDS: float = 0.25
+    TOOL_BENCH_MAX_PEAK_MB: float = 32.0
+
 settings = Settings()
\ No newline at end of file
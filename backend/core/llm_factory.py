@@ -1,7 +1,5 @@
 # -----  LLM handler @ backend/core/llm_factory.py -----
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_ollama import ChatOllama
 from backend.core.config import settings
 
 from backend.utils.logger import get_logger
@@ -11,16 +9,23 @@ logger=get_logger(__name__)
 def get_llm():
     """
     Returns the configured LLM backend (Gemini or Local).
+
+    Provider SDKs are imported here rather than at module load, so only the
+    backend that is actually configured is ever imported.
     """
     if settings.USE_LOCAL_LLM:
+        from langchain_ollama import ChatOllama
+
         logger.info(f"LOADING LOCAL MODEL: {settings.LOCAL_MODEL_NAME}")
 
         return ChatOllama(
             model=settings.LOCAL_MODEL_NAME,
             temperature=0,
         )
-    
+
     else:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         logger.info("LOADING GEMINI CLOUD MODEL")
         return ChatGoogleGenerativeAI(
             model="models/gemini-2.5-flash-lite",
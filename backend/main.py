@@ -4,23 +4,28 @@ from contextlib import asynccontextmanager
 import uvicorn
 
 from backend.utils.logger import get_logger
-from backend.utils.setup_sandbox import clean_environment, create_scaffolding, init_db
+from backend.utils.setup_sandbox import provision_sandbox
 
 logger = get_logger(__name__)
 
 logger.info("Pre-flight: Initializing Sandbox...")
-clean_environment()
-create_scaffolding()
-init_db()
+provision_sandbox()
 
 from backend.api.endpoints import router as api_router
+from services.ai_service.ai_tools.db_setup import DB_PATH
+from services.ai_service.ai_tools.schema_cache import warm_schema_cache
+from services.tool_creation_service.worker_pool import get_worker_pool, warm_worker_pool
+
+warm_schema_cache(DB_PATH)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
     logger.info("🚀 API Lifespan started")
+    warm_worker_pool()
     yield
     logger.info("🛑 API Lifespan shutting down")
+    get_worker_pool().shutdown()
 
 app = FastAPI(
     title="AuthChain AI Agent API",
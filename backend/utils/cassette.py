@@ -0,0 +1,242 @@
+# ----- record/replay of LLM and blockchain interactions @ backend/utils/cassette.py -----
+#
+# CASSETTE_MODE=record  writes one compact JSON-lines cassette per thread id
+# CASSETTE_MODE=replay  serves the same calls back from the cassette, in order, per call site
+#
+# Each line is one interaction: {"kind", "site", "req", "ms", ...response}. Requests are
+# stored as a short hash only, which is enough to flag a replay that has diverged.
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from backend.core.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class CassetteMiss(RuntimeError):
+    """Raised in replay mode when the cassette has no recorded interaction left for a call site."""
+
+# Per-run values in blockchain payloads; a replay runs under a fresh thread id
+VOLATILE_KEYS = {"timestamp", "thread_id", "proposal_id", "checkpoint_id"}
+
+def _stable(payload: Any) -> Any:
+    """Drops per-run noise (message ids, timestamps, thread ids) so identical requests hash identically."""
+    from langchain_core.messages import BaseMessage
+
+    if isinstance(payload, BaseMessage):
+        tool_calls = [(tc["name"], tc["args"]) for tc in getattr(payload, "tool_calls", None) or []]
+        return [payload.type, payload.content, tool_calls]
+    if isinstance(payload, dict):
+        return {key: _stable(value) for key, value in payload.items() if key not in VOLATILE_KEYS}
+    if isinstance(payload, (list, tuple)):
+        return [_stable(item) for item in payload]
+    return payload
+
+def _compact_message(message: dict) -> dict:
+    """Drops empty fields from a serialized message; message constructors default them on replay."""
+    data = {key: value for key, value in message["data"].items() if value not in (None, [], {}) or key == "content"}
+    return {"type": message["type"], "data": data}
+
+def _request_hash(payload: Any) -> str:
+    encoded = json.dumps(_stable(payload), sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+class ReplayedResponse:
+    """Minimal stand-in for requests.Response built from a cassette entry."""
+
+    def __init__(self, status_code: int, body: Any, is_json: bool):
+        self.status_code = status_code
+        self._body = body
+        self._is_json = is_json
+
+    @property
+    def text(self) -> str:
+        return json.dumps(self._body) if self._is_json else self._body
+
+    def json(self):
+        return self._body if self._is_json else json.loads(self._body)
+
+class Cassette:
+    """Recorded interactions of one thread."""
+
+    def __init__(self, path: str, mode: str):
+        self.path = path
+        self.mode = mode
+        self.last_used = time.time()
+        self._lock = threading.Lock()
+        self._queues: Dict[tuple, deque] = defaultdict(deque)
+
+        if mode == "replay":
+            with open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._queues[(entry["kind"], entry["site"])].append(entry)
+            logger.info(f"📼 Loaded cassette {path}")
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def append(self, entry: dict):
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+
+    def take(self, kind: str, site: str, request: Optional[str] = None) -> dict:
+        with self._lock:
+            queue = self._queues.get((kind, site))
+            if not queue:
+                raise CassetteMiss(f"Cassette {self.path} has no more '{kind}' interactions for {site}")
+            entry = queue.popleft()
+
+        if request and entry.get("req") and entry["req"] != request:
+            logger.warning(f"📼 Replay diverged at {site}: recorded request {entry['req']}, got {request}")
+
+        scale = settings.CASSETTE_REPLAY_LATENCY_SCALE
+        if scale > 0 and entry.get("ms"):
+            time.sleep(entry["ms"] / 1000 * scale)
+        return entry
+
+    def peek(self, kind: str, site: str) -> Optional[dict]:
+        queue = self._queues.get((kind, site))
+        return queue[0] if queue else None
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+def cassette_path(thread_id: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", thread_id)
+    return os.path.join(settings.CASSETTE_DIR, f"{safe}.jsonl")
+
+def get_cassette(thread_id: Optional[str]) -> Optional[Cassette]:
+    """
+    Cassette for a thread, or None when recording is off (or there is no thread id).
+    In replay mode CASSETTE_REPLAY_FILE, when set, is replayed independently for every
+    thread - handy for driving many sessions from one real recording.
+    """
+    mode = settings.CASSETTE_MODE
+    if mode not in ("record", "replay") or not thread_id:
+        return None
+
+    with _cassettes_lock:
+        if thread_id not in _cassettes:
+            path = cassette_path(thread_id)
+            if mode == "replay" and settings.CASSETTE_REPLAY_FILE and not os.path.exists(path):
+                path = settings.CASSETTE_REPLAY_FILE
+            cassette = Cassette(path, mode)
+            if mode == "record":
+                cassette.append({"kind": "meta", "site": "session", "thread_id": thread_id, "created_at": datetime.now().isoformat()})
+            _cassettes[thread_id] = cassette
+        cassette = _cassettes[thread_id]
+        cassette.last_used = time.time()
+        return cassette
+
+def release_cassettes(match: Callable[[str], bool]) -> List[str]:
+    """
+    Forgets the cassettes of the thread ids `match` selects (their session ended); a
+    thread that comes back appends to / replays from its file afresh.
+
+    Returns:
+        The released thread ids
+    """
+    with _cassettes_lock:
+        released = [thread_id for thread_id in _cassettes if match(thread_id)]
+        for thread_id in released:
+            del _cassettes[thread_id]
+    if released:
+        logger.info(f"📼 Released {len(released)} cassette(s)")
+    return released
+
+def release_idle_cassettes(max_idle: Optional[float] = None) -> List[str]:
+    """Forgets cassettes unused for `max_idle` seconds (threads that never opened a session sandbox)."""
+    max_idle = settings.SESSION_IDLE_TIMEOUT if max_idle is None else max_idle
+    cutoff = time.time() - max_idle
+    return release_cassettes(lambda thread_id: _cassettes[thread_id].last_used < cutoff)
+
+def note(thread_id: Optional[str], site: str, data: dict) -> Optional[dict]:
+    """
+    Records an external input of a session (the user query, an approval decision).
+    In replay mode returns the recorded value instead, or None if there is none.
+    """
+    cassette = get_cassette(thread_id)
+    if cassette is None:
+        return None
+    if cassette.mode == "record":
+        cassette.append({"kind": "input", "site": site, **data})
+        return None
+    if cassette.peek("input", site) is None:
+        return None
+    return cassette.take("input", site)
+
+def invoke_llm(llm, prompt, thread_id: Optional[str], site: str):
+    """llm.invoke(prompt), recorded to or replayed from the thread's cassette."""
+    cassette = get_cassette(thread_id)
+    if cassette is None:
+        return llm.invoke(prompt)
+
+    from langchain_core.messages import message_to_dict, messages_from_dict
+
+    request = _request_hash(prompt)
+    if cassette.mode == "replay":
+        entry = cassette.take("llm", site, request)
+        return messages_from_dict([entry["response"]])[0]
+
+    start = time.perf_counter()
+    response = llm.invoke(prompt)
+    cassette.append({
+        "kind": "llm",
+        "site": site,
+        "req": request,
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+        "response": _compact_message(message_to_dict(response)),
+    })
+    return response
+
+def post(thread_id: Optional[str], site: str, url: str, **kwargs):
+    """
+    requests.post(url, **kwargs), recorded to or replayed from the thread's cassette.
+    Connection failures are recorded too and re-raised as RequestException on replay.
+    """
+    cassette = get_cassette(thread_id)
+    if cassette is None:
+        return requests.post(url, **kwargs)
+
+    request = _request_hash({"path": urlparse(url).path, "json": kwargs.get("json")})
+    if cassette.mode == "replay":
+        entry = cassette.take("http", site, request)
+        if "error" in entry:
+            raise requests.exceptions.ConnectionError(entry["error"])
+        return ReplayedResponse(entry["status"], entry["body"], entry["is_json"])
+
+    start = time.perf_counter()
+    entry = {"kind": "http", "site": site, "req": request}
+    try:
+        resp = requests.post(url, **kwargs)
+    except requests.exceptions.RequestException as e:
+        entry.update({"ms": round((time.perf_counter() - start) * 1000, 1), "error": f"{type(e).__name__}: {e}"})
+        cassette.append(entry)
+        raise
+
+    try:
+        body, is_json = resp.json(), True
+    except ValueError:
+        body, is_json = resp.text, False
+
+    entry.update({
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+        "status": resp.status_code,
+        "body": body,
+        "is_json": is_json,
+    })
+    cassette.append(entry)
+    return resp
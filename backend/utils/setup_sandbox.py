@@ -1,10 +1,14 @@
 # ----- setup sandbox environment @ backend/utils/setup_sandbox.py -----
 
 import os
-import sqlite3
+import sys
+import json
+import errno
+import hashlib
 import shutil
 import subprocess
 from backend.utils.logger import get_logger
+from backend.utils.sqlite_pool import connect
 
 logger=get_logger(__name__)
 
@@ -12,85 +16,308 @@ SANDBOX_ROOT = "./services/ai_service/sandbox"
 DB_NAME = "task_tracker.db"
 DB_PATH = os.path.join(SANDBOX_ROOT, DB_NAME)
 
-def clean_environment():
-    """Removes the existing sandbox directory to ensure a fresh start."""
-    if os.path.exists(SANDBOX_ROOT):
-        logger.info(f"🧹 Cleaning up existing sandbox at {SANDBOX_ROOT}...")
-        shutil.rmtree(SANDBOX_ROOT)
+# Bump when the scaffold changes in a way the fingerprint below cannot see
+TEMPLATE_VERSION = 2
+TEMPLATES_DIR = "./services/ai_service/.sandbox_templates"
+MANIFEST_NAME = ".template_manifest.json"
 
-def create_scaffolding():
-    """Creates the directory structure, dummy files, and initializes git."""
-    dirs = ["src", "docs", "scripts", "logs"]
-    for d in dirs:
-        os.makedirs(os.path.join(SANDBOX_ROOT, d), exist_ok=True)
-
-    files = {
-        "src/auth.py": "def verify_signature(tx):\n    return True  # TODO: Implement actual ECDSA",
-        "src/main.py": "import auth\nprint('System Online')",
-        "docs/ARCHITECTURE.md": "# System Architecture\nThis describes the AuthChain flow.",
-        "scripts/clean.sh": "#!/bin/bash\nrm -rf ./logs/*"
-    }
-    
-    for path, content in files.items():
-        full_path = os.path.join(SANDBOX_ROOT, path)
-        with open(full_path, "w") as f:
-            f.write(content)
-            
-    logger.info(f"📂 Directories and files created in {SANDBOX_ROOT}")
+# The agent graph keeps its checkpoint database in the sandbox root; a restore must not pull it out from under an open connection
+PRESERVED_FILES = {"checkpoints.sqlite", "checkpoints.sqlite-wal", "checkpoints.sqlite-shm", "checkpoints.sqlite-journal"}
 
-    try:
-        subprocess.run(["git", "init"], cwd=SANDBOX_ROOT, check=True, stdout=subprocess.DEVNULL)
-        subprocess.run(["git", "add", "."], cwd=SANDBOX_ROOT, check=True, stdout=subprocess.DEVNULL)
-        subprocess.run(["git", "commit", "-m", "Initial scaffold"], cwd=SANDBOX_ROOT, check=True, stdout=subprocess.DEVNULL)
-        logger.info(f"🌲 Git repository initialized in {SANDBOX_ROOT}")
-    except Exception as e:
-        logger.warning(f"⚠️ Warning: Could not initialize git: {e}")
-def init_db():
-    """
-    Initializes the database with schema and seed data.
-    """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+SCAFFOLD_DIRS = ["src", "docs", "scripts", "logs"]
 
-    cursor.execute("""
+SCAFFOLD_FILES = {
+    "src/auth.py": "def verify_signature(tx):\n    return True  # TODO: Implement actual ECDSA",
+    "src/main.py": "import auth\nprint('System Online')",
+    "docs/ARCHITECTURE.md": "# System Architecture\nThis describes the AuthChain flow.",
+    "scripts/clean.sh": "#!/bin/bash\nrm -rf ./logs/*"
+}
+
+SCHEMA_SQL = [
+    """
     CREATE TABLE IF NOT EXISTS projects (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         name TEXT NOT NULL,
         status TEXT DEFAULT 'Pending',
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
-    """)
-
-    cursor.execute("""
+    """,
+    """
     CREATE TABLE IF NOT EXISTS secrets (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         key_name TEXT UNIQUE NOT NULL,
         value TEXT NOT NULL
     );
-    """)
+    """,
+]
+
+SEED_PROJECTS = [
+    ('AuthChain Core', 'active'),
+    ('Legacy Migration', 'deprecated'),
+    ('UI Refactor', 'Pending')
+]
+
+SEED_SECRETS = [
+    ('PROD_DB_AUTH', 'sk_live_51M...'),
+    ('STAGING_KEY', 'v0_stg_... ')
+]
+
+def clean_environment(root: str = SANDBOX_ROOT):
+    """Removes the existing sandbox directory to ensure a fresh start."""
+    if os.path.exists(root):
+        logger.info(f"🧹 Cleaning up existing sandbox at {root}...")
+        shutil.rmtree(root)
+
+def create_scaffolding(root: str = SANDBOX_ROOT):
+    """Creates the directory structure, dummy files, and initializes git."""
+    for d in SCAFFOLD_DIRS:
+        os.makedirs(os.path.join(root, d), exist_ok=True)
+
+    for path, content in SCAFFOLD_FILES.items():
+        full_path = os.path.join(root, path)
+        with open(full_path, "w") as f:
+            f.write(content)
+
+    logger.info(f"📂 Directories and files created in {root}")
+
+    # Explicit identity so the scaffold commit does not depend on the host's git config
+    identity = ["-c", "user.name=AuthChain Sandbox", "-c", "user.email=sandbox@authchain.local"]
+    try:
+        subprocess.run(["git", "init"], cwd=root, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.run(["git", "add", "."], cwd=root, check=True, stdout=subprocess.DEVNULL)
+        subprocess.run(["git", *identity, "commit", "-m", "Initial scaffold"], cwd=root, check=True, stdout=subprocess.DEVNULL)
+        logger.info(f"🌲 Git repository initialized in {root}")
+    except Exception as e:
+        logger.warning(f"⚠️ Warning: Could not initialize git: {e}")
+
+def init_db(db_path: str = DB_PATH):
+    """
+    Initializes the database with schema and seed data.
+    Uses the tuned writer connection, so the file is created in WAL mode.
+    """
+    conn = connect(db_path)
+    cursor = conn.cursor()
+
+    for statement in SCHEMA_SQL:
+        cursor.execute(statement)
 
     logger.info("Seeding database with initial data...")
-    
-    projects_data = [
-        ('AuthChain Core', 'active'),
-        ('Legacy Migration', 'deprecated'),
-        ('UI Refactor', 'Pending')
-    ]
-    cursor.executemany("INSERT OR IGNORE INTO projects (name, status) VALUES (?, ?)", projects_data)
-
-    secrets_data = [
-        ('PROD_DB_AUTH', 'sk_live_51M...'),
-        ('STAGING_KEY', 'v0_stg_... ')
-    ]
-    cursor.executemany("INSERT OR IGNORE INTO secrets (key_name, value) VALUES (?, ?)", secrets_data)
+
+    cursor.executemany("INSERT OR IGNORE INTO projects (name, status) VALUES (?, ?)", SEED_PROJECTS)
+    cursor.executemany("INSERT OR IGNORE INTO secrets (key_name, value) VALUES (?, ?)", SEED_SECRETS)
 
     conn.commit()
     conn.close()
-    logger.info(f"Database initialized at {DB_PATH}")
+    logger.info(f"Database initialized at {db_path}")
+
+# --- TEMPLATE SNAPSHOTS ---
+
+def _scaffold_fingerprint() -> str:
+    """Hash of everything that goes into the scaffold, so template edits produce a new template directory."""
+    spec = json.dumps({
+        "version": TEMPLATE_VERSION,
+        "dirs": SCAFFOLD_DIRS,
+        "files": SCAFFOLD_FILES,
+        "schema": SCHEMA_SQL,
+        "projects": SEED_PROJECTS,
+        "secrets": SEED_SECRETS,
+    }, sort_keys=True)
+    return hashlib.sha256(spec.encode()).hexdigest()[:12]
+
+def get_template_path() -> str:
+    """Directory holding the snapshot for the current scaffold version."""
+    return os.path.join(TEMPLATES_DIR, f"v{TEMPLATE_VERSION}-{_scaffold_fingerprint()}")
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def compute_tree_hash(root: str) -> tuple:
+    """
+    Content hash of a sandbox tree.
+
+    Returns:
+        (tree_hash, {relative_path: sha256}) - skips the manifest and preserved checkpoint files
+    """
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in filenames:
+            if dirpath == root and (name == MANIFEST_NAME or name in PRESERVED_FILES):
+                continue
+            full_path = os.path.join(dirpath, name)
+            rel_path = os.path.relpath(full_path, root).replace(os.sep, "/")
+            files[rel_path] = _hash_file(full_path)
+
+    tree = hashlib.sha256()
+    for rel_path in sorted(files):
+        tree.update(f"{rel_path}\0{files[rel_path]}\n".encode())
+    return tree.hexdigest(), files
+
+def build_template(force: bool = False) -> str:
+    """
+    Builds the scaffold (files, .git and seeded task_tracker.db) once into a versioned template.
+
+    The template is built in a scratch directory and renamed into place, so a crashed
+    build never leaves a half-written template behind.
+
+    Returns:
+        Path of the template directory
+    """
+    template_path = get_template_path()
+
+    if force and os.path.exists(template_path):
+        shutil.rmtree(template_path)
+
+    if os.path.exists(os.path.join(template_path, MANIFEST_NAME)):
+        return template_path
+
+    os.makedirs(TEMPLATES_DIR, exist_ok=True)
+    build_path = f"{template_path}.build-{os.getpid()}"
+    clean_environment(build_path)
+
+    logger.info(f"📦 Building sandbox template at {template_path}...")
+    create_scaffolding(build_path)
+    init_db(os.path.join(build_path, DB_NAME))
+
+    tree_hash, files = compute_tree_hash(build_path)
+    with open(os.path.join(build_path, MANIFEST_NAME), "w") as f:
+        json.dump({
+            "version": TEMPLATE_VERSION,
+            "fingerprint": _scaffold_fingerprint(),
+            "tree_hash": tree_hash,
+            "files": files,
+        }, f, indent=2)
+
+    try:
+        os.rename(build_path, template_path)
+    except OSError:
+        # Another process finished the same template first
+        shutil.rmtree(build_path, ignore_errors=True)
+
+    logger.info(f"📦 Sandbox template ready ({len(files)} files, hash {tree_hash[:12]})")
+    return template_path
+
+def load_manifest(template_path: str) -> dict:
+    with open(os.path.join(template_path, MANIFEST_NAME), "r") as f:
+        return json.load(f)
+
+# Linux FICLONE ioctl: shares extents between files on btrfs/xfs/overlay-on-xfs etc.
+_FICLONE = 0x40049409
+_reflink_supported = sys.platform.startswith("linux")
+
+def _reflink_or_copy(src: str, dst: str):
+    """Copies a file as a reflink when the filesystem supports it, otherwise as a regular copy."""
+    global _reflink_supported
+
+    if _reflink_supported:
+        import fcntl
+
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                shutil.copystat(src, dst)
+                return
+            except OSError as e:
+                if e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.EBADF):
+                    raise
+                _reflink_supported = False
+                logger.info("Reflinks not supported on this filesystem, falling back to copies")
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
+    shutil.copy2(src, dst)
+
+def _is_immutable(rel_path: str) -> bool:
+    """Git object files are written once and never modified in place, so they can be shared by hardlink."""
+    return rel_path.startswith(".git/objects/")
+
+def clone_tree(src: str, dst: str, hardlink=_is_immutable):
+    """
+    Clones a directory tree cheaply.
+
+    Files accepted by `hardlink(relative_path)` are hardlinked, everything else is
+    reflinked where supported and copied otherwise. Callers must only hardlink files
+    that are never modified in place.
+    """
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel_dir = os.path.relpath(dirpath, src)
+        target_dir = dst if rel_dir == "." else os.path.join(dst, rel_dir)
+        os.makedirs(target_dir, exist_ok=True)
+
+        for name in filenames:
+            if rel_dir == "." and name == MANIFEST_NAME:
+                continue
+            src_file = os.path.join(dirpath, name)
+            dst_file = os.path.join(target_dir, name)
+            rel_path = name if rel_dir == "." else os.path.join(rel_dir, name).replace(os.sep, "/")
+
+            if hardlink(rel_path):
+                try:
+                    os.link(src_file, dst_file)
+                    continue
+                except OSError:
+                    pass
+            _reflink_or_copy(src_file, dst_file)
+
+def _clear_sandbox(root: str):
+    """Empties the sandbox root, keeping the checkpoint database files."""
+    if not os.path.isdir(root):
+        os.makedirs(root, exist_ok=True)
+        return
+
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name in PRESERVED_FILES:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
+
+def restore_sandbox(root: str = SANDBOX_ROOT, verify: bool = True) -> str:
+    """
+    Resets the sandbox to the template snapshot, building the template on first use.
+
+    Cheap enough to call before every test. With `verify`, the restored tree is checked
+    against the template's content hash; a mismatch rebuilds the template once.
+
+    Returns:
+        Content hash of the restored sandbox
+    """
+    for attempt in range(2):
+        template_path = build_template(force=attempt > 0)
+        manifest = load_manifest(template_path)
+
+        _clear_sandbox(root)
+        clone_tree(template_path, root)
+
+        if not verify:
+            return manifest["tree_hash"]
+
+        tree_hash, _ = compute_tree_hash(root)
+        if tree_hash == manifest["tree_hash"]:
+            logger.info(f"♻️ Sandbox restored from template {os.path.basename(template_path)} (hash {tree_hash[:12]})")
+            return tree_hash
+
+        logger.error(f"Sandbox hash mismatch after restore (got {tree_hash[:12]}, expected {manifest['tree_hash'][:12]}), rebuilding template")
+
+    raise RuntimeError(f"Sandbox restore could not be verified against template {template_path}")
+
+def provision_sandbox() -> str:
+    """Boot-time sandbox setup: restores the sandbox from its template snapshot."""
+    return restore_sandbox(SANDBOX_ROOT)
 
 if __name__ == "__main__":
     logger.info("Initializing Sandbox Environment...")
-    clean_environment()
-    create_scaffolding()
-    init_db()
-    logger.info("Setup Complete.")
\ No newline at end of file
+    if "--rebuild" in sys.argv:
+        build_template(force=True)
+    provision_sandbox()
+    logger.info("Setup Complete.")
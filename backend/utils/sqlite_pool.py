@@ -0,0 +1,124 @@
+# ----- tuned SQLite connections for the sandbox databases @ backend/utils/sqlite_pool.py -----
+#
+# Every connection to a task_tracker.db goes through here so they all get the same pragmas:
+#   journal_mode=WAL   readers never block the writer and the writer never blocks readers
+#   synchronous=NORMAL safe with WAL; commits no longer fsync the main file
+#   mmap_size          reads are served from the page cache instead of read() syscalls
+#   cache_size         larger per-connection page cache
+#   busy_timeout       a locked database waits instead of failing with "database is locked"
+# Per database there is a small pool of `mode=ro` reader connections for safe tools and one
+# writer connection, serialized by a lock, for approved (critical) statements.
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BUSY_TIMEOUT_MS = 5000
+MMAP_SIZE = 64 * 1024 * 1024
+# Negative cache_size is in KiB
+CACHE_SIZE_KIB = 8 * 1024
+# Idle readers kept open per database; extra readers are opened on demand and closed on return
+MAX_IDLE_READERS = 4
+
+def connect(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Opens a tuned connection. Writers also switch the database to WAL (a persistent,
+    per-file setting); read-only connections use whatever mode the file is in.
+    """
+    if read_only:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False,
+                               timeout=BUSY_TIMEOUT_MS / 1000)
+    else:
+        conn = sqlite3.connect(db_path, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+    return conn
+
+class SQLitePool:
+    """Reader pool and single writer for one database file."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.idle: List[sqlite3.Connection] = []
+        self.idle_lock = threading.Lock()
+        self.writer_lock = threading.Lock()
+        self.writer_conn = None
+        self.closed = False
+
+    @contextmanager
+    def reader(self):
+        """
+        Checks out a read-only connection. Callers must leave it as they found it
+        (authorizer and progress handler cleared, no open transaction).
+        """
+        with self.idle_lock:
+            conn = self.idle.pop() if self.idle else None
+        if conn is None:
+            conn = connect(self.db_path, read_only=True)
+
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self.idle_lock:
+                keep = not self.closed and len(self.idle) < MAX_IDLE_READERS
+                if keep:
+                    self.idle.append(conn)
+            if not keep:
+                conn.close()
+
+    @contextmanager
+    def writer(self):
+        """
+        The database's only writer connection, held exclusively for the duration of the block.
+        Commits when the block succeeds and rolls back when it raises.
+        """
+        with self.writer_lock:
+            if self.writer_conn is None:
+                self.writer_conn = connect(self.db_path)
+            conn = self.writer_conn
+            try:
+                yield conn
+                if conn.in_transaction:
+                    conn.commit()
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+    def close(self):
+        with self.idle_lock:
+            self.closed = True
+            idle, self.idle = self.idle, []
+        for conn in idle:
+            conn.close()
+        with self.writer_lock:
+            if self.writer_conn is not None:
+                self.writer_conn.close()
+                self.writer_conn = None
+
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path: str) -> SQLitePool:
+    with _pools_lock:
+        if db_path not in _pools:
+            _pools[db_path] = SQLitePool(db_path)
+            logger.info(f"🔌 SQLite pool opened for {db_path}")
+        return _pools[db_path]
+
+def close_pool(db_path: str):
+    with _pools_lock:
+        pool = _pools.pop(db_path, None)
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,204 @@
+# ----- offline load test for the FastAPI backend @ benchmarks/api_load.py -----
+#
+# Starts backend.main:app with the scripted fake LLM and a local fake governance API,
+# then simulates users going through execute -> poll -> critical action -> approve -> response.
+#
+#   python -m benchmarks.api_load --users 8 --sessions-per-user 5
+#   python -m benchmarks.api_load --users 32 --chain-latency 0.05 --chain-failure-rate 0.05
+
+import argparse
+import contextlib
+import os
+import socket
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.common import summarize, write_results
+from benchmarks.fake_blockchain import FakeBlockchain
+from benchmarks.fake_llm import install_fake_llm
+
+QUERY = "[scenario:critical_write] Make verify_signature reject unsigned transactions."
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class LoadRecorder:
+    """Thread-safe collection of request latencies, outcomes and errors."""
+
+    def __init__(self):
+        self.requests = defaultdict(list)
+        self.status_codes = Counter()
+        self.errors = Counter()
+        self.approval_round_trips = []
+        self.sessions = []
+        self._lock = threading.Lock()
+
+    def request(self, http: requests.Session, method: str, base_url: str, route: str, label: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            resp = http.request(method, base_url + route, timeout=30, **kwargs)
+        except requests.exceptions.RequestException as e:
+            with self._lock:
+                self.errors[f"{label}: {type(e).__name__}"] += 1
+            raise
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.requests[label].append(elapsed)
+            self.status_codes[f"{label} {resp.status_code}"] += 1
+            if resp.status_code >= 400:
+                self.errors[f"{label}: HTTP {resp.status_code}"] += 1
+        return resp
+
+    def record(self, attr: str, value):
+        with self._lock:
+            getattr(self, attr).append(value)
+
+def _poll_status(recorder: LoadRecorder, http, base_url: str, thread_id: str, waiting_for: set,
+                 poll_interval: float, timeout: float) -> str:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        status = recorder.request(http, "GET", base_url, f"/api/v1/agent/status/{thread_id}", "GET /agent/status").json()["status"]
+        if status in waiting_for or status.startswith("ERROR"):
+            return status
+        time.sleep(poll_interval)
+    return "TIMEOUT"
+
+def run_user_session(recorder: LoadRecorder, base_url: str, poll_interval: float, timeout: float):
+    """One simulated user: execute -> poll -> fetch critical action -> approve -> poll -> response."""
+    http = requests.Session()
+    start = time.perf_counter()
+    outcome = "COMPLETED"
+
+    try:
+        resp = recorder.request(http, "POST", base_url, "/api/v1/agent/execute", "POST /agent/execute", json={"query": QUERY})
+        thread_id = resp.json()["thread_id"]
+
+        status = _poll_status(recorder, http, base_url, thread_id, {"AWAITING_APPROVAL", "COMPLETED"}, poll_interval, timeout)
+        if status != "AWAITING_APPROVAL":
+            outcome = f"no critical action ({status})"
+        else:
+            recorder.request(http, "GET", base_url, f"/api/v1/critical-action/{thread_id}", "GET /critical-action")
+
+            approved_at = time.perf_counter()
+            recorder.request(http, "POST", base_url, "/api/v1/user/approve", "POST /user/approve",
+                             json={"thread_id": thread_id, "approved": True})
+
+            status = _poll_status(recorder, http, base_url, thread_id, {"COMPLETED"}, poll_interval, timeout)
+            if status == "COMPLETED":
+                recorder.record("approval_round_trips", time.perf_counter() - approved_at)
+            else:
+                outcome = status
+
+        recorder.request(http, "GET", base_url, f"/api/v1/agent/response/{thread_id}", "GET /agent/response")
+    except requests.exceptions.RequestException:
+        outcome = "REQUEST_FAILED"
+    finally:
+        http.close()
+
+    recorder.record("sessions", {"outcome": outcome, "seconds": time.perf_counter() - start})
+
+def start_backend(port: int):
+    """Runs backend.main:app under uvicorn in a background thread."""
+    import uvicorn
+    from backend.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Backend failed to start")
+        time.sleep(0.05)
+    return server, thread
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test of the AuthChain API approval flow")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent simulated users")
+    parser.add_argument("--sessions-per-user", type=int, default=3)
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--session-timeout", type=float, default=60.0)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call")
+    parser.add_argument("--chain-latency", type=float, default=0.0, help="Mean seconds per governance API call")
+    parser.add_argument("--chain-jitter", type=float, default=0.0)
+    parser.add_argument("--chain-failure-rate", type=float, default=0.0, help="Fraction of governance calls answered with 503")
+    parser.add_argument("--verbose", action="store_true", help="Keep the agent runner's console output")
+    parser.add_argument("--output", help="Results JSON path (default: bench_results/api_load_<timestamp>.json)")
+    args = parser.parse_args()
+
+    chain = FakeBlockchain(latency=args.chain_latency, jitter=args.chain_jitter, failure_rate=args.chain_failure_rate).start()
+    # Must be set before anything imports backend.core.config
+    os.environ["BLOCKCHAIN_URL"] = chain.url
+
+    install_fake_llm(latency=args.llm_latency)
+
+    port = _free_port()
+    server, thread = start_backend(port)
+    base_url = f"http://127.0.0.1:{port}"
+
+    recorder = LoadRecorder()
+    total_sessions = args.users * args.sessions_per_user
+
+    # The agent runner prints every node to stdout; that would dominate a load test
+    with open(os.devnull, "w") as devnull:
+        with contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.users) as pool:
+                for _ in range(total_sessions):
+                    pool.submit(run_user_session, recorder, base_url, args.poll_interval, args.session_timeout)
+            wall = time.perf_counter() - start
+
+    server.should_exit = True
+    thread.join(timeout=10)
+    chain.stop()
+
+    request_count = sum(len(samples) for samples in recorder.requests.values())
+    outcomes = Counter(session["outcome"] for session in recorder.sessions)
+    failed_sessions = total_sessions - outcomes.get("COMPLETED", 0)
+
+    results = {
+        "config": vars(args),
+        "wall_seconds": round(wall, 3),
+        "requests": request_count,
+        "requests_per_second": round(request_count / wall, 2),
+        "sessions": total_sessions,
+        "sessions_per_second": round(total_sessions / wall, 3),
+        "session_outcomes": dict(outcomes),
+        "session_error_rate": round(failed_sessions / total_sessions, 4),
+        "request_error_rate": round(sum(recorder.errors.values()) / max(request_count, 1), 4),
+        "approval_round_trip_ms": summarize(recorder.approval_round_trips),
+        "session_latency_ms": summarize(session["seconds"] for session in recorder.sessions),
+        "endpoint_latency_ms": {label: summarize(samples) for label, samples in sorted(recorder.requests.items())},
+        "status_codes": dict(recorder.status_codes),
+        "errors": dict(recorder.errors),
+        "blockchain_calls": dict(chain.stats),
+    }
+
+    print("=" * 80)
+    print(f"{total_sessions} sessions from {args.users} users in {wall:.2f}s")
+    print(f"  {results['requests_per_second']} requests/s, {results['sessions_per_second']} sessions/s")
+    rtt = results["approval_round_trip_ms"]
+    if rtt["count"]:
+        print(f"  approval round trip: p50={rtt['p50']:.1f}ms p95={rtt['p95']:.1f}ms p99={rtt['p99']:.1f}ms")
+    print(f"  session error rate: {results['session_error_rate']:.2%}  request error rate: {results['request_error_rate']:.2%}")
+    print("-" * 80)
+    for label, stats in results["endpoint_latency_ms"].items():
+        print(f"  {label:<24} n={stats['count']:<6} p50={stats['p50']:.2f}ms p95={stats['p95']:.2f}ms")
+    print(f"  blockchain calls: {dict(chain.stats)}")
+    if results["errors"]:
+        print("  errors:")
+        for label, count in results["errors"].items():
+            print(f"    {label}: {count}")
+
+    path = write_results("api_load", results, args.output)
+    print(f"\nResults written to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# ----- shared helpers for benchmark scripts @ benchmarks/common.py -----
+
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import Iterable
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "bench_results")
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+def summarize(values: Iterable[float], scale: float = 1000.0) -> dict:
+    """count/mean/p50/p95/p99/max of a sample, scaled (seconds -> ms by default)."""
+    values = [v * scale for v in values]
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 3),
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "max": round(max(values), 3),
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def write_results(benchmark: str, payload: dict, output: str = None) -> str:
+    """
+    Writes machine-readable results with enough context to compare runs over time.
+    Defaults to bench_results/<benchmark>_<timestamp>.json.
+    """
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{benchmark}_{stamp}.json")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "benchmark": benchmark,
+            "created_at": datetime.now().isoformat(),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            **payload,
+        }, f, indent=2)
+    return output
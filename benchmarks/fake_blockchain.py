@@ -0,0 +1,133 @@
+# ----- local stand-in for the Go governance API @ benchmarks/fake_blockchain.py -----
+#
+# Mirrors the routes the backend calls on services/blockchain_service:
+#   POST /api/actions   submit a proposal  -> {"critical": true, ...}
+#   POST /api/blocks    record a decision  -> 201
+#   GET  /api/blocks    list recorded blocks
+#
+#   python -m benchmarks.fake_blockchain --port 8080 --latency 0.05 --failure-rate 0.02
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeBlockchain:
+    """Governance API double with configurable latency, jitter and failure rate."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.blocks = []
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def _delay_and_fail(self) -> bool:
+        """Sleeps for the simulated latency; True when this request should fail."""
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.failure_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def _handler(self):
+        chain = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_POST(self):
+                payload = self._read_json()
+                route = self.path.rstrip("/")
+                with chain._lock:
+                    chain.stats[f"POST {route}"] += 1
+
+                if chain._delay_and_fail():
+                    with chain._lock:
+                        chain.stats["injected_failures"] += 1
+                    return self._reply(503, {"error": "injected failure"})
+
+                if route == "/api/actions":
+                    return self._reply(200, {
+                        "proposal_id": payload.get("proposal_id"),
+                        "critical": True,
+                        "status": "PENDING",
+                    })
+
+                if route == "/api/blocks":
+                    with chain._lock:
+                        chain.blocks.append(payload)
+                        index = len(chain.blocks)
+                    return self._reply(201, {"index": index, "status": "recorded"})
+
+                return self._reply(404, {"error": "not found"})
+
+            def do_GET(self):
+                route = self.path.rstrip("/")
+                with chain._lock:
+                    chain.stats[f"GET {route}"] += 1
+
+                if chain._delay_and_fail():
+                    with chain._lock:
+                        chain.stats["injected_failures"] += 1
+                    return self._reply(503, {"error": "injected failure"})
+
+                if route == "/api/blocks":
+                    with chain._lock:
+                        return self._reply(200, list(chain.blocks))
+
+                return self._reply(404, {"error": "not found"})
+
+        return Handler
+
+    def start(self) -> "FakeBlockchain":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake of the AuthChain governance API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- seconds around the latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    chain = FakeBlockchain(args.host, args.port, args.latency, args.jitter, args.failure_rate)
+    print(f"Fake blockchain listening on {chain.url}")
+    chain._server.serve_forever()
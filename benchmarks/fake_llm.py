@@ -0,0 +1,115 @@
+# ----- deterministic scripted chat model for offline runs @ benchmarks/fake_llm.py -----
+
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+SCENARIO_PATTERN = re.compile(r"\[scenario:([a-z_]+)\]")
+
+# Each scenario is the list of agent turns. A turn is either tool calls or final text.
+SCENARIOS: Dict[str, List[dict]] = {
+    "explore": [
+        {"tool_calls": [{"name": "list_directory", "args": {"path": "."}}]},
+        {"tool_calls": [{"name": "read_file", "args": {"path": "src/auth.py"}}]},
+        {"tool_calls": [{"name": "search_codebase", "args": {"query": "verify_signature"}}]},
+        {"tool_calls": [{"name": "sql_db_list_tables", "args": {"tool_input": ""}}]},
+        {"tool_calls": [{"name": "git_status", "args": {}}]},
+        {"content": "Task completed: the signature check in src/auth.py is a stub."},
+    ],
+    "critical_write": [
+        {"tool_calls": [{"name": "read_file", "args": {"path": "src/auth.py"}}]},
+        {"tool_calls": [{"name": "write_file", "args": {
+            "path": "src/auth.py",
+            "content": "def verify_signature(tx):\n    return bool(tx.get('signature'))\n",
+        }}]},
+        {"content": "Task completed: src/auth.py now rejects unsigned transactions."},
+    ],
+    "loop": [
+        {"tool_calls": [{"name": "list_directory", "args": {"path": "."}}], "repeat": True},
+    ],
+}
+
+GATE_SUMMARY = "The agent will update the file to finish the requested change; the file will contain the new implementation."
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model that replays a fixed script instead of calling a provider.
+
+    The scenario is picked from a `[scenario:<name>]` tag in the first human message and
+    the turn from the number of AI messages already in the conversation, so replies are
+    deterministic and independent across concurrent threads. One-off prompts without
+    the system prompt (e.g. the critical_gate summary) get a fixed summary.
+    """
+
+    scenarios: Dict[str, List[dict]] = SCENARIOS
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _next_turn(self, messages: List[BaseMessage]) -> dict:
+        # Agent turns always start with the system prompt; one-off prompts (critical_gate) do not
+        if not messages or not isinstance(messages[0], SystemMessage):
+            return {"content": GATE_SUMMARY}
+
+        scenario = None
+        for msg in messages:
+            if isinstance(msg, HumanMessage):
+                match = SCENARIO_PATTERN.search(str(msg.content))
+                if match:
+                    scenario = match.group(1)
+                break
+
+        if scenario is None:
+            return {"content": GATE_SUMMARY}
+
+        script = self.scenarios[scenario]
+        turn = sum(1 for msg in messages if isinstance(msg, AIMessage))
+
+        if turn < len(script):
+            return script[turn]
+        if script[-1].get("repeat"):
+            return script[-1]
+        return {"content": "Task completed."}
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+
+        step = self._next_turn(messages)
+        turn = sum(1 for msg in messages if isinstance(msg, AIMessage))
+
+        tool_calls = [
+            {"name": tc["name"], "args": dict(tc["args"]), "id": f"call_{turn}_{i}", "type": "tool_call"}
+            for i, tc in enumerate(step.get("tool_calls", []))
+        ]
+        message = AIMessage(content=step.get("content", ""), tool_calls=tool_calls)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+def install_fake_llm(latency: float = 0.0) -> ScriptedChatModel:
+    """
+    Replaces backend.core.llm_factory.get_llm with the scripted model.
+    Must run before services.ai_service.agent.graph is imported.
+    """
+    # Settings requires the key to be present even though no provider is contacted
+    os.environ.setdefault("GEMINI_API_KEY", "")
+    from backend.core import llm_factory
+
+    model = ScriptedChatModel(latency=latency)
+    llm_factory.get_llm = lambda: model
+    return model
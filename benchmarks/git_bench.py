@@ -0,0 +1,98 @@
+# ----- micro-benchmark of the git tools' backends @ benchmarks/git_bench.py -----
+#
+# Compares the in-process git reader (services/ai_service/ai_tools/git_backend.py)
+# with a `git` subprocess per call, on a copy of the sandbox template with a few
+# edits applied, optionally padded with extra committed files.
+#
+#   python -m benchmarks.git_bench
+#   python -m benchmarks.git_bench --files 500 --iterations 200
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from benchmarks.common import summarize, write_results
+
+GIT_IDENTITY = ["-c", "user.name=AuthChain Bench", "-c", "user.email=bench@authchain.local"]
+
+def prepare_repo(extra_files: int) -> str:
+    """Template copy with `extra_files` more committed files, one modified, one deleted and one untracked file."""
+    from backend.utils.setup_sandbox import build_template, clone_tree
+
+    root = tempfile.mkdtemp(prefix="authchain-git-bench-")
+    clone_tree(build_template(), root)
+
+    if extra_files:
+        for i in range(extra_files):
+            directory = os.path.join(root, "src", f"pkg{i // 50}")
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"module_{i}.py"), "w") as f:
+                f.write("".join(f"def f{j}(x):\n    return x + {j}\n\n" for j in range(20)))
+        subprocess.run(["git", "add", "-A"], cwd=root, check=True, capture_output=True)
+        subprocess.run(["git", *GIT_IDENTITY, "commit", "-qm", "Add generated modules"], cwd=root, check=True, capture_output=True)
+
+    with open(os.path.join(root, "src", "auth.py"), "a") as f:
+        f.write("\n\ndef verify_chain(txs):\n    return all(map(verify_signature, txs))\n")
+    os.remove(os.path.join(root, "scripts", "clean.sh"))
+    with open(os.path.join(root, "src", "untracked.py"), "w") as f:
+        f.write("print('new')\n")
+    return root
+
+def time_calls(fn, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="git subprocess vs in-process git reader")
+    parser.add_argument("--files", type=int, default=0, help="Extra committed files to add to the repo")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--output", help="Results JSON path (default: bench_results/git_<timestamp>.json)")
+    args = parser.parse_args()
+
+    from services.ai_service.ai_tools.git_backend import GitRepo
+    from services.ai_service.ai_tools.manager import _run_git_command
+
+    root = prepare_repo(args.files)
+    repo = GitRepo(root)
+
+    commands = {
+        "status": (lambda: _run_git_command(["status"], root), lambda: repo.status()),
+        "log": (lambda: _run_git_command(["log", "-n5", "--oneline"], root), lambda: repo.log(5)),
+        "diff": (lambda: _run_git_command(["diff"], root), lambda: repo.diff()),
+        "diff --stat": (lambda: _run_git_command(["diff", "--stat"], root), lambda: repo.diff(stat_only=True)),
+    }
+
+    results = {"config": vars(args), "commands": {}}
+    try:
+        print(f"{'command':<14} {'subprocess p50':>15} {'in-process p50':>15} {'cold':>10} {'speedup':>8}")
+        for name, (cli, backend) in commands.items():
+            cold_start = time.perf_counter()
+            backend()
+            cold = time.perf_counter() - cold_start
+
+            cli_stats = summarize(time_calls(cli, args.iterations))
+            backend_stats = summarize(time_calls(backend, args.iterations))
+            speedup = cli_stats["p50"] / max(backend_stats["p50"], 1e-6)
+            results["commands"][name] = {
+                "subprocess_ms": cli_stats,
+                "in_process_ms": backend_stats,
+                "in_process_cold_ms": round(cold * 1000, 3),
+                "speedup_p50": round(speedup, 2),
+            }
+            print(f"{name:<14} {cli_stats['p50']:>13.2f}ms {backend_stats['p50']:>13.2f}ms {cold * 1000:>8.2f}ms {speedup:>7.1f}x")
+    finally:
+        repo.close()
+        shutil.rmtree(root, ignore_errors=True)
+
+    path = write_results("git", results, args.output)
+    print(f"\nResults written to {path}")
+
+if __name__ == "__main__":
+    main()
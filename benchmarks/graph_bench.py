@@ -0,0 +1,212 @@
+# ----- offline end-to-end benchmark of the agent graph @ benchmarks/graph_bench.py -----
+#
+# Drives the real compiled graph with a scripted fake LLM, so results measure graph,
+# tool and checkpoint overhead only.
+#
+#   python -m benchmarks.graph_bench
+#   python -m benchmarks.graph_bench --concurrency 1 4 16 --sessions-per-worker 5 --llm-latency 0.05
+
+import argparse
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage
+
+from benchmarks.common import summarize, write_results
+from benchmarks.fake_llm import install_fake_llm
+
+NODE_NAMES = {"agent", "safe_tools", "critical_gate", "execute_critical"}
+
+SCENARIO_PROMPTS = {
+    "explore": "[scenario:explore] Explain how transaction signatures are verified.",
+    "critical_write": "[scenario:critical_write] Make verify_signature reject unsigned transactions.",
+    "loop": "[scenario:loop] Keep checking the workspace until something changes.",
+}
+
+class NodeTimer(BaseCallbackHandler):
+    """Times graph node runs from the callback stream (node runs carry langgraph_node == run name)."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self._starts = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        name = kwargs.get("name")
+        if name in NODE_NAMES and (metadata or {}).get("langgraph_node") == name:
+            self._starts[run_id] = (name, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        started = self._starts.pop(run_id, None)
+        if started:
+            with self._lock:
+                self.samples[started[0]].append(time.perf_counter() - started[1])
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._starts.pop(run_id, None)
+
+class CheckpointTimer:
+    """Wraps the saver's put/put_writes to time every checkpoint write."""
+
+    def __init__(self, saver):
+        self.samples = defaultdict(list)
+        self._lock = threading.Lock()
+        for method in ("put", "put_writes"):
+            setattr(saver, method, self._timed(method, getattr(saver, method)))
+
+    def _timed(self, name, func):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.samples[name].append(time.perf_counter() - start)
+        return wrapper
+
+    def reset(self):
+        with self._lock:
+            self.samples = defaultdict(list)
+
+def run_session(graph, scenario: str, callbacks: list) -> dict:
+    """Runs one scenario to completion, approving any critical action. Returns outcome details."""
+    thread_id = f"bench-{scenario}-{uuid.uuid4().hex[:8]}"
+    config = {"configurable": {"thread_id": thread_id}, "callbacks": callbacks}
+
+    start = time.perf_counter()
+    graph.invoke({"messages": [HumanMessage(content=SCENARIO_PROMPTS[scenario])]}, config)
+
+    interrupts = 0
+    state = graph.get_state(config)
+    while state.next and "execute_critical" in state.next:
+        interrupts += 1
+        graph.invoke(None, config)
+        state = graph.get_state(config)
+
+    elapsed = time.perf_counter() - start
+    final = str(state.values["messages"][-1].content)
+    return {
+        "thread_id": thread_id,
+        "scenario": scenario,
+        "seconds": elapsed,
+        "interrupts": interrupts,
+        "messages": len(state.values["messages"]),
+        "halted": final.startswith("Task halted"),
+        "completed": not state.next,
+    }
+
+def run_level(graph, scenarios: list, concurrency: int, sessions_per_worker: int, callbacks: list) -> tuple:
+    """Runs concurrency * sessions_per_worker sessions, cycling through the scenarios."""
+    jobs = [scenarios[i % len(scenarios)] for i in range(concurrency * sessions_per_worker)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda scenario: run_session(graph, scenario, callbacks), jobs))
+    return outcomes, time.perf_counter() - start
+
+def measure_memory(graph, scenarios: list, concurrency: int) -> tuple:
+    """Peak traced allocation while `concurrency` sessions run at once, per session (KiB)."""
+    tracemalloc.start()
+    try:
+        outcomes, _ = run_level(graph, scenarios, concurrency, 1, [])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / concurrency, outcomes
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the agent graph with a scripted LLM")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIO_PROMPTS), choices=list(SCENARIO_PROMPTS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--sessions-per-worker", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--keep-sessions", action="store_true", help="Keep per-session sandboxes on disk")
+    parser.add_argument("--output", help="Results JSON path (default: bench_results/graph_<timestamp>.json)")
+    args = parser.parse_args()
+
+    install_fake_llm(latency=args.llm_latency)
+
+    from backend.utils.setup_sandbox import provision_sandbox
+    provision_sandbox()
+
+    from services.ai_service.agent.graph import graph
+    from services.ai_service.ai_tools.sessions import release_session
+
+    checkpoint_timer = CheckpointTimer(graph.checkpointer)
+
+    # Warm-up: first tool/database use pays one-off import and connection costs
+    warmup, _ = run_level(graph, args.scenarios, 1, 1, [])
+    finished = list(warmup)
+
+    levels = []
+    for concurrency in args.concurrency:
+        node_timer = NodeTimer()
+        checkpoint_timer.reset()
+
+        outcomes, wall = run_level(graph, args.scenarios, concurrency, args.sessions_per_worker, [node_timer])
+        finished.extend(outcomes)
+
+        memory_kib = None
+        if not args.no_memory:
+            memory_kib, memory_outcomes = measure_memory(graph, args.scenarios, concurrency)
+            finished.extend(memory_outcomes)
+
+        by_scenario = defaultdict(list)
+        for outcome in outcomes:
+            by_scenario[outcome["scenario"]].append(outcome)
+
+        level = {
+            "concurrency": concurrency,
+            "sessions": len(outcomes),
+            "wall_seconds": round(wall, 4),
+            "sessions_per_second": round(len(outcomes) / wall, 3),
+            "session_latency_ms": summarize(o["seconds"] for o in outcomes),
+            "scenarios": {
+                name: {
+                    "sessions": len(items),
+                    "latency_ms": summarize(o["seconds"] for o in items),
+                    "interrupts": sum(o["interrupts"] for o in items),
+                    "halted": sum(o["halted"] for o in items),
+                    "completed": sum(o["completed"] for o in items),
+                }
+                for name, items in by_scenario.items()
+            },
+            "node_latency_ms": {name: summarize(values) for name, values in sorted(node_timer.samples.items())},
+            "checkpoint_write_ms": {name: summarize(values) for name, values in sorted(checkpoint_timer.samples.items())},
+            "memory_per_session_kib": None if memory_kib is None else round(memory_kib, 1),
+        }
+        levels.append(level)
+
+        print("=" * 80)
+        print(f"CONCURRENCY {concurrency}: {level['sessions']} sessions in {wall:.2f}s ({level['sessions_per_second']} sessions/s)")
+        print("-" * 80)
+        for name, stats in level["node_latency_ms"].items():
+            print(f"  node {name:<18} n={stats['count']:<5} p50={stats['p50']:.2f}ms p95={stats['p95']:.2f}ms")
+        for name, stats in level["checkpoint_write_ms"].items():
+            print(f"  checkpoint {name:<12} n={stats['count']:<5} p50={stats['p50']:.3f}ms p95={stats['p95']:.3f}ms")
+        if memory_kib is not None:
+            print(f"  memory per session: {memory_kib:.1f} KiB")
+
+
+    if not args.keep_sessions:
+        for outcome in finished:
+            release_session(outcome["thread_id"])
+
+    path = write_results("graph", {
+        "config": {
+            "scenarios": args.scenarios,
+            "sessions_per_worker": args.sessions_per_worker,
+            "llm_latency": args.llm_latency,
+        },
+        "levels": levels,
+    }, args.output)
+    print(f"\nResults written to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# ----- import-time benchmark for the main entry points @ benchmarks/import_time.py -----
+#
+# Each entry point is imported in a fresh interpreter with `python -X importtime`
+# so results are not skewed by modules already cached in sys.modules.
+#
+#   python -m benchmarks.import_time
+#   python -m benchmarks.import_time --repeat 5 --output bench_results/imports.json
+#   python -m benchmarks.import_time --baseline bench_results/imports.json --tolerance 0.2
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    "backend.core.llm_factory",
+    "services.ai_service.ai_tools.manager",
+    "services.tool_creation_service.generator",
+    "tool_generation_demo",
+    "services.ai_service.main",
+]
+
+def _run_once(module: str) -> dict:
+    """
+    Imports a module in a fresh interpreter and parses the -X importtime report.
+    Returns per-module self/cumulative times in microseconds plus process wall time.
+    """
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark-placeholder")
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(f"import {module} failed: {tail[0]}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        except ValueError:
+            continue
+        modules[name.strip()] = {
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        }
+
+    return {"wall_ms": wall_ms, "modules": modules}
+
+def benchmark_entry_point(module: str, repeat: int, top: int) -> dict:
+    """
+    Runs `repeat` cold imports of an entry point and summarises them with medians.
+    """
+    runs = [_run_once(module) for _ in range(repeat)]
+
+    self_times = defaultdict(list)
+    for run in runs:
+        for name, timing in run["modules"].items():
+            self_times[name].append(timing["self_us"])
+
+    module_self_ms = {
+        name: statistics.median(values) / 1000
+        for name, values in self_times.items()
+    }
+
+    # Roll self time up to top-level packages to show which dependency is expensive
+    package_ms = defaultdict(float)
+    for name, ms in module_self_ms.items():
+        package_ms[name.split(".")[0]] += ms
+
+    total_ms = statistics.median(
+        run["modules"].get(module, {}).get("cumulative_us", 0) / 1000 for run in runs
+    )
+
+    return {
+        "entry_point": module,
+        "import_ms": round(total_ms, 2),
+        "wall_ms": round(statistics.median(run["wall_ms"] for run in runs), 2),
+        "module_count": len(module_self_ms),
+        "top_packages": [
+            {"package": name, "self_ms": round(ms, 2)}
+            for name, ms in sorted(package_ms.items(), key=lambda item: -item[1])[:top]
+        ],
+        "top_modules": [
+            {"module": name, "self_ms": round(ms, 2)}
+            for name, ms in sorted(module_self_ms.items(), key=lambda item: -item[1])[:top]
+        ],
+        "modules": {name: round(ms, 3) for name, ms in module_self_ms.items()},
+    }
+
+def compare_to_baseline(results: list, baseline_path: str, tolerance: float) -> list:
+    """
+    Returns a list of regression messages for entry points slower than the baseline.
+    """
+    with open(baseline_path, "r") as f:
+        baseline = {entry["entry_point"]: entry for entry in json.load(f)["results"]}
+
+    regressions = []
+    for entry in results:
+        previous = baseline.get(entry["entry_point"])
+        if not previous:
+            continue
+
+        limit = previous["import_ms"] * (1 + tolerance)
+        if entry["import_ms"] > limit:
+            new_modules = sorted(set(entry["modules"]) - set(previous.get("modules", {})))
+            message = (
+                f"{entry['entry_point']}: {entry['import_ms']:.1f} ms "
+                f"(baseline {previous['import_ms']:.1f} ms, limit {limit:.1f} ms)"
+            )
+            if new_modules:
+                message += f"; newly imported: {', '.join(new_modules[:10])}"
+            regressions.append(message)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import-time benchmark for AuthChain entry points")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="Modules to import (default: main entry points)")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold imports per entry point (median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Number of packages/modules listed per entry point")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    parser.add_argument("--baseline", help="Fail if an entry point is slower than this earlier --output file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = []
+    for module in args.modules:
+        entry = benchmark_entry_point(module, args.repeat, args.top)
+        results.append(entry)
+
+        print("=" * 80)
+        print(f"{module}: {entry['import_ms']:.1f} ms import, {entry['wall_ms']:.1f} ms process, {entry['module_count']} modules")
+        print("-" * 80)
+        for package in entry["top_packages"]:
+            print(f"  {package['self_ms']:9.1f} ms  {package['package']}")
+        print("  top modules:")
+        for item in entry["top_modules"]:
+            print(f"  {item['self_ms']:9.1f} ms  {item['module']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({
+                "benchmark": "import_time",
+                "created_at": datetime.now().isoformat(),
+                "python": sys.version.split()[0],
+                "repeat": args.repeat,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print("\nIMPORT-TIME REGRESSIONS:")
+            for message in regressions:
+                print(f"  - {message}")
+            sys.exit(1)
+        print("\nNo import-time regressions against baseline")
+
+if __name__ == "__main__":
+    main()
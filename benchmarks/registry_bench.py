@@ -0,0 +1,117 @@
+# ----- startup cost of the generated-tool registry @ benchmarks/registry_bench.py -----
+#
+# Builds registries of increasing size in a scratch directory (real generated tool files,
+# via the generator's deterministic wrapper) and measures what it costs to hand every tool
+# to the agent:
+#   eager  - import every generated module (what get_all_tools used to do)
+#   lazy   - build proxies from registry metadata only (get_all_tools now)
+# plus the first-call latency of a proxy, which pays for its module's import.
+#
+#   python -m benchmarks.registry_bench
+#   python -m benchmarks.registry_bench --sizes 10 100 1000 --repeat 5
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import summarize, write_results
+
+def populate(tools_dir: str, size: int):
+    """Registers `size` generated tools into a registry rooted at tools_dir."""
+    from services.tool_creation_service.generator import FunctionSpec, ToolCreationProposal, _build_complete_tool
+    from services.tool_creation_service.registry import DynamicToolRegistry
+
+    registry = DynamicToolRegistry(tools_dir, sandboxed=False)
+    for i in range(size):
+        spec = FunctionSpec(
+            function_name=f"scale_values_{i}",
+            description=f"Multiplies every value by {i} and sums the result",
+            parameters=[
+                {"name": "values", "type": "list", "description": "Numbers to scale"},
+                {"name": "offset", "type": "float", "description": "Added to the total"},
+            ],
+            function_body=f"    try:\n        return f'Total: {{sum(v * {i} for v in values) + offset}}'\n    except Exception as e:\n        return f'ERROR: {{str(e)}}'",
+            risk_tier="SAFE",
+            reasoning="benchmark",
+        )
+        registry.register_tool(ToolCreationProposal(
+            tool_name=spec.function_name,
+            description=spec.description,
+            parameters=spec.parameters,
+            implementation=_build_complete_tool(spec),
+            risk_tier=spec.risk_tier,
+            reasoning=spec.reasoning,
+            example_usage="",
+        ), approved_by="bench")
+    registry.store.close()
+
+def measure(tools_dir: str, eager: bool) -> dict:
+    """Fresh registry instance -> all tools, with timing and traced peak memory."""
+    from services.tool_creation_service import proxy
+    from services.tool_creation_service.registry import DynamicToolRegistry
+
+    proxy._code_cache.clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    # In-process, so the first call measures the module import rather than a worker round trip
+    registry = DynamicToolRegistry(tools_dir, sandboxed=False)
+    if eager:
+        tools = [registry.load_tool(entry["name"]) for entry in registry.list_tools()]
+    else:
+        tools = registry.get_all_tools()
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    first_call = None
+    if not eager and tools:
+        start = time.perf_counter()
+        tools[0].invoke({"values": [1, 2, 3], "offset": 0.5})
+        first_call = time.perf_counter() - start
+
+    registry.store.close()
+    return {"seconds": elapsed, "peak_bytes": peak, "tools": len(tools), "first_call": first_call}
+
+def main():
+    parser = argparse.ArgumentParser(description="Registry startup: eager imports vs lazy proxy tools")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Results JSON path (default: bench_results/registry_<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = {"config": vars(args), "sizes": {}}
+    print(f"{'tools':>6} {'eager p50':>12} {'lazy p50':>12} {'eager peak':>12} {'lazy peak':>12} {'1st call':>10}")
+    for size in args.sizes:
+        tools_dir = tempfile.mkdtemp(prefix="authchain-registry-bench-")
+        try:
+            populate(tools_dir, size)
+            eager = [measure(tools_dir, eager=True) for _ in range(args.repeat)]
+            lazy = [measure(tools_dir, eager=False) for _ in range(args.repeat)]
+        finally:
+            shutil.rmtree(tools_dir, ignore_errors=True)
+
+        eager_stats = summarize([r["seconds"] for r in eager])
+        lazy_stats = summarize([r["seconds"] for r in lazy])
+        first_call = summarize([r["first_call"] for r in lazy if r["first_call"] is not None])
+        eager_peak = max(r["peak_bytes"] for r in eager) / 1024 / 1024
+        lazy_peak = max(r["peak_bytes"] for r in lazy) / 1024 / 1024
+        results["sizes"][size] = {
+            "eager_ms": eager_stats,
+            "lazy_ms": lazy_stats,
+            "eager_peak_mb": round(eager_peak, 2),
+            "lazy_peak_mb": round(lazy_peak, 2),
+            "proxy_first_call_ms": first_call,
+        }
+        print(f"{size:>6} {eager_stats['p50']:>10.1f}ms {lazy_stats['p50']:>10.1f}ms "
+              f"{eager_peak:>10.2f}MB {lazy_peak:>10.2f}MB {first_call.get('p50', 0):>8.2f}ms")
+
+    path = write_results("registry", results, args.output)
+    print(f"\nResults written to {path}")
+
+if __name__ == "__main__":
+    main()
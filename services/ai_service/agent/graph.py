@@ -8,13 +8,17 @@ from typing import Literal
 
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import ToolNode
 from langgraph.checkpoint.sqlite import SqliteSaver 
 
 from services.ai_service.agent.state import AgentState
 from services.ai_service.agent.prompts import SYSTEM_PROMPT
+from services.ai_service.agent.toolset import ToolsetManager
 from services.ai_service.ai_tools.manager import get_tools, is_critical
+from services.ai_service.ai_tools.sessions import get_thread_id
 from backend.core.llm_factory import get_llm
+from backend.utils import cassette
 
 from backend.utils.logger import get_logger
 
@@ -24,10 +28,22 @@ logger.info("Initializing LLM and tools...")
 llm = get_llm() 
 tools = get_tools(llm)
 
-llm_with_tools = llm.bind_tools(tools)
-logger.info(f"Tools bound to LLM: {len(tools)} tools available")
+# Generated tools approved at runtime join the core tools on the next turn (see toolset.py)
+toolsets = ToolsetManager(llm, tools)
+toolsets.bound_model(tools)
 
-def call_model(state: AgentState):
+def _needs_approval(tool_call: dict, config: RunnableConfig) -> bool:
+    return is_critical(tool_call["name"], tool_call["args"], config) or toolsets.is_critical(tool_call["name"])
+
+def _resolve_generated_tool(request, execute):
+    """ToolNode wrapper: calls to tools approved after the node was built are resolved from the current toolset."""
+    if request.tool is None:
+        generated = toolsets.resolve_tool(request.tool_call["name"])
+        if generated is not None:
+            request = request.override(tool=generated)
+    return execute(request)
+
+def call_model(state: AgentState, config: RunnableConfig):
     """
     Core agent reasoning node with enhanced error handling and loop prevention
     """
@@ -79,7 +95,8 @@ def call_model(state: AgentState):
                 messages.append(HumanMessage(content=error_guidance))
 
     logger.info("Calling LLM with tools...")
-    response = llm_with_tools.invoke(messages)
+    llm_with_tools = toolsets.model_for_turn(messages)
+    response = cassette.invoke_llm(llm_with_tools, messages, get_thread_id(config), "call_model")
     logger.info(f"LLM response received: {type(response).__name__}")
 
     if hasattr(response, 'tool_calls') and response.tool_calls and len(response.tool_calls) > 1:
@@ -101,7 +118,7 @@ def call_model(state: AgentState):
     
     return {"messages": [response]}
 
-def route_tools(state: AgentState) -> Literal["safe_tools", "critical_gate", "end"]:
+def route_tools(state: AgentState, config: RunnableConfig) -> Literal["safe_tools", "critical_gate", "end"]:
     """
     Intelligent routing with debugging capabilities
     """
@@ -115,7 +132,7 @@ def route_tools(state: AgentState) -> Literal["safe_tools", "critical_gate", "en
             logger.info(f"  - {tc['name']}: {list(tc['args'].keys())}")
         
         # Check for critical tools
-        if any(is_critical(tc["name"]) for tc in last_msg.tool_calls):
+        if any(_needs_approval(tc, config) for tc in last_msg.tool_calls):
             logger.info("[ROUTER] Routing to: critical_gate")
             return "critical_gate"
         
@@ -133,7 +150,7 @@ def route_tools(state: AgentState) -> Literal["safe_tools", "critical_gate", "en
     return "end"
 
 
-def critical_gate(state: AgentState):
+def critical_gate(state: AgentState, config: RunnableConfig):
     """
     Critical action gating method
     """
@@ -142,7 +159,11 @@ def critical_gate(state: AgentState):
     if not hasattr(last_msg, 'tool_calls') or not last_msg.tool_calls:
         return state
     
-    tool_call = last_msg.tool_calls[0]
+    # The proposal is about the call that needs approval (read-only SQL in the same turn does not)
+    tool_call = next(
+        (tc for tc in last_msg.tool_calls if _needs_approval(tc, config)),
+        last_msg.tool_calls[0]
+    )
 
     recent_history = state["messages"][-8:]
     history_text = "\n".join([
@@ -163,7 +184,7 @@ def critical_gate(state: AgentState):
     3. What the expected outcome is
     """
     
-    summary_response = llm.invoke(summary_prompt)
+    summary_response = cassette.invoke_llm(llm, summary_prompt, get_thread_id(config), "critical_gate")
     summary = summary_response.content if hasattr(summary_response, 'content') else str(summary_response)
     
     return {
@@ -175,9 +196,9 @@ logger.info("Building workflow graph...")
 workflow = StateGraph(AgentState)
 
 workflow.add_node("agent", call_model)
-workflow.add_node("safe_tools", ToolNode(tools))
+workflow.add_node("safe_tools", ToolNode(tools, wrap_tool_call=_resolve_generated_tool))
 workflow.add_node("critical_gate", critical_gate)
-workflow.add_node("execute_critical", ToolNode(tools))
+workflow.add_node("execute_critical", ToolNode(tools, wrap_tool_call=_resolve_generated_tool))
 
 workflow.set_entry_point("agent")
 
@@ -21,17 +21,22 @@ FILE CREATION AND CODE GENERATION:
 DATABASE OPERATIONS:
 - For database schema inspection: use `sql_db_list_tables` then `sql_db_schema`
 - For database queries: ALWAYS use `sql_db_query` (never read_file on .db files)
+- Read-only SELECTs run immediately and return up to `limit` rows; use the returned page_token for more. Statements that modify data wait for human approval
 - For query validation: use `sql_db_query_checker` before executing complex queries
 - Database file (task_tracker.db) is BINARY - reading it directly will cause errors
 
 CODE ANALYSIS AND MODIFICATION:
-- Before modifying code: use `search_codebase` to find relevant definitions
+- Before modifying code: use `find_definition` to get a Python symbol's location and source
+- Use `find_references` to see where a function/class is used before changing it
+- Use `search_codebase` for non-Python files or free text
 - For understanding imports/dependencies: trace through with `read_file` on source files
+- To read several related files, use ONE `read_many_files` call (paths list or glob) instead of repeated `read_file`
+- To change an EXISTING file: use `edit_file` (search/replace) or `apply_patch` (unified diff) with the sha256 from `read_file` as base_hash - do not resend the whole file with write_file
 - Use `git_status` and `git_diff` to verify changes before committing
 - Write complete, syntactically correct code - test logic before writing
 
 FILE SYSTEM NAVIGATION:
-- Start with `list_directory(".")` to understand current structure
+- Start with `list_tree(".")` to see the whole structure in one call; use `list_directory` for a single folder
 - Use `search_codebase` to locate specific functions/classes across files
 - Only read files that exist in directory listings
 - Never retry failed file reads - choose different files from the listing
@@ -0,0 +1,73 @@
+# ----- lexical (BM25) retrieval over generated tools @ services/ai_service/agent/tool_retrieval.py -----
+#
+# Offline and dependency-free: tools are indexed by name, description and parameter
+# names/descriptions, and each call_model turn ranks them against the recent conversation.
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Acronyms stay whole ("RSI", "CSVFile" -> CSV, File); camelCase and snake_case are split
+TOKEN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "i", "if", "in", "into",
+    "is", "it", "its", "me", "my", "of", "on", "or", "please", "so", "that", "the", "this",
+    "to", "use", "using", "we", "with", "you", "your", "can", "do", "need", "want",
+}
+
+# Standard BM25 constants
+K1 = 1.5
+B = 0.75
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens of 2+ characters; snake_case and camelCase are split, trailing plural 's' dropped."""
+    tokens = []
+    for token in TOKEN.findall(text or ""):
+        token = token.lower()
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def tool_document(name: str, description: str, parameters: list) -> str:
+    """Text a tool is indexed by; the name is repeated so it outweighs incidental description words."""
+    params = " ".join(f"{p.get('name', '')} {p.get('description', '')}" for p in parameters or [])
+    return f"{name} {name} {description} {params}"
+
+class BM25Index:
+    """BM25 over a fixed set of documents keyed by name."""
+
+    def __init__(self, documents: Dict[str, str]):
+        # term -> {document: term frequency}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.lengths: Dict[str, int] = {}
+
+        for name, text in documents.items():
+            tokens = tokenize(text)
+            self.lengths[name] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                self.postings.setdefault(term, {})[name] = tf
+
+        count = len(documents)
+        avg_length = (sum(self.lengths.values()) / count) if count else 1.0
+        self.idf = {term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5)) for term, docs in self.postings.items()}
+        self.norms = {name: K1 * (1 - B + B * length / (avg_length or 1.0)) for name, length in self.lengths.items()}
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """Score of every document that shares at least one term with the query."""
+        results: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            for name, tf in self.postings.get(term, {}).items():
+                results[name] = results.get(name, 0.0) + self.idf[term] * tf * (K1 + 1) / (tf + self.norms[name])
+        return results
+
+    def top_k(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """Best `k` (name, score) pairs, highest first; ties broken by name for stable bindings."""
+        ranked = sorted(self.scores(query).items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
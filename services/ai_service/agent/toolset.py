@@ -0,0 +1,177 @@
+# ----- versioned agent toolset: core tools plus approved generated tools @ services/ai_service/agent/toolset.py -----
+#
+# The core tools are fixed for the life of the process; generated tools come from the
+# tool registry and can change at any time (execute_tool_creation, tool_generation_demo.py,
+# another process). Every call_model turn asks for the current toolset, which costs one
+# read of the registry's change counter. When the counter moves, a new Toolset is built
+# from registry metadata (lazy proxies, nothing imported).
+#
+# Only the core tools and the top-k generated tools for the recent conversation (BM25,
+# see tool_retrieval.py) are bound each turn. Bound models are cached per selection hash,
+# so the LLM is only re-bound when the selected tools actually change.
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.tools import BaseTool
+
+from backend.core.config import settings
+from backend.utils.logger import get_logger
+from services.ai_service.agent.tool_retrieval import BM25Index, tool_document
+
+logger = get_logger(__name__)
+
+BOUND_MODEL_CACHE_SIZE = 32
+# Characters of each recent message used as the retrieval query
+QUERY_CHARS_PER_MESSAGE = 500
+
+def tools_fingerprint(tools: List[BaseTool]) -> str:
+    """Hash of tool names and registry versions; equal fingerprints bind identical schemas."""
+    fingerprint = "\n".join(
+        f"{t.name}:{(t.metadata or {}).get('registry_hash', '')}" for t in sorted(tools, key=lambda t: t.name)
+    )
+    return hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+
+def _recent_query(messages: List[BaseMessage], count: int) -> tuple:
+    """
+    (query text, names of tools called or suggested recently) from the last `count` messages.
+    The user's request (first human message) is always part of the query.
+    """
+    window = messages[-count:]
+    task = next((msg for msg in messages if isinstance(msg, HumanMessage)), None)
+    if task is not None and task not in window:
+        window = [task] + window
+
+    texts, called = [], set()
+    for msg in window:
+        content = msg.content if isinstance(msg.content, str) else str(msg.content)
+        # Tool output is mostly data, not intent
+        if not isinstance(msg, ToolMessage):
+            texts.append(content[:QUERY_CHARS_PER_MESSAGE])
+        for tc in getattr(msg, "tool_calls", None) or []:
+            called.add(tc["name"])
+        # Tool results can point at a tool to use next (e.g. tool_creation_gate reusing an existing tool)
+        artifact = getattr(msg, "artifact", None)
+        if isinstance(artifact, dict):
+            called.update(artifact.get("suggested_tools", []))
+    return " ".join(texts), called
+
+class Toolset:
+    """One immutable version of the agent's tools."""
+
+    def __init__(self, version: int, core_tools: List[BaseTool], generated_tools: List[BaseTool]):
+        self.version = version
+        self.core_tools = core_tools
+        self.tools = core_tools + generated_tools
+        self.generated: Dict[str, BaseTool] = {t.name: t for t in generated_tools}
+        self.risk_tiers = {t.name: (t.metadata or {}).get("risk_tier") for t in generated_tools}
+        self.hash = tools_fingerprint(self.tools)
+        self._index: Optional[BM25Index] = None
+
+    def is_critical(self, tool_name: str) -> bool:
+        """Risk tier the generated tool was approved with; core tools are classified by manager.is_critical."""
+        return self.risk_tiers.get(tool_name) == "CRITICAL"
+
+    def index(self) -> BM25Index:
+        """BM25 index over the generated tools, built on first retrieval."""
+        if self._index is None:
+            self._index = BM25Index({
+                name: tool_document(name, t.description, [
+                    {"name": arg, "description": schema.get("description", "")} for arg, schema in t.args.items()
+                ])
+                for name, t in self.generated.items()
+            })
+        return self._index
+
+    def select(self, messages: List[BaseMessage], top_k: int, recent: int) -> List[BaseTool]:
+        """
+        Core tools plus the generated tools worth binding this turn: the `top_k` best BM25
+        matches for the last `recent` messages, and any generated tool called or suggested in them.
+        """
+        if len(self.generated) <= top_k:
+            return self.tools
+
+        query, called = _recent_query(messages, recent)
+        chosen = [name for name, _ in self.index().top_k(query, top_k)]
+        chosen += sorted(name for name in called if name in self.generated and name not in chosen)
+        return self.core_tools + [self.generated[name] for name in chosen]
+
+class ToolsetManager:
+    """Tracks the registry and hands out the current Toolset and a model bound to it."""
+
+    def __init__(self, llm, core_tools: List[BaseTool], registry=None):
+        self.llm = llm
+        self.core_tools = core_tools
+        self.core_names = {t.name for t in core_tools}
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._toolset = Toolset(-1, core_tools, [])
+        self._bound: "OrderedDict[str, object]" = OrderedDict()
+
+    def _get_registry(self):
+        if self._registry is None:
+            from services.tool_creation_service.registry import tool_registry
+            self._registry = tool_registry
+        return self._registry
+
+    def _generated_tools(self, registry) -> List[BaseTool]:
+        tools = []
+        for proxy in registry.get_all_tools():
+            if proxy.name in self.core_names:
+                logger.warning(f"⚠️ Generated tool {proxy.name} shadows a core tool and is ignored")
+                continue
+            tools.append(proxy)
+        return tools
+
+    def current(self) -> Toolset:
+        """The toolset for the next turn, rebuilt only when the registry's change counter moved."""
+        try:
+            registry = self._get_registry()
+            version = registry.change_counter()
+        except Exception as e:
+            logger.error(f"Tool registry unavailable, using the last known toolset: {e}")
+            return self._toolset
+
+        if version == self._toolset.version:
+            return self._toolset
+
+        with self._lock:
+            if version != self._toolset.version:
+                toolset = Toolset(version, self.core_tools, self._generated_tools(registry))
+                if toolset.hash != self._toolset.hash:
+                    logger.info(f"🔄 Toolset v{version} ({toolset.hash}): {len(toolset.generated)} generated tool(s)")
+                self._toolset = toolset
+            return self._toolset
+
+    def bound_model(self, tools: List[BaseTool]):
+        """LLM bound to exactly these tools, cached per tool selection."""
+        key = tools_fingerprint(tools)
+        with self._lock:
+            model = self._bound.get(key)
+            if model is not None:
+                self._bound.move_to_end(key)
+                return model
+
+        model = self.llm.bind_tools(tools)
+        with self._lock:
+            self._bound[key] = model
+            while len(self._bound) > BOUND_MODEL_CACHE_SIZE:
+                self._bound.popitem(last=False)
+        logger.info(f"Tools bound to LLM: {len(tools)} tools available (selection {key})")
+        return model
+
+    def model_for_turn(self, messages: List[BaseMessage]):
+        """Model bound to the core tools and the generated tools retrieved for this conversation."""
+        toolset = self.current()
+        tools = toolset.select(messages, settings.TOOL_RETRIEVAL_TOP_K, settings.TOOL_RETRIEVAL_MESSAGES)
+        return self.bound_model(tools)
+
+    def resolve_tool(self, tool_name: str) -> Optional[BaseTool]:
+        """Generated tool for a call the ToolNode does not know statically."""
+        return self.current().generated.get(tool_name)
+
+    def is_critical(self, tool_name: str) -> bool:
+        return self.current().is_critical(tool_name)
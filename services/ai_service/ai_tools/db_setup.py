@@ -1,23 +1,145 @@
 # ----- Database tools @ services/ai_service/ai_tools.db_setup.py -----
 
 import os
-from langchain_community.utilities import SQLDatabase
-from langchain_community.agent_toolkits.sql.toolkit import SQLDatabaseToolkit
+import sqlite3
+import threading
+from typing import Dict
+from langchain_core.tools import tool
+from langchain_core.runnables import RunnableConfig
 from backend.utils.logger import get_logger
+from backend.utils.setup_sandbox import DB_NAME
+from backend.utils.sqlite_pool import close_pool, get_pool
+from services.ai_service.ai_tools.sessions import SANDBOX_PATH, resolve_sandbox, on_release
+from services.ai_service.ai_tools.sql_readonly import QueryTimeout, check_read_only, run_read_only, truncate_value
+from services.ai_service.ai_tools.schema_cache import drop_schema_cache, get_schema_cache
 
 logger=get_logger(__name__)
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-SANDBOX_PATH = os.path.join(BASE_DIR, "sandbox")
-DB_PATH = os.path.join(SANDBOX_PATH, "task_tracker.db")
+DB_PATH = os.path.join(SANDBOX_PATH, DB_NAME)
 
-logger.info(f"🔌 AGENT CONNECTING TO DB AT: {DB_PATH}")
+_databases: Dict[str, object] = {}
+_databases_lock = threading.Lock()
 
-db = SQLDatabase.from_uri(
-    f"sqlite:///{DB_PATH}",
-    sample_rows_in_table_info=3
-)
+def get_db(db_path: str = DB_PATH):
+    """
+    Returns the SQLDatabase for a task_tracker.db, connecting on first use.
+    langchain_community (and SQLAlchemy behind it) is only imported here. Only the query
+    checker uses it (for the dialect); queries run on backend/utils/sqlite_pool.py connections.
+    """
+    with _databases_lock:
+        if db_path not in _databases:
+            from langchain_community.utilities import SQLDatabase
+
+            logger.info(f"🔌 AGENT CONNECTING TO DB AT: {db_path}")
+            _databases[db_path] = SQLDatabase.from_uri(
+                f"sqlite:///{db_path}",
+                sample_rows_in_table_info=3
+            )
+        return _databases[db_path]
+
+def session_db_path(config: RunnableConfig) -> str:
+    return os.path.join(resolve_sandbox(config), DB_NAME)
+
+def _close_session_db(root: str):
+    db_path = os.path.join(root, DB_NAME)
+    drop_schema_cache(db_path)
+    close_pool(db_path)
+
+on_release(_close_session_db)
+
+def is_read_only_query(query: str, config: RunnableConfig = None) -> bool:
+    """True when SQLite proves the query is a single read-only statement on the session's database."""
+    read_only, _ = check_read_only(session_db_path(config), query)
+    return read_only
+
+def _format_rows(result: dict) -> str:
+    if not result["rows"]:
+        return "" if result["offset"] == 0 else f"No more rows (offset {result['offset']})"
+    
+    output = str(result["rows"])
+    first = result["offset"] + 1
+    last = result["offset"] + len(result["rows"])
+    if result["next_page_token"]:
+        output += f"\n\n(rows {first}-{last} shown; more available - call sql_db_query again with the same query and page_token='{result['next_page_token']}')"
+    elif result["offset"]:
+        output += f"\n\n(rows {first}-{last}, end of results)"
+    return output
+
+def _run_write(db_path: str, query: str) -> str:
+    """Runs a statement on the database's serialized writer connection, formatted like SQLDatabase.run."""
+    try:
+        with get_pool(db_path).writer() as conn:
+            cursor = conn.execute(query.strip().rstrip(";"))
+            rows = cursor.fetchall()
+    except sqlite3.Error as e:
+        return f"Error: ({type(e).__module__}.{type(e).__name__}) {e}"
+    if not rows:
+        return ""
+    return str([tuple(truncate_value(v) for v in row) for row in rows])
+
+@tool
+def sql_db_query(query: str, config: RunnableConfig, limit: int = 100, page_token: str = None) -> str:
+    """
+    Input to this tool is a detailed and correct SQL query, output is a result from the database.
+    If the query is not correct, an error message will be returned.
+    If an error is returned, rewrite the query, check the query, and try again.
+    If you encounter an issue with Unknown column 'xxxx' in 'field list', use sql_db_schema to query the correct table fields.
+    
+    Read-only SELECT queries run immediately, returning at most `limit` rows per call; pass the
+    returned page_token to get the next rows. Queries that modify data require human approval.
+    """
+    db_path = session_db_path(config)
+    read_only, reason = check_read_only(db_path, query)
+    
+    if read_only:
+        try:
+            return _format_rows(run_read_only(db_path, query, limit, page_token))
+        except (QueryTimeout, ValueError) as e:
+            return f"Error: {e}"
+        except sqlite3.Error as e:
+            return f"Error: ({type(e).__module__}.{type(e).__name__}) {e}"
+    
+    # Only the approved (execute_critical) path may run statements that are not provably read-only
+    if (config or {}).get("metadata", {}).get("langgraph_node") == "safe_tools":
+        logger.warning(f"🚫 Refused non-read-only SQL outside the approval flow: {reason}")
+        return f"Error: this statement is not read-only ({reason}) and requires human approval"
+    
+    return _run_write(db_path, query)
+
+@tool
+def sql_db_schema(table_names: str, config: RunnableConfig) -> str:
+    """
+    Input to this tool is a comma-separated list of tables, output is the schema and sample rows for those tables.
+    Be sure that the tables actually exist by calling sql_db_list_tables first!
+    Example Input: table1, table2, table3
+    """
+    try:
+        return get_schema_cache(session_db_path(config)).table_info(
+            [t.strip() for t in table_names.split(",") if t.strip()]
+        )
+    except (ValueError, sqlite3.Error) as e:
+        return f"Error: {e}"
+
+@tool
+def sql_db_list_tables(config: RunnableConfig, tool_input: str = "") -> str:
+    """
+    Input is an empty string, output is a comma-separated list of tables in the database.
+    """
+    return ", ".join(get_schema_cache(session_db_path(config)).table_names())
 
 def get_sql_tools(llm):
-    toolkit = SQLDatabaseToolkit(db=db, llm=llm)
-    return toolkit.get_tools()
\ No newline at end of file
+    """
+    SQL tools resolve the calling session's task_tracker.db on every call.
+    The query checker only needs the dialect, so it is bound to the shared database.
+    """
+    from langchain_community.tools.sql_database.tool import QuerySQLCheckerTool
+
+    query_checker = QuerySQLCheckerTool(
+        db=get_db(),
+        llm=llm,
+        description=(
+            "Use this tool to double check if your query is correct before executing it. "
+            "Always use this tool before executing a query with sql_db_query!"
+        )
+    )
+    return [sql_db_query, sql_db_schema, sql_db_list_tables, query_checker]
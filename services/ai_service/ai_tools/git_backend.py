@@ -0,0 +1,534 @@
+# ----- In-process git reader for the git tools @ services/ai_service/ai_tools/git_backend.py -----
+#
+# Serves git_status / git_log / git_diff without forking git per call:
+#   - .git/index and refs are parsed in Python and cached by file stat
+#   - objects come from one long-lived `git cat-file --batch` process per sandbox
+#   - trees and commits are immutable, so their parsed form is cached by sha
+# Anything this reader does not handle (index v4, merge conflicts, negated or nested
+# ignore rules) raises UnsupportedRepo and the tools fall back to the git CLI.
+
+import os
+import stat
+import struct
+import difflib
+import fnmatch
+import hashlib
+import heapq
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from backend.utils.logger import get_logger
+from services.ai_service.ai_tools.sessions import on_release
+
+logger = get_logger(__name__)
+
+class UnsupportedRepo(Exception):
+    """The repository uses a feature this reader does not implement."""
+
+MAX_CACHED_OBJECTS = 4096
+BINARY_SNIFF_BYTES = 8000
+EMPTY_SHA = "0" * 40
+
+class _LRU:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.items: "OrderedDict" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.items.get(key)
+            if value is not None:
+                self.items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.capacity:
+                self.items.popitem(last=False)
+
+# Shared across sandboxes: session clones hardlink the template's object store
+_objects = _LRU(MAX_CACHED_OBJECTS)
+_trees = _LRU(MAX_CACHED_OBJECTS)
+_commits = _LRU(MAX_CACHED_OBJECTS)
+
+def blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+def _is_binary(data: bytes) -> bool:
+    return b"\0" in data[:BINARY_SNIFF_BYTES]
+
+class CatFile:
+    """A persistent `git cat-file --batch` process."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.proc = None
+        self.lock = threading.Lock()
+
+    def _start(self):
+        self.proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=self.root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def read(self, sha: str) -> Tuple[str, bytes]:
+        cached = _objects.get(sha)
+        if cached is not None:
+            return cached
+
+        with self.lock:
+            if self.proc is None or self.proc.poll() is not None:
+                self._start()
+            self.proc.stdin.write(sha.encode() + b"\n")
+            self.proc.stdin.flush()
+            header = self.proc.stdout.readline().split()
+            if len(header) != 3:
+                raise KeyError(f"git object {sha} not found")
+            obj_type, size = header[1].decode(), int(header[2])
+            data = self.proc.stdout.read(size)
+            self.proc.stdout.read(1)
+
+        _objects.put(sha, (obj_type, data))
+        return obj_type, data
+
+    def close(self):
+        with self.lock:
+            if self.proc is not None and self.proc.poll() is None:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=5)
+            self.proc = None
+
+def parse_index(path: str) -> Dict[str, tuple]:
+    """
+    Reads a version 2/3 .git/index.
+
+    Returns:
+        {path: (mode, sha, size, mtime_ns)} for stage-0 entries
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if data[:4] != b"DIRC":
+        raise UnsupportedRepo("not a git index")
+    version, count = struct.unpack(">II", data[4:12])
+    if version not in (2, 3):
+        raise UnsupportedRepo(f"index version {version}")
+
+    entries = {}
+    pos = 12
+    for _ in range(count):
+        start = pos
+        fields = struct.unpack(">10I", data[pos:pos + 40])
+        mtime_ns = fields[2] * 1_000_000_000 + fields[3]
+        mode, size = fields[6], fields[9]
+        sha = data[pos + 40:pos + 60].hex()
+        flags = struct.unpack(">H", data[pos + 60:pos + 62])[0]
+        pos += 62
+        if version >= 3 and flags & 0x4000:
+            pos += 2
+        name_end = data.index(b"\0", pos)
+        name = data[pos:name_end].decode("utf-8", errors="surrogateescape")
+        # Entries are NUL-padded to a multiple of 8 bytes
+        pos = start + ((name_end - start + 8) & ~7)
+
+        if (flags >> 12) & 0x3:
+            raise UnsupportedRepo("index has unmerged entries")
+        entries[name] = (mode, sha, size, mtime_ns)
+    return entries
+
+class GitRepo:
+    """Read-only view of one sandbox repository."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.git_dir = os.path.join(root, ".git")
+        self.cat = CatFile(root)
+        self._index_cache = (None, None)
+        self._lock = threading.Lock()
+
+    # --- refs, index, objects ---
+
+    def _stat_key(self, path: str):
+        st = os.stat(path)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def index(self) -> Dict[str, tuple]:
+        index_path = os.path.join(self.git_dir, "index")
+        if not os.path.exists(index_path):
+            return {}
+        key = self._stat_key(index_path)
+        with self._lock:
+            if self._index_cache[0] != key:
+                self._index_cache = (key, parse_index(index_path))
+            return self._index_cache[1]
+
+    def _read_ref(self, ref: str) -> Optional[str]:
+        loose = os.path.join(self.git_dir, ref)
+        if os.path.isfile(loose):
+            with open(loose) as f:
+                value = f.read().strip()
+            return self._read_ref(value[5:]) if value.startswith("ref: ") else value
+
+        packed = os.path.join(self.git_dir, "packed-refs")
+        if os.path.isfile(packed):
+            with open(packed) as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+        return None
+
+    def head(self) -> Tuple[Optional[str], Optional[str]]:
+        """(branch name or None when detached, commit sha or None when unborn)"""
+        with open(os.path.join(self.git_dir, "HEAD")) as f:
+            value = f.read().strip()
+        if value.startswith("ref: "):
+            ref = value[5:]
+            return ref.rsplit("refs/heads/", 1)[-1], self._read_ref(ref)
+        return None, value
+
+    def commit(self, sha: str) -> dict:
+        cached = _commits.get(sha)
+        if cached is not None:
+            return cached
+
+        obj_type, data = self.cat.read(sha)
+        if obj_type != "commit":
+            raise UnsupportedRepo(f"{sha} is a {obj_type}, not a commit")
+        header, _, message = data.decode("utf-8", errors="replace").partition("\n\n")
+        parsed = {"sha": sha, "parents": [], "message": message}
+        for line in header.split("\n"):
+            key, _, value = line.partition(" ")
+            if key == "tree":
+                parsed["tree"] = value
+            elif key == "parent":
+                parsed["parents"].append(value)
+            elif key == "committer":
+                parsed["time"] = int(value.rsplit(" ", 2)[-2])
+            elif key == "author":
+                parsed["author"] = value.rsplit(" ", 2)[0]
+        _commits.put(sha, parsed)
+        return parsed
+
+    def tree(self, sha: str) -> Dict[str, tuple]:
+        """Flattened tree: {path: (mode, sha)} for every blob and symlink."""
+        cached = _trees.get(sha)
+        if cached is not None:
+            return cached
+
+        obj_type, data = self.cat.read(sha)
+        flat = {}
+        pos = 0
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            nul = data.index(b"\0", space)
+            mode = int(data[pos:space], 8)
+            name = data[space + 1:nul].decode("utf-8", errors="surrogateescape")
+            child = data[nul + 1:nul + 21].hex()
+            pos = nul + 21
+            if stat.S_ISDIR(mode):
+                for sub_path, entry in self.tree(child).items():
+                    flat[f"{name}/{sub_path}"] = entry
+            elif mode != 0o160000:
+                flat[name] = (mode, child)
+        _trees.put(sha, flat)
+        return flat
+
+    def head_tree(self) -> Dict[str, tuple]:
+        _, head = self.head()
+        return self.tree(self.commit(head)["tree"]) if head else {}
+
+    # --- working tree ---
+
+    def _ignore_patterns(self) -> List[str]:
+        patterns = []
+        for path in (os.path.join(self.root, ".gitignore"), os.path.join(self.git_dir, "info", "exclude")):
+            if not os.path.isfile(path):
+                continue
+            with open(path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    if line.startswith("!"):
+                        raise UnsupportedRepo("negated ignore rules")
+                    patterns.append(line)
+        return patterns
+
+    def _ignored(self, rel_path: str, name: str, patterns: List[str], is_dir: bool) -> bool:
+        for pattern in patterns:
+            if pattern.endswith("/"):
+                if not is_dir:
+                    continue
+                pattern = pattern.rstrip("/")
+            if pattern.startswith("/"):
+                if fnmatch.fnmatch(rel_path, pattern[1:]):
+                    return True
+            elif "/" in pattern:
+                if fnmatch.fnmatch(rel_path, pattern):
+                    return True
+            elif fnmatch.fnmatch(name, pattern):
+                return True
+        return False
+
+    def _worktree_files(self) -> List[str]:
+        patterns = self._ignore_patterns()
+        files = []
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            with os.scandir(os.path.join(self.root, rel_dir)) as it:
+                for entry in it:
+                    rel_path = f"{rel_dir}{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name == ".git" or self._ignored(rel_path, entry.name, patterns, True):
+                            continue
+                        stack.append(rel_path + "/")
+                    else:
+                        if entry.name == ".gitignore" and rel_dir:
+                            raise UnsupportedRepo("nested .gitignore")
+                        if not self._ignored(rel_path, entry.name, patterns, False):
+                            files.append(rel_path)
+        return files
+
+    def _read_worktree(self, rel_path: str) -> Optional[bytes]:
+        full_path = os.path.join(self.root, rel_path)
+        if os.path.islink(full_path):
+            return os.readlink(full_path).encode()
+        try:
+            with open(full_path, "rb") as f:
+                return f.read()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+
+    def _worktree_change(self, rel_path: str, entry: tuple) -> Optional[str]:
+        """None if the file matches its index entry, else "modified" or "deleted"."""
+        mode, sha, size, mtime_ns = entry
+        try:
+            st = os.lstat(os.path.join(self.root, rel_path))
+        except FileNotFoundError:
+            return "deleted"
+        if stat.S_ISDIR(st.st_mode):
+            return "deleted"
+
+        if stat.S_ISREG(st.st_mode) and stat.S_ISREG(mode) and (st.st_mode & 0o100) != (mode & 0o100):
+            return "modified"
+        # Same stat as when it was staged: unchanged without reading it
+        if st.st_size == size and st.st_mtime_ns == mtime_ns:
+            return None
+        data = self._read_worktree(rel_path)
+        return None if data is not None and blob_sha(data) == sha else "modified"
+
+    # --- commands ---
+
+    def status(self, path: Optional[str] = None) -> str:
+        branch, head = self.head()
+        index = self.index()
+        head_tree = self.head_tree()
+
+        def wanted(rel_path: str) -> bool:
+            return not path or rel_path == path or rel_path.startswith(path.rstrip("/") + "/")
+
+        staged = []
+        for rel_path in sorted(set(index) | set(head_tree)):
+            if not wanted(rel_path):
+                continue
+            if rel_path not in head_tree:
+                staged.append(("new file", rel_path))
+            elif rel_path not in index:
+                staged.append(("deleted", rel_path))
+            elif index[rel_path][:2] != head_tree[rel_path]:
+                staged.append(("modified", rel_path))
+
+        unstaged = []
+        for rel_path in sorted(index):
+            if wanted(rel_path):
+                change = self._worktree_change(rel_path, index[rel_path])
+                if change:
+                    unstaged.append((change, rel_path))
+
+        # Untracked files are collapsed to their top-most directory holding no tracked files
+        tracked_dirs = {rel_path.rsplit("/", i)[0] for rel_path in index for i in range(1, rel_path.count("/") + 1)}
+        untracked = set()
+        for rel_path in self._worktree_files():
+            if rel_path in index or not wanted(rel_path):
+                continue
+            parts = rel_path.split("/")
+            shown = rel_path
+            for depth in range(1, len(parts)):
+                prefix = "/".join(parts[:depth])
+                if prefix not in tracked_dirs:
+                    shown = prefix + "/"
+                    break
+            untracked.add(shown)
+
+        lines = [f"On branch {branch}" if branch else f"HEAD detached at {head[:7]}"]
+        if not head:
+            lines += ["", "No commits yet", ""]
+
+        sections = []
+        for title, changes in (("Changes to be committed:", staged), ("Changes not staged for commit:", unstaged)):
+            if changes:
+                sections.append([title] + [f"\t{kind + ':':<12}{rel_path}" for kind, rel_path in changes])
+        if untracked:
+            sections.append(["Untracked files:"] + [f"\t{rel_path}" for rel_path in sorted(untracked)])
+        if sections:
+            lines.append("\n\n".join("\n".join(section) for section in sections))
+
+        if staged:
+            footer = None
+        elif unstaged:
+            footer = 'no changes added to commit (use "git add" and/or "git commit -a")'
+        elif untracked:
+            footer = 'nothing added to commit but untracked files present (use "git add" to track)'
+        else:
+            footer = "nothing to commit, working tree clean"
+        if footer:
+            lines += ["", footer] if sections else [footer]
+        return "\n".join(lines).strip()
+
+    def log(self, limit: int = 5, path: Optional[str] = None) -> str:
+        _, head = self.head()
+        if not head:
+            return f"GIT ERROR: fatal: your current branch does not have any commits yet"
+
+        def touches(commit: dict) -> bool:
+            tree = self.tree(commit["tree"])
+            parent_tree = self.tree(self.commit(commit["parents"][0])["tree"]) if commit["parents"] else {}
+            prefix = path.rstrip("/") + "/"
+            for rel_path in set(tree) | set(parent_tree):
+                if (rel_path == path or rel_path.startswith(prefix)) and tree.get(rel_path) != parent_tree.get(rel_path):
+                    return True
+            return False
+
+        # Newest first by committer time, like git log's default order
+        lines, seen = [], {head}
+        queue = [(-self.commit(head)["time"], head)]
+        while queue and len(lines) < limit:
+            _, sha = heapq.heappop(queue)
+            commit = self.commit(sha)
+            for parent in commit["parents"]:
+                if parent not in seen:
+                    seen.add(parent)
+                    heapq.heappush(queue, (-self.commit(parent)["time"], parent))
+            if path and not touches(commit):
+                continue
+            lines.append(f"{sha[:7]} {commit['message'].split(chr(10), 1)[0]}")
+        return "\n".join(lines)
+
+    def _file_diff(self, rel_path: str, entry: tuple, change: str) -> Tuple[List[str], int, int]:
+        """Git-style diff of one file against the index, plus insertion/deletion counts."""
+        mode, old_sha = entry[0], entry[1]
+        _, old_data = self.cat.read(old_sha)
+        new_data = b"" if change == "deleted" else self._read_worktree(rel_path)
+        new_sha = EMPTY_SHA if change == "deleted" else blob_sha(new_data)
+
+        lines = [f"diff --git a/{rel_path} b/{rel_path}"]
+        if change == "deleted":
+            lines += [f"deleted file mode {mode:o}", f"index {old_sha[:7]}..{new_sha[:7]}"]
+        else:
+            new_mode = os.lstat(os.path.join(self.root, rel_path)).st_mode
+            new_mode = 0o100755 if stat.S_ISREG(new_mode) and new_mode & 0o100 else (0o120000 if stat.S_ISLNK(new_mode) else 0o100644)
+            if new_mode != mode:
+                lines += [f"old mode {mode:o}", f"new mode {new_mode:o}"]
+            if new_sha == old_sha:
+                return lines, 0, 0
+            lines.append(f"index {old_sha[:7]}..{new_sha[:7]}" + (f" {mode:o}" if new_mode == mode else ""))
+
+        if _is_binary(old_data) or _is_binary(new_data):
+            lines.append(f"Binary files a/{rel_path} and {'/dev/null' if change == 'deleted' else 'b/' + rel_path} differ")
+            return lines, 0, 0
+
+        old_lines = old_data.decode("utf-8", errors="replace").splitlines(keepends=True)
+        new_lines = new_data.decode("utf-8", errors="replace").splitlines(keepends=True)
+        body = list(difflib.unified_diff(
+            old_lines, new_lines,
+            fromfile=f"a/{rel_path}",
+            tofile="/dev/null" if change == "deleted" else f"b/{rel_path}",
+            lineterm="\n",
+        ))
+
+        insertions = deletions = 0
+        hunks = []
+        for line in body[2:]:
+            if line.startswith("+"):
+                insertions += 1
+            elif line.startswith("-"):
+                deletions += 1
+            hunks.append(line.rstrip("\n"))
+            if not line.endswith("\n"):
+                hunks.append("\\ No newline at end of file")
+        return lines + [header.rstrip("\n") for header in body[:2]] + hunks, insertions, deletions
+
+    def diff(self, path: Optional[str] = None, stat_only: bool = False, max_lines: int = 400) -> str:
+        """Working tree vs index, like `git diff [--stat] [-- path]`."""
+        index = self.index()
+        prefix = path.rstrip("/") + "/" if path else None
+
+        output, stats = [], []
+        for rel_path in sorted(index):
+            if path and not (rel_path == path or rel_path.startswith(prefix) or fnmatch.fnmatch(rel_path, path)):
+                continue
+            change = self._worktree_change(rel_path, index[rel_path])
+            if not change:
+                continue
+            lines, insertions, deletions = self._file_diff(rel_path, index[rel_path], change)
+            if len(lines) <= 1:
+                continue
+            stats.append((rel_path, insertions, deletions, any(l.startswith("Binary files") for l in lines)))
+            output.extend(lines)
+
+        if stat_only:
+            return _format_stat(stats)
+
+        if len(output) > max_lines:
+            omitted = len(output) - max_lines
+            output = output[:max_lines] + [f"... diff truncated ({omitted} more lines). Use path= or stat=True to narrow it."]
+        return "\n".join(output)
+
+    def close(self):
+        self.cat.close()
+
+def _format_stat(stats: List[tuple]) -> str:
+    if not stats:
+        return ""
+    width = max(len(rel_path) for rel_path, *_ in stats)
+    lines = []
+    for rel_path, insertions, deletions, binary in stats:
+        if binary:
+            lines.append(f" {rel_path:<{width}} | Bin")
+        else:
+            lines.append(f" {rel_path:<{width}} | {insertions + deletions} {'+' * insertions}{'-' * deletions}")
+    total_ins = sum(s[1] for s in stats)
+    total_del = sum(s[2] for s in stats)
+    summary = f" {len(stats)} file{'s' if len(stats) != 1 else ''} changed"
+    if total_ins:
+        summary += f", {total_ins} insertion{'s' if total_ins != 1 else ''}(+)"
+    if total_del:
+        summary += f", {total_del} deletion{'s' if total_del != 1 else ''}(-)"
+    return "\n".join(lines + [summary])
+
+_repos: Dict[str, GitRepo] = {}
+_repos_lock = threading.Lock()
+
+def get_repo(root: str) -> GitRepo:
+    with _repos_lock:
+        if root not in _repos:
+            _repos[root] = GitRepo(root)
+        return _repos[root]
+
+def _close_repo(root: str):
+    with _repos_lock:
+        repo = _repos.pop(root, None)
+    if repo is not None:
+        repo.close()
+
+on_release(_close_repo)
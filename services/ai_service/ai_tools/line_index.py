@@ -0,0 +1,92 @@
+# ----- Line-offset index for ranged file reads @ services/ai_service/ai_tools/line_index.py -----
+
+import os
+import mmap
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List, Tuple
+
+MAX_CACHED_FILES = 256
+
+# path -> ((ino, mtime_ns, size), offsets); offsets[i] is the byte offset where line i+1 starts
+_offsets_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _scan_offsets(full_path: str, size: int) -> array:
+    offsets = array('Q', [0])
+    if size == 0:
+        return offsets
+    with open(full_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        position = mm.find(b'\n')
+        while position != -1:
+            offsets.append(position + 1)
+            position = mm.find(b'\n', position + 1)
+    return offsets
+
+def line_offsets(full_path: str) -> Tuple[array, int]:
+    """
+    Start offsets of every line plus the file size, from one mmap scan.
+    Cached until the file's inode, mtime or size changes (atomic writes swap the inode).
+    """
+    st = os.stat(full_path)
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    with _cache_lock:
+        cached = _offsets_cache.get(full_path)
+        if cached and cached[0] == key:
+            _offsets_cache.move_to_end(full_path)
+            return cached[1], st.st_size
+
+    offsets = _scan_offsets(full_path, st.st_size)
+    with _cache_lock:
+        _offsets_cache[full_path] = (key, offsets)
+        _offsets_cache.move_to_end(full_path)
+        while len(_offsets_cache) > MAX_CACHED_FILES:
+            _offsets_cache.popitem(last=False)
+    return offsets, st.st_size
+
+def line_count(full_path: str) -> int:
+    """Number of lines, counted like str.split('\\n') (a trailing newline starts an empty last line)."""
+    return len(line_offsets(full_path)[0])
+
+def read_lines(full_path: str, start: int, end: int) -> List[str]:
+    """Lines start..end (1-based, inclusive), reading only those bytes."""
+    offsets, size = line_offsets(full_path)
+    total = len(offsets)
+    start = max(1, start)
+    end = min(end, total)
+    if start > end:
+        return []
+
+    first = offsets[start - 1]
+    last = offsets[end] if end < total else size
+    with open(full_path, 'rb') as f:
+        f.seek(first)
+        data = f.read(last - first)
+
+    text = data.decode('utf-8', errors='replace')
+    if end < total:
+        text = text[:-1] if text.endswith('\n') else text
+    return text.split('\n')
+
+def read_line_prefixes(full_path: str, start: int, end: int, max_bytes: int) -> List[Tuple[str, int]]:
+    """
+    Lines start..end (1-based, inclusive), each cut to its first max_bytes bytes, with the
+    line's full length in bytes. Reads at most max_bytes per line, however long the lines are.
+    """
+    offsets, size = line_offsets(full_path)
+    total = len(offsets)
+    start = max(1, start)
+    end = min(end, total)
+
+    lines = []
+    with open(full_path, 'rb') as f:
+        for number in range(start, end + 1):
+            begin = offsets[number - 1]
+            # Excluding the line's "\n"
+            stop = offsets[number] - 1 if number < total else size
+            f.seek(begin)
+            data = f.read(min(stop - begin, max_bytes))
+            lines.append((data.decode('utf-8', errors='replace'), stop - begin))
+    return lines
@@ -1,11 +1,29 @@
 import os
+import re
+import stat
+import glob
+import fnmatch
+import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
 from langchain_core.tools import tool
-from services.ai_service.ai_tools.db_setup import get_sql_tools
+from langchain_core.runnables import RunnableConfig
+from services.ai_service.ai_tools.db_setup import get_sql_tools, is_read_only_query
+from services.ai_service.ai_tools.sessions import SANDBOX_PATH, resolve_sandbox
+from services.ai_service.ai_tools.search_index import get_index
+from services.ai_service.ai_tools.symbol_index import get_symbol_index
+from services.ai_service.ai_tools.line_index import line_count, read_line_prefixes, read_lines
+from services.ai_service.ai_tools.git_backend import UnsupportedRepo, get_repo
+from services.ai_service.ai_tools.patching import (
+    PatchError, SearchReplace, apply_edits, apply_hunks, check_base_hash, content_hash, parse_unified_diff,
+    restore_line_endings, split_line_endings
+)
+from backend.utils.logger import get_logger
 
-SANDBOX_PATH = os.path.abspath("./services/ai_service/sandbox")
+logger = get_logger(__name__)
 
-def _resolve_path(path: str) -> str:
+def _resolve_path(path: str, root: str = SANDBOX_PATH) -> str:
     """
     Resolves a relative path within the sandbox.
     Handles paths that might start with / or ./ or be relative
@@ -18,20 +36,39 @@ def _resolve_path(path: str) -> str:
     path = path.lstrip('/')
     
     # If path already starts with the sandbox path (full path given), use as-is
-    if path.startswith(SANDBOX_PATH):
+    if path.startswith(root):
         return path
     
     # Otherwise, join with sandbox path
-    return os.path.join(SANDBOX_PATH, path)
+    return os.path.join(root, path)
+
+def _atomic_write(full_path: str, content: str):
+    """
+    Writes a file via temp file + rename.
+    Session sandboxes hardlink unchanged files to the template, so files must never be
+    modified in place - the rename gives the session its own copy.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(full_path), prefix=".authchain-", suffix=".tmp")
+    try:
+        # newline='' writes the content byte for byte (no line-ending translation)
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        mode = stat.S_IMODE(os.stat(full_path).st_mode) if os.path.exists(full_path) else 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, full_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 # --- GIT TOOLS ---
 
-def _run_git_command(args: list) -> str:
+def _run_git_command(args: list, root: str = SANDBOX_PATH) -> str:
     """Helper to run git commands in the sandbox root"""
     try:
         result = subprocess.run(
             ["git"] + args,
-            cwd=SANDBOX_PATH,
+            cwd=root,
             capture_output=True,
             text=True,
             check=True
@@ -42,35 +79,55 @@ def _run_git_command(args: list) -> str:
     except FileNotFoundError:
         return "ERROR: Git is not installed in the environment."
 
+def _git_backend_call(root: str, method: str, cli_args: list, **kwargs) -> str:
+    """Serves a git tool from the in-process reader, falling back to the git CLI for repos it cannot read."""
+    try:
+        return getattr(get_repo(root), method)(**kwargs)
+    except (UnsupportedRepo, KeyError, OSError, ValueError) as e:
+        logger.warning(f"⚠️ git {method} falling back to the git CLI: {e}")
+        return _run_git_command(cli_args, root)
+
 @tool
-def git_status() -> str:
+def git_status(config: RunnableConfig, path: str = None) -> str:
     """
     Shows the working tree status (changed files, untracked files).
     Use this to see what has changed before committing.
+    
+    Args:
+        path: Optional file or directory to limit the status to
     """
-    return _run_git_command(["status"])
+    return _git_backend_call(resolve_sandbox(config), "status", ["status"] + (["--", path] if path else []), path=path)
 
 @tool
-def git_log(limit: int = 5) -> str:
+def git_log(config: RunnableConfig, limit: int = 5, path: str = None) -> str:
     """
     Shows the commit logs.
     Args:
         limit: Number of commits to show (default 5)
+        path: Optional file or directory; only commits touching it are shown
     """
-    return _run_git_command(["log", f"-n{limit}", "--oneline"])
+    cli_args = ["log", f"-n{limit}", "--oneline"] + (["--", path] if path else [])
+    return _git_backend_call(resolve_sandbox(config), "log", cli_args, limit=limit, path=path)
 
 @tool
-def git_diff() -> str:
+def git_diff(config: RunnableConfig, path: str = None, stat: bool = False, max_lines: int = 400) -> str:
     """
     Shows changes between commits, commit and working tree, etc.
     Use this to review modifications before committing.
+    
+    Args:
+        path: Optional file or directory to limit the diff to
+        stat: Only show a per-file summary of changed lines (default False)
+        max_lines: Maximum diff lines to return (default 400)
     """
-    return _run_git_command(["diff"])
+    cli_args = ["diff"] + (["--stat"] if stat else []) + (["--", path] if path else [])
+    result = _git_backend_call(resolve_sandbox(config), "diff", cli_args, path=path, stat_only=stat, max_lines=max_lines)
+    return result or "No unstaged changes"
 
 # --- FILE SYSTEM TOOLS ---
 
 @tool
-def list_directory(path: str = ".") -> str:
+def list_directory(config: RunnableConfig, path: str = ".") -> str:
     """
     Lists all files and subdirectories in the specified sandbox directory.
     
@@ -81,7 +138,7 @@ def list_directory(path: str = ".") -> str:
     
     Returns: Detailed directory listing with file sizes and types
     """
-    full_path = _resolve_path(path)
+    full_path = _resolve_path(path, resolve_sandbox(config))
     
     if not os.path.exists(full_path):
         return f"ERROR: Path '{path}' does not exist in sandbox"
@@ -89,9 +146,10 @@ def list_directory(path: str = ".") -> str:
     if not os.path.isdir(full_path):
         return f"ERROR: '{path}' is not a directory"
     
-    items = os.listdir(full_path)
+    with os.scandir(full_path) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
     
-    if not items:
+    if not entries:
         return f"Directory '{path}' is empty"
     
     result = [f"Contents of '{path}':"]
@@ -100,14 +158,13 @@ def list_directory(path: str = ".") -> str:
     dirs = []
     files = []
     
-    for item in sorted(items):
-        item_path = os.path.join(full_path, item)
-        if os.path.isdir(item_path):
-            dirs.append(f"  [DIR]  {item}/")
+    for entry in entries:
+        if entry.is_dir():
+            dirs.append(f"  [DIR]  {entry.name}/")
         else:
-            size = os.path.getsize(item_path)
-            extension = os.path.splitext(item)[1]
-            files.append(f"  [FILE] {item} ({size} bytes){extension}")
+            size = entry.stat().st_size
+            extension = os.path.splitext(entry.name)[1]
+            files.append(f"  [FILE] {entry.name} ({size} bytes){extension}")
     
     if dirs:
         result.append("\nDirectories:")
@@ -119,29 +176,141 @@ def list_directory(path: str = ".") -> str:
     
     return "\n".join(result)
 
+TREE_IGNORE = {".git", "__pycache__", ".pytest_cache", "node_modules", ".venv"}
+
 @tool
-def read_file(path: str) -> str:
+def list_tree(config: RunnableConfig, path: str = ".", max_depth: int = 3, pattern: str = None, max_entries: int = 200) -> str:
     """
-    Reads the complete contents of a text file from the sandbox.
-    
-    WARNING: Cannot read binary files (.db, .sqlite, .pyc, images)
-    For database files, use sql_db_* tools instead.
+    Lists a directory recursively as a compact tree in one call.
+    Prefer this over repeated list_directory calls when exploring a project.
     
     Args:
-        path: Relative path to file (e.g., "src/main.py")
+        path: Relative path from sandbox root (default ".")
+        max_depth: How many directory levels to descend (default 3)
+        pattern: Optional glob filter for file names or paths (e.g. "*.py", "src/*.js")
+        max_entries: Maximum number of entries to show (default 200)
     
-    Returns: Full file contents with line numbers for reference
+    Returns: Indented tree with file sizes; .git, __pycache__ and similar are skipped
     """
-    # Binary file protection
-    BINARY_EXTENSIONS = {'.db', '.sqlite', '.sqlite-wal', '.sqlite-shm', '.pyc', '.png', '.jpg', '.jpeg', '.bin'}
+    full_path = _resolve_path(path, resolve_sandbox(config))
+    
+    if not os.path.exists(full_path):
+        return f"ERROR: Path '{path}' does not exist in sandbox"
+    
+    if not os.path.isdir(full_path):
+        return f"ERROR: '{path}' is not a directory"
+    
+    counts = {"dirs": 0, "files": 0, "shown": 0}
+    truncated = False
+    
+    def walk(directory: str, depth: int) -> list:
+        nonlocal truncated
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: (not entry.is_dir(follow_symlinks=False), entry.name))
+        except OSError as e:
+            return [f"{'  ' * depth}[unreadable: {e.strerror}]"]
+        
+        lines = []
+        for entry in entries:
+            if counts["shown"] >= max_entries:
+                truncated = True
+                break
+            indent = "  " * depth
+            
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in TREE_IGNORE:
+                    continue
+                if depth + 1 >= max_depth:
+                    if not pattern:
+                        counts["dirs"] += 1
+                        counts["shown"] += 1
+                        lines.append(f"{indent}{entry.name}/ ...")
+                    continue
+                
+                counts["shown"] += 1
+                children = walk(entry.path, depth + 1)
+                if pattern and not children:
+                    counts["shown"] -= 1
+                    continue
+                counts["dirs"] += 1
+                lines.append(f"{indent}{entry.name}/")
+                lines.extend(children)
+            else:
+                rel_path = os.path.relpath(entry.path, full_path)
+                if pattern and not (fnmatch.fnmatch(entry.name, pattern) or fnmatch.fnmatch(rel_path, pattern)):
+                    continue
+                counts["files"] += 1
+                counts["shown"] += 1
+                lines.append(f"{indent}{entry.name} ({entry.stat(follow_symlinks=False).st_size} bytes)")
+        return lines
+    
+    lines = walk(full_path, 0)
+    
+    if not lines:
+        return f"No entries in '{path}'" + (f" matching '{pattern}'" if pattern else "")
+    
+    header = f"Tree of '{path}' ({counts['dirs']} dirs, {counts['files']} files, depth {max_depth}):"
+    if truncated:
+        lines.append(f"... (stopped at {max_entries} entries; narrow the path or pattern)")
+    return header + "\n" + "\n".join(lines)
+
+# Files above this size are previewed (head + tail) unless a line range is requested
+READ_FILE_MAX_BYTES = 64 * 1024
+PREVIEW_HEAD_LINES = 60
+PREVIEW_TAIL_LINES = 20
+# Preview lines are cut here (minified JSON, generated bundles)
+PREVIEW_MAX_LINE_BYTES = 500
+
+def _number_lines(lines: list, first_line: int) -> str:
+    # CRLF files keep their "\r" on disk and in the hash; it is only hidden from the listing
+    return "\n".join(f"{first_line + i:4d} | {line.rstrip(chr(13))}" for i, line in enumerate(lines))
+
+BINARY_EXTENSIONS = {'.db', '.sqlite', '.sqlite-wal', '.sqlite-shm', '.pyc', '.png', '.jpg', '.jpeg', '.bin'}
+
+def _preview_lines(full_path: str, start: int, end: int) -> list:
+    lines = []
+    for text, length in read_line_prefixes(full_path, start, end, PREVIEW_MAX_LINE_BYTES):
+        if length > PREVIEW_MAX_LINE_BYTES:
+            text += f" ... (+{length - PREVIEW_MAX_LINE_BYTES} bytes, use start_line/end_line for the whole line)"
+        lines.append(text)
+    return lines
+
+def _binary_file_error(path: str) -> str:
+    """Binary file protection: an ERROR message for files that must not be read as text, else None."""
     _, ext = os.path.splitext(path)
     
     if ext.lower() in BINARY_EXTENSIONS:
         if ext.lower() in {'.db', '.sqlite'}:
             return f"ERROR: '{path}' is a database file. Use sql_db_list_tables and sql_db_query to inspect it."
         return f"ERROR: '{path}' is a binary file and cannot be read as text."
+    return None
+
+def _file_hash(full_path: str) -> str:
+    with open(full_path, 'rb') as f:
+        return content_hash(f.read())
+
+@tool
+def read_file(path: str, config: RunnableConfig, start_line: int = None, end_line: int = None) -> str:
+    """
+    Reads the contents of a text file from the sandbox, optionally only a range of lines.
+    
+    WARNING: Cannot read binary files (.db, .sqlite, .pyc, images)
+    For database files, use sql_db_* tools instead.
+    Large files return a head/tail preview; use start_line/end_line to read the rest.
+    
+    Args:
+        path: Relative path to file (e.g., "src/main.py")
+        start_line: First line to read, 1-based (optional)
+        end_line: Last line to read, inclusive (optional)
+    
+    Returns: File contents with line numbers and a sha256 to pass to edit_file/apply_patch as base_hash
+    """
+    binary_error = _binary_file_error(path)
+    if binary_error:
+        return binary_error
 
-    full_path = _resolve_path(path)
+    full_path = _resolve_path(path, resolve_sandbox(config))
     
     if not os.path.exists(full_path):
         available_files = os.listdir(os.path.dirname(full_path)) if os.path.dirname(full_path) else []
@@ -151,70 +320,249 @@ def read_file(path: str) -> str:
         return f"ERROR: '{path}' is not a file"
     
     try:
-        with open(full_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        size = os.path.getsize(full_path)
+        
+        if start_line is not None or end_line is not None:
+            total = line_count(full_path)
+            first = max(1, start_line or 1)
+            last = min(end_line or total, total)
+            if first > total:
+                return f"ERROR: '{path}' has only {total} lines (requested start_line={first})"
+            if first > last:
+                return f"ERROR: start_line ({first}) is after end_line ({last})"
+            lines = read_lines(full_path, first, last)
+            return f"Lines {first}-{last} of '{path}' ({total} lines, sha256 {_file_hash(full_path)}):\n\n" + _number_lines(lines, first)
+        
+        # Large by bytes, whatever the line count: a few huge lines are previewed too
+        if size > READ_FILE_MAX_BYTES:
+            total = line_count(full_path)
+            header = f"Preview of '{path}' ({total} lines, {size} bytes, sha256 {_file_hash(full_path)} - too large to show in full):\n\n"
+            if total <= PREVIEW_HEAD_LINES + PREVIEW_TAIL_LINES:
+                return header + _number_lines(_preview_lines(full_path, 1, total), 1)
+            tail_start = total - PREVIEW_TAIL_LINES + 1
+            return (
+                header
+                + _number_lines(_preview_lines(full_path, 1, PREVIEW_HEAD_LINES), 1)
+                + f"\n     ... ({tail_start - PREVIEW_HEAD_LINES - 1} lines omitted, use start_line/end_line to read them) ...\n"
+                + _number_lines(_preview_lines(full_path, tail_start, total), tail_start)
+            )
+        
+        # Hashed as raw bytes, like the ranged and preview reads, so any base_hash matches edit_file's
+        with open(full_path, 'rb') as f:
+            raw = f.read()
+        content = raw.decode('utf-8')
             
         # Add line numbers for better reference
         lines = content.split('\n')
-        numbered_lines = [f"{i+1:4d} | {line}" for i, line in enumerate(lines)]
-        
-        return f"Contents of '{path}' ({len(lines)} lines):\n\n" + "\n".join(numbered_lines)
+        return f"Contents of '{path}' ({len(lines)} lines, sha256 {content_hash(raw)}):\n\n" + _number_lines(lines, 1)
     except Exception as e:
         return f"ERROR reading '{path}': {str(e)}"
 
+MANY_FILES_MAX = 20
+# Below this much budget a file is skipped rather than shown as a stub of its first line
+MANY_FILES_MIN_BUDGET = 200
+
+def _read_for_batch(full_path: str, max_lines: int) -> tuple:
+    """(lines up to max_lines, total line count, sha256) or raises OSError/UnicodeDecodeError."""
+    total = line_count(full_path)
+    return read_lines(full_path, 1, min(total, max_lines)), total, _file_hash(full_path)
+
+@tool
+def read_many_files(config: RunnableConfig, paths: List[str] = None, pattern: str = None,
+                    max_total_bytes: int = 48000, max_lines_per_file: int = 400) -> str:
+    """
+    Reads several related text files in one call instead of one read_file call each.
+    
+    USAGE: Pass explicit paths, or a glob pattern (e.g. "src/*.py", "src/**/*.py").
+    Output is capped by a total size budget; truncated files say which lines were cut,
+    so you can fetch the rest with read_file(path, start_line=...).
+    
+    Args:
+        paths: Relative paths to read (e.g. ["src/auth.py", "src/main.py"])
+        pattern: Glob relative to the sandbox root, used when paths is not given
+        max_total_bytes: Total budget for file contents across all files (default 48000)
+        max_lines_per_file: Maximum lines per file (default 400)
+    
+    Returns: Each file's contents with line numbers and sha256, in request order
+    """
+    root = resolve_sandbox(config)
+    
+    if not paths and not pattern:
+        return "ERROR: Provide paths or a glob pattern"
+    
+    if not paths:
+        paths = sorted(
+            p for p in glob.glob(pattern, root_dir=root, recursive=True)
+            if os.path.isfile(os.path.join(root, p)) and not any(part in TREE_IGNORE for part in p.split(os.sep))
+        )
+        if not paths:
+            return f"No files match '{pattern}'"
+    
+    notes = []
+    if len(paths) > MANY_FILES_MAX:
+        notes.append(f"... {len(paths) - MANY_FILES_MAX} more files not read (limit {MANY_FILES_MAX} per call): {', '.join(paths[MANY_FILES_MAX:MANY_FILES_MAX + 10])}")
+        paths = paths[:MANY_FILES_MAX]
+    
+    sections = {}
+    readable = []
+    for path in paths:
+        binary_error = _binary_file_error(path)
+        full_path = _resolve_path(path, root)
+        if binary_error:
+            sections[path] = binary_error
+        elif not os.path.isfile(full_path):
+            sections[path] = f"ERROR: File '{path}' does not exist"
+        else:
+            readable.append((path, full_path))
+    
+    with ThreadPoolExecutor(max_workers=min(8, max(len(readable), 1))) as pool:
+        futures = {path: pool.submit(_read_for_batch, full_path, max_lines_per_file) for path, full_path in readable}
+    
+    budget = max_total_bytes
+    for path, _ in readable:
+        try:
+            lines, total, digest = futures[path].result()
+        except Exception as e:
+            sections[path] = f"ERROR reading '{path}': {str(e)}"
+            continue
+        
+        shown = []
+        for line in lines:
+            cost = len(line) + 1
+            if cost > budget:
+                break
+            shown.append(line)
+            budget -= cost
+        
+        if not shown and lines and budget >= MANY_FILES_MIN_BUDGET:
+            # One line larger than what is left (minified JSON): show its start, keep the hash
+            cut = budget - 1
+            shown.append(lines[0][:cut] + f" ... (+{len(lines[0]) - cut} characters)")
+            budget = 0
+        
+        if not shown and lines:
+            sections[path] = f"--- {path} ({total} lines, sha256 {digest}) --- skipped: size budget used up; read it separately"
+            continue
+        
+        body = _number_lines(shown, 1)
+        if len(shown) < total:
+            body += f"\n     ... (truncated: lines {len(shown) + 1}-{total} not shown; use read_file('{path}', start_line={len(shown) + 1}))"
+        sections[path] = f"--- {path} ({total} lines, sha256 {digest}) ---\n{body}"
+    
+    return "\n\n".join([sections[path] for path in paths] + notes)
+
 @tool
-def search_codebase(query: str) -> str:
+def search_codebase(query: str, config: RunnableConfig, regex: bool = False, max_results: int = 50, context_lines: int = 0) -> str:
     """
-    Searches for a text string within all files in the sandbox.
+    Searches for a text string (or regex) within all files in the sandbox.
     
     USAGE: Use this to find where functions, classes, or variables are defined.
     Example: search_codebase("def authenticate") to find authentication functions
     
     Args:
         query: Text string to search for (case-sensitive)
+        regex: Treat query as a Python regular expression (default False)
+        max_results: Maximum number of files to report (default 50)
+        context_lines: Lines of context to show around each match (default 0)
     
     Returns: List of files containing the query with match counts
     """
-    results = []
-    search_root = SANDBOX_PATH
+    try:
+        found = get_index(resolve_sandbox(config)).search(query, regex=regex, max_files=max_results, context_lines=context_lines)
+    except re.error as e:
+        return f"ERROR: Invalid regex '{query}': {e}"
     
-    for root, _, files in os.walk(search_root):
-        # Skip git metadata and cache directories
-        if ".git" in root or "__pycache__" in root:
-            continue
-            
-        for file in files:
-            file_path = os.path.join(root, file)
-            
-            # Skip binary files
-            if file.endswith(('.db', '.sqlite', '.pyc', '.png', '.jpg', '.jpeg')):
-                continue
-
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    if query in content:
-                        rel_path = os.path.relpath(file_path, SANDBOX_PATH)
-                        count = content.count(query)
-                        
-                        # Find line numbers where query appears
-                        lines = content.split('\n')
-                        line_numbers = [i+1 for i, line in enumerate(lines) if query in line]
-                        line_info = f"lines {', '.join(map(str, line_numbers[:5]))}"
-                        if len(line_numbers) > 5:
-                            line_info += f"... (+ {len(line_numbers) - 5} more)"
-                        
-                        results.append(f"{rel_path} ({count} matches, {line_info})")
-            except:
-                continue
+    results = []
+    for match in found["files"]:
+        line_numbers = match["lines"]
+        line_info = f"lines {', '.join(map(str, line_numbers[:5]))}"
+        if len(line_numbers) > 5:
+            line_info += f"... (+ {len(line_numbers) - 5} more)"
+        
+        entry = f"  - {match['path']} ({match['count']} matches, {line_info})"
+        for snippet in match["snippets"]:
+            entry += "\n" + "\n".join(f"      {n:4d} | {line}" for n, line in snippet)
+        results.append(entry)
     
     if not results:
         return f"No matches found for '{query}' in codebase"
     
-    return f"Found '{query}' in {len(results)} file(s):\n" + "\n".join(f"  - {r}" for r in results)
+    output = f"Found '{query}' in {len(results)} file(s):\n" + "\n".join(results)
+    if found["truncated"]:
+        output += f"\n  ... more files match; showing the first {max_results}. Narrow the query or raise max_results."
+    return output
+
+def _line_snippet(full_path: str, start: int, end: int, max_lines: int = 40) -> str:
+    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.read().split('\n')
+    stop = min(end, start + max_lines - 1, len(lines))
+    snippet = "\n".join(f"{n:4d} | {lines[n - 1]}" for n in range(start, stop + 1))
+    if stop < end:
+        snippet += f"\n     ... ({end - stop} more lines, use read_file for the rest)"
+    return snippet
+
+@tool
+def find_definition(name: str, config: RunnableConfig, kind: str = None) -> str:
+    """
+    Finds where a Python function, class, method or import is defined, with its source.
+    Cheaper than search_codebase + read_file when you know the symbol name.
+    
+    Args:
+        name: Symbol name, or dotted name for methods (e.g. "verify_signature" or "Ledger.add_block")
+        kind: Optional filter - "function", "class", "method" or "import"
+    
+    Returns: File, line range and source snippet of each definition
+    """
+    root = resolve_sandbox(config)
+    matches = get_symbol_index(root).find_definitions(name, kind)
+    
+    if not matches:
+        return f"No definition found for '{name}'. Try search_codebase for non-Python files."
+    
+    results = [f"Found {len(matches)} definition(s) of '{name}':"]
+    for match in matches[:10]:
+        results.append(f"\n{match['path']}:{match['start']}-{match['end']} ({match['kind']} {match['qualname']})")
+        results.append(_line_snippet(os.path.join(root, match['path']), match['start'], match['end']))
+    if len(matches) > 10:
+        results.append(f"\n... (+ {len(matches) - 10} more definitions)")
+    
+    return "\n".join(results)
+
+@tool
+def find_references(name: str, config: RunnableConfig, max_results: int = 50) -> str:
+    """
+    Finds the lines in Python files that use a name (calls, attribute access, imports).
+    
+    Args:
+        name: Symbol name (e.g. "verify_signature")
+        max_results: Maximum number of lines to report (default 50)
+    
+    Returns: file:line entries with the referencing line
+    """
+    root = resolve_sandbox(config)
+    matches = get_symbol_index(root).find_references(name)
+    
+    if not matches:
+        return f"No references found for '{name}'"
+    
+    total = sum(len(match['lines']) for match in matches)
+    results = [f"Found {total} reference(s) to '{name}' in {len(matches)} file(s):"]
+    shown = 0
+    for match in matches:
+        with open(os.path.join(root, match['path']), 'r', encoding='utf-8', errors='ignore') as f:
+            lines = f.read().split('\n')
+        for line_no in match['lines']:
+            if shown >= max_results:
+                break
+            results.append(f"  - {match['path']}:{line_no} | {lines[line_no - 1].strip()}")
+            shown += 1
+    if total > shown:
+        results.append(f"  ... (+ {total - shown} more)")
+    
+    return "\n".join(results)
 
 @tool
-def write_file(path: str, content: str) -> str:
+def write_file(path: str, content: str, config: RunnableConfig) -> str:
     """
     Writes content to a file in the sandbox. Creates new files or overwrites existing ones.
     
@@ -229,12 +577,13 @@ def write_file(path: str, content: str) -> str:
     
     Returns: Confirmation with file size
     """
-    full_path = _resolve_path(path)
+    root = resolve_sandbox(config)
+    full_path = _resolve_path(path, root)
     os.makedirs(os.path.dirname(full_path), exist_ok=True)
     
     try:
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        _atomic_write(full_path, content)
+        get_index(root).update_file(full_path)
         
         size = len(content)
         line_count = content.count('\n') + 1
@@ -242,8 +591,140 @@ def write_file(path: str, content: str) -> str:
     except Exception as e:
         return f"ERROR writing to '{path}': {str(e)}"
 
+def _apply_edited(root: str, full_path: str, content: str):
+    _atomic_write(full_path, content)
+    get_index(root).update_file(full_path)
+
+@tool
+def edit_file(path: str, edits: List[SearchReplace], config: RunnableConfig, base_hash: str = None) -> str:
+    """
+    Edits part of an existing file with search/replace pairs, instead of rewriting it with write_file.
+    
+    CRITICAL ACTION - Requires human approval.
+    
+    USAGE: Prefer this over write_file for changes to existing files - only the changed text is sent.
+    Each 'old' must match the current file exactly once (include a few surrounding lines if needed).
+    All edits apply together or not at all.
+    
+    Args:
+        path: Relative path to file (e.g., "src/auth.py")
+        edits: List of {"old": existing text, "new": replacement text}
+        base_hash: The sha256 shown by read_file; the edit is refused if the file changed since
+    
+    Returns: Confirmation with the new file hash, or the conflicts that prevented the edit
+    """
+    root = resolve_sandbox(config)
+    full_path = _resolve_path(path, root)
+    
+    if not os.path.isfile(full_path):
+        return f"ERROR: File '{path}' does not exist. Use write_file to create new files."
+    
+    try:
+        with open(full_path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        
+        conflict = check_base_hash(content, base_hash)
+        if conflict:
+            return f"CONFLICT editing '{path}': {conflict}"
+        
+        text, crlf = split_line_endings(content)
+        updated, conflicts = apply_edits(text, [e.model_dump() if isinstance(e, SearchReplace) else e for e in edits])
+        if conflicts:
+            return f"CONFLICT editing '{path}', nothing was changed:\n" + "\n".join(f"  - {c}" for c in conflicts)
+        updated = restore_line_endings(updated, crlf)
+        
+        _apply_edited(root, full_path, updated)
+        delta = updated.count('\n') - content.count('\n')
+        return f"Successfully applied {len(edits)} edit(s) to '{path}' ({delta:+d} lines, sha256 {content_hash(updated)})"
+    except Exception as e:
+        return f"ERROR editing '{path}': {str(e)}"
+
+@tool
+def apply_patch(patch: str, config: RunnableConfig, base_hashes: Dict[str, str] = None) -> str:
+    """
+    Applies a unified diff (as produced by `git diff` / `diff -u`) to one or more sandbox files.
+    
+    CRITICAL ACTION - Requires human approval.
+    
+    USAGE: For multi-hunk or multi-file changes. Paths may carry a/ b/ prefixes.
+    Use /dev/null as the old path to create a file, or as the new path to delete one.
+    Hunks may have drifted a few lines; their context must still match exactly.
+    Nothing is written unless every hunk of every file applies.
+    
+    Args:
+        patch: Unified diff text
+        base_hashes: Optional {path: sha256 from read_file}; files that changed since are refused
+    
+    Returns: Per-file summary, or the conflicts that prevented the patch
+    """
+    root = resolve_sandbox(config)
+    base_hashes = base_hashes or {}
+    
+    try:
+        file_patches = parse_unified_diff(patch)
+    except PatchError as e:
+        return f"ERROR: Invalid patch: {e}"
+    
+    planned, conflicts = [], []
+    for file_patch in file_patches:
+        # Creation and deletion come from the /dev/null headers, never from the contents
+        created, deleted = file_patch["old_path"] is None, file_patch["new_path"] is None
+        path = file_patch["new_path"] or file_patch["old_path"]
+        if path is None:
+            conflicts.append("a file patch has /dev/null as both its old and new path")
+            continue
+        full_path = _resolve_path(path, root)
+        
+        if created:
+            if os.path.exists(full_path):
+                conflicts.append(f"{path}: patch creates the file but it already exists")
+                continue
+            content = ""
+        elif not os.path.isfile(full_path):
+            conflicts.append(f"{path}: file does not exist")
+            continue
+        else:
+            with open(full_path, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+        
+        conflict = check_base_hash(content, base_hashes.get(path))
+        if conflict:
+            conflicts.append(f"{path}: {conflict}")
+            continue
+        
+        text, crlf = split_line_endings(content)
+        updated, hunk_conflicts = apply_hunks(text, file_patch["hunks"])
+        updated = restore_line_endings(updated, crlf)
+        if hunk_conflicts:
+            conflicts.extend(f"{path}: {c}" for c in hunk_conflicts)
+            continue
+        if deleted and updated.strip("\r\n"):
+            conflicts.append(f"{path}: patch deletes the file but its hunks do not remove all of its content; re-read it and rebuild the patch")
+            continue
+        planned.append((path, full_path, created, deleted, content, updated))
+    
+    if conflicts:
+        return "CONFLICT applying patch, nothing was changed:\n" + "\n".join(f"  - {c}" for c in conflicts)
+    
+    results = []
+    try:
+        for path, full_path, created, deleted, content, updated in planned:
+            if deleted:
+                os.remove(full_path)
+                get_index(root).remove_file(full_path)
+                results.append(f"  - deleted {path}")
+                continue
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            _apply_edited(root, full_path, updated)
+            delta = updated.count('\n') - content.count('\n')
+            results.append(f"  - {'created' if created else 'patched'} {path} ({delta:+d} lines, sha256 {content_hash(updated)})")
+    except Exception as e:
+        return f"ERROR applying patch after {len(results)} file(s): {str(e)}\n" + "\n".join(results)
+    
+    return f"Successfully applied patch to {len(results)} file(s):\n" + "\n".join(results)
+
 @tool
-def delete_file(path: str) -> str:
+def delete_file(path: str, config: RunnableConfig) -> str:
     """
     Deletes a specific file from the sandbox.
     
@@ -254,11 +735,12 @@ def delete_file(path: str) -> str:
     
     Returns: Confirmation of deletion
     """
-    full_path = _resolve_path(path)
+    root = resolve_sandbox(config)
+    full_path = _resolve_path(path, root)
     
     if not os.path.exists(full_path):
         # Provide helpful debug info
-        parent_dir = os.path.dirname(full_path) if os.path.dirname(full_path) else SANDBOX_PATH
+        parent_dir = os.path.dirname(full_path) if os.path.dirname(full_path) else root
         if os.path.exists(parent_dir):
             available = os.listdir(parent_dir)
             return f"ERROR: File '{path}' does not exist at {full_path}. Available files: {', '.join(available)}"
@@ -270,6 +752,7 @@ def delete_file(path: str) -> str:
     
     try:
         os.remove(full_path)
+        get_index(root).remove_file(full_path)
         return f"Successfully deleted '{path}' from sandbox"
     except Exception as e:
         return f"ERROR deleting '{path}': {str(e)}"
@@ -289,15 +772,21 @@ def deploy_to_production() -> str:
 
 TIER_CRITICAL = [
     "write_file",
+    "edit_file",
+    "apply_patch",
     "delete_file", 
     "deploy_to_production",
-    "sql_db_query",  # Raw SQL execution requires approval
+    "sql_db_query",  # Raw SQL execution requires approval, unless proven read-only (see is_critical)
 ]
 
 TIER_SAFE = [
     "read_file", 
+    "read_many_files",
     "list_directory", 
+    "list_tree",
     "search_codebase",
+    "find_definition",
+    "find_references",
     "sql_db_list_tables",
     "sql_db_schema",
     "sql_db_query_checker",
@@ -306,8 +795,13 @@ TIER_SAFE = [
     "git_diff"
 ]
 
-def is_critical(tool_name: str) -> bool:
-    """Check if a tool requires human approval"""
+def is_critical(tool_name: str, args: dict = None, config: RunnableConfig = None) -> bool:
+    """
+    Check if a tool requires human approval.
+    sql_db_query is downgraded to safe when SQLite proves the statement is read-only.
+    """
+    if tool_name == "sql_db_query" and args and args.get("query"):
+        return not is_read_only_query(args["query"], config)
     return tool_name in TIER_CRITICAL
 
 def get_tools(llm):
@@ -315,16 +809,23 @@ def get_tools(llm):
     Returns combined list of File tools + SQL tools + Git tools.
     
     Tool organization:
-    - File System: list_directory, read_file, search_codebase, write_file, delete_file
+    - File System: list_directory, list_tree, read_file, read_many_files, search_codebase, write_file, edit_file, apply_patch, delete_file
+    - Code Navigation: find_definition, find_references
     - Database: sql_db_list_tables, sql_db_schema, sql_db_query, sql_db_query_checker
     - Version Control: git_status, git_log, git_diff
     - Deployment: deploy_to_production
     """
     file_tools = [
         list_directory, 
+        list_tree,
         read_file, 
+        read_many_files,
         search_codebase, 
+        find_definition,
+        find_references,
         write_file, 
+        edit_file,
+        apply_patch,
         delete_file, 
         deploy_to_production,
         git_status,
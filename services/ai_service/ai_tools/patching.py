@@ -0,0 +1,187 @@
+# ----- search/replace and unified-diff patching for the edit tools @ services/ai_service/ai_tools/patching.py -----
+
+import re
+import difflib
+import hashlib
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+# How far (in lines) a hunk may have drifted from the line numbers in its header
+MAX_HUNK_OFFSET = 200
+
+class PatchError(ValueError):
+    """The patch text itself is malformed."""
+
+class SearchReplace(BaseModel):
+    """One edit_file edit."""
+    old: str = Field(description="Exact existing text to replace, including indentation; must match once")
+    new: str = Field(description="Replacement text")
+    replace_all: bool = Field(default=False, description="Replace every occurrence instead of requiring a unique match")
+
+def content_hash(content) -> str:
+    """Short sha256 the agent passes back as base_hash; read_file shows it."""
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    return hashlib.sha256(data).hexdigest()[:12]
+
+def check_base_hash(content, base_hash: Optional[str]) -> Optional[str]:
+    """Conflict message when the file changed since the agent read it, else None."""
+    if not base_hash:
+        return None
+    current = content_hash(content)
+    given = base_hash.strip().lower()
+    if len(given) < len(current):
+        return f"base_hash {base_hash!r} is too short; pass the full {len(current)}-character sha256 shown by read_file"
+    if given[:len(current)] != current:
+        return f"file changed since it was read (base_hash {base_hash}, current {current}); re-read it and rebuild the edit"
+    return None
+
+def split_line_endings(content: str) -> Tuple[str, bool]:
+    """
+    (content with LF line endings, whether it was CRLF). Edits and hunks are matched
+    against LF text; restore_line_endings puts CRLF back. Mixed endings are left alone.
+    """
+    if "\r\n" in content and "\n" not in content.replace("\r\n", ""):
+        return content.replace("\r\n", "\n"), True
+    return content, False
+
+def restore_line_endings(content: str, crlf: bool) -> str:
+    return content.replace("\n", "\r\n") if crlf else content
+
+def _line_of(content: str, offset: int) -> int:
+    return content.count("\n", 0, offset) + 1
+
+def apply_edits(content: str, edits: List[dict]) -> Tuple[str, List[str]]:
+    """
+    Applies search/replace edits in order. Each edit is {"old": str, "new": str} and
+    "old" must match exactly once (or set "replace_all": true).
+
+    Returns:
+        (new content, conflicts) - content is unchanged when there are conflicts
+    """
+    conflicts = []
+    updated = content
+    for number, edit in enumerate(edits, 1):
+        old, new = edit.get("old"), edit.get("new")
+        if old is None or new is None:
+            conflicts.append(f"edit {number}: needs both 'old' and 'new'")
+            continue
+        if old == "":
+            conflicts.append(f"edit {number}: 'old' is empty; use write_file to create files")
+            continue
+
+        count = updated.count(old)
+        if count == 0:
+            first_line = old.strip("\n").split("\n")[0]
+            close = difflib.get_close_matches(first_line, updated.split("\n"), n=1, cutoff=0.6)
+            hint = f"; closest line: {close[0].strip()!r} at line {updated.split(chr(10)).index(close[0]) + 1}" if close else ""
+            conflicts.append(f"edit {number}: 'old' text not found{hint}")
+        elif count > 1 and not edit.get("replace_all"):
+            lines = []
+            position = updated.find(old)
+            while position != -1:
+                lines.append(_line_of(updated, position))
+                position = updated.find(old, position + 1)
+            conflicts.append(f"edit {number}: 'old' text matches {count} times (lines {', '.join(map(str, lines[:10]))}); add surrounding lines to make it unique")
+        else:
+            updated = updated.replace(old, new)
+
+    return (content, conflicts) if conflicts else (updated, [])
+
+def parse_unified_diff(patch: str) -> List[dict]:
+    """
+    Splits a unified diff into per-file patches.
+
+    Returns:
+        [{"old_path", "new_path", "hunks": [{"old_start", "lines": [(tag, text)]}]}]
+        with paths stripped of a/ b/ prefixes and None for /dev/null
+    """
+    files = []
+    current = None
+    hunk = None
+    remaining = 0
+
+    def strip_path(raw: str) -> Optional[str]:
+        raw = raw.split("\t")[0].strip()
+        if raw == "/dev/null":
+            return None
+        return raw[2:] if raw[:2] in ("a/", "b/") else raw
+
+    lines = patch.split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        in_hunk = hunk is not None and remaining > 0
+        if not in_hunk and line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ "):
+            current = {"old_path": strip_path(line[4:]), "new_path": strip_path(lines[i + 1][4:]), "hunks": []}
+            files.append(current)
+            hunk = None
+            i += 2
+            continue
+
+        match = HUNK_HEADER.match(line)
+        if match:
+            if current is None:
+                raise PatchError(f"hunk at patch line {i + 1} has no ---/+++ file header")
+            hunk = {"old_start": int(match.group(1)), "lines": []}
+            remaining = int(match.group(2) or 1) + int(match.group(4) or 1)
+            current["hunks"].append(hunk)
+        elif hunk is not None and line[:1] in (" ", "-", "+"):
+            hunk["lines"].append((line[0], line[1:]))
+            remaining -= 2 if line[0] == " " else 1
+        elif hunk is not None and line == "" and remaining > 0:
+            # Editors and LLMs often drop the leading space of empty context lines
+            hunk["lines"].append((" ", ""))
+            remaining -= 2
+        elif line.startswith("\\"):
+            pass
+        i += 1
+
+    if not files:
+        raise PatchError("no ---/+++ file headers found; expected a unified diff")
+    for file_patch in files:
+        if not file_patch["hunks"]:
+            raise PatchError(f"no hunks for {file_patch['new_path'] or file_patch['old_path']}")
+    return files
+
+def apply_hunks(content: str, hunks: List[dict]) -> Tuple[str, List[str]]:
+    """
+    Applies unified-diff hunks. A hunk whose context is not at its stated line is
+    searched for nearby (like `patch` with offsets, without fuzz).
+
+    Returns:
+        (new content, conflicts) - content is unchanged when there are conflicts
+    """
+    lines = content.split("\n")
+    output = []
+    cursor = 0
+    conflicts = []
+
+    for number, hunk in enumerate(hunks, 1):
+        old_block = [text for tag, text in hunk["lines"] if tag in (" ", "-")]
+        new_block = [text for tag, text in hunk["lines"] if tag in (" ", "+")]
+        expected = max(hunk["old_start"] - 1, 0) if old_block else hunk["old_start"]
+
+        position = None
+        for offset in range(0, MAX_HUNK_OFFSET + 1):
+            for candidate in (expected + offset, expected - offset) if offset else (expected,):
+                if cursor <= candidate <= len(lines) - len(old_block) and lines[candidate:candidate + len(old_block)] == old_block:
+                    position = candidate
+                    break
+            if position is not None:
+                break
+
+        if position is None:
+            wanted = old_block[0] if old_block else ""
+            conflicts.append(f"hunk {number} (@@ -{hunk['old_start']}): context not found near line {hunk['old_start']}; first expected line: {wanted!r}")
+            continue
+
+        output.extend(lines[cursor:position])
+        output.extend(new_block)
+        cursor = position + len(old_block)
+
+    if conflicts:
+        return content, conflicts
+    output.extend(lines[cursor:])
+    return "\n".join(output), []
@@ -0,0 +1,145 @@
+# ----- Cached schema and sample-row introspection for the SQL tools @ services/ai_service/ai_tools/schema_cache.py -----
+#
+# sql_db_schema / sql_db_list_tables used to reflect tables through SQLAlchemy and re-run
+# the sample-row queries on every call. Here each database gets one long-lived read-only
+# connection that is only used to poll two header counters:
+#   PRAGMA schema_version  changes on any DDL       -> drop table list, schemas and samples
+#   PRAGMA data_version    changes on others' commits -> drop samples
+# Session databases are fresh copies of the template database, so a session whose file
+# is still byte-for-byte the template copy is seeded from the template's cache.
+
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from backend.utils.logger import get_logger
+from backend.utils.sqlite_pool import connect
+
+logger = get_logger(__name__)
+
+SAMPLE_ROWS = 3
+MAX_SAMPLE_VALUE_LENGTH = 100
+
+# (size, mtime_ns) of an untouched template copy -> {"tables": [...], "info": {table: {"schema", "samples"}}}
+_snapshots: Dict[tuple, dict] = {}
+
+def _file_origin(db_path: str) -> Optional[tuple]:
+    """Identity of a database copy that has not been written yet (no WAL content, original mtime)."""
+    wal = f"{db_path}-wal"
+    if os.path.exists(wal) and os.path.getsize(wal) > 0:
+        return None
+    st = os.stat(db_path)
+    return (st.st_size, st.st_mtime_ns)
+
+class SchemaCache:
+    """Table list, CREATE statements and sample rows of one SQLite database."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = connect(db_path, read_only=True)
+        self.lock = threading.Lock()
+        self.versions = None
+        self.tables: Optional[List[str]] = None
+        self.info: Dict[str, dict] = {}
+        self.origin = _file_origin(db_path)
+
+        snapshot = _snapshots.get(self.origin) if self.origin else None
+        if snapshot:
+            self.tables = list(snapshot["tables"])
+            self.info = {table: dict(entry) for table, entry in snapshot["info"].items()}
+
+    def _validate(self):
+        """Drops whatever the version counters say is stale. Reads the database header only."""
+        schema_version = self.conn.execute("PRAGMA schema_version").fetchone()[0]
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+        if self.versions is not None:
+            if schema_version != self.versions[0]:
+                self.tables = None
+                self.info = {}
+            elif data_version != self.versions[1]:
+                for entry in self.info.values():
+                    entry["samples"] = None
+        self.versions = (schema_version, data_version)
+
+    def _load_tables(self):
+        rows = self.conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        ).fetchall()
+        self.tables = [name for name, _ in rows]
+        for name, sql in rows:
+            self.info.setdefault(name, {"schema": sql, "samples": None})["schema"] = sql
+
+    def _load_samples(self, table: str) -> str:
+        cursor = self.conn.execute(f'SELECT * FROM "{table}" LIMIT {SAMPLE_ROWS}')
+        columns = [c[0] for c in cursor.description]
+        rows = cursor.fetchall()
+        lines = [f"{len(rows)} rows from {table} table:", "\t".join(columns)]
+        for row in rows:
+            lines.append("\t".join(str(v)[:MAX_SAMPLE_VALUE_LENGTH] for v in row))
+        return "/*\n" + "\n".join(lines) + "\n*/"
+
+    def table_names(self) -> List[str]:
+        with self.lock:
+            self._validate()
+            if self.tables is None:
+                self._load_tables()
+            return list(self.tables)
+
+    def table_info(self, table_names: Optional[List[str]] = None) -> str:
+        """Same shape as SQLDatabase.get_table_info: CREATE statement plus sample rows per table."""
+        with self.lock:
+            self._validate()
+            if self.tables is None:
+                self._load_tables()
+
+            wanted = table_names or self.tables
+            missing = set(wanted) - set(self.tables)
+            if missing:
+                raise ValueError(f"table_names {missing} not found in database")
+
+            sections = []
+            for table in wanted:
+                entry = self.info[table]
+                if entry["samples"] is None:
+                    entry["samples"] = self._load_samples(table)
+                sections.append(f"\n{entry['schema']}\n\n{entry['samples']}")
+            return "\n\n".join(sections)
+
+    def warm(self):
+        """Loads everything and, for an untouched template copy, publishes it for sessions to reuse."""
+        self.table_info()
+        if self.origin and self.origin == _file_origin(self.db_path):
+            with self.lock:
+                _snapshots[self.origin] = {
+                    "tables": list(self.tables),
+                    "info": {table: dict(entry) for table, entry in self.info.items()},
+                }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+_caches: Dict[str, SchemaCache] = {}
+_caches_lock = threading.Lock()
+
+def get_schema_cache(db_path: str) -> SchemaCache:
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = SchemaCache(db_path)
+        return _caches[db_path]
+
+def drop_schema_cache(db_path: str):
+    with _caches_lock:
+        cache = _caches.pop(db_path, None)
+    if cache is not None:
+        cache.close()
+
+def warm_schema_cache(db_path: str):
+    """Startup warm-up: the first sql_db_schema call of every fresh session is then served from memory."""
+    try:
+        get_schema_cache(db_path).warm()
+        logger.info(f"🔥 Schema cache warmed for {db_path}")
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Schema cache warm-up failed for {db_path}: {e}")
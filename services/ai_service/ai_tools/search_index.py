@@ -0,0 +1,327 @@
+# ----- Trigram index for search_codebase @ services/ai_service/ai_tools/search_index.py -----
+
+import os
+import re
+import bisect
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+from backend.utils.logger import get_logger
+from services.ai_service.ai_tools.sessions import on_release
+
+logger = get_logger(__name__)
+
+SKIP_DIRS = {".git", "__pycache__"}
+BINARY_SUFFIXES = ('.db', '.sqlite', '.sqlite-wal', '.sqlite-shm', '.pyc', '.png', '.jpg', '.jpeg', '.bin')
+# Temp files from atomic writes in manager._atomic_write
+TEMP_PREFIX = ".authchain-"
+MAX_INDEXED_BYTES = 4 * 1024 * 1024
+NEWLINE = re.compile("\n")
+
+def scan_files(root: str, include: Callable[[str], bool]) -> Dict[str, tuple]:
+    """{relative path: (mtime_ns, size)} of the regular files under root whose name passes `include`, skipping SKIP_DIRS."""
+    found = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif include(entry.name) and entry.is_file(follow_symlinks=False):
+                    st = entry.stat()
+                    found[os.path.relpath(entry.path, root)] = (st.st_mtime_ns, st.st_size)
+    return found
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# Regex metacharacters; an escaped one is a literal character
+REGEX_SPECIAL = set(".^$*+?{}[]()|\\")
+QUANTIFIER = re.compile(r"\{(\d*)(?:,\d*)?\}")
+# Characters after \x, \u, \U that belong to the escape
+ESCAPE_DIGITS = {"x": 2, "u": 4, "U": 8}
+
+def _escape_end(pattern: str, i: int) -> int:
+    """Index just past the escape that starts with the backslash at pattern[i]."""
+    kind = pattern[i + 1:i + 2]
+    end = i + 2
+    if kind in ESCAPE_DIGITS:
+        end += ESCAPE_DIGITS[kind]
+    elif kind == "N" and pattern[end:end + 1] == "{":
+        end = pattern.find("}", end) + 1 or len(pattern)
+    elif kind.isdigit():
+        # Octal escapes and backreferences: at most three digits in all
+        while end < min(len(pattern), i + 4) and pattern[end].isdigit():
+            end += 1
+    return end
+
+def _required_literals(pattern: str) -> List[str]:
+    """
+    Literal runs every match of a regex must contain (e.g. "def" and "foo" for r"def\\s+foo").
+    Returns [] when nothing can be required (alternation at top level, inline flags, ...),
+    which means every file is a candidate.
+
+    A deliberately small scanner (no dependency on the private re parser): only literals
+    outside groups and character classes count, and anything it does not understand ends
+    the current run, which can only make the candidate set larger.
+    """
+    runs, current = [], []
+
+    def flush():
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escaped = pattern[i + 1:i + 2]
+            if depth == 0 and escaped in REGEX_SPECIAL:
+                current.append(escaped)
+            else:
+                # \d, \s, \b, \1, \n, \x41, ... are classes, anchors or escapes; not a literal run
+                flush()
+            i = _escape_end(pattern, i)
+        elif char == "[":
+            # Skip the class: a leading "^" and "]" and escaped characters are part of it
+            flush()
+            i += 1
+            if pattern[i:i + 1] == "^":
+                i += 1
+            if pattern[i:i + 1] == "]":
+                i += 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif char == "(":
+            if pattern[i + 1:i + 2] == "?" and pattern[i + 2:i + 3] not in (":", "=", "!", "<", "P"):
+                # Inline flags such as (?i) change what the literals match
+                return []
+            flush()
+            depth += 1
+            i += 1
+        elif char == ")":
+            flush()
+            depth = max(0, depth - 1)
+            i += 1
+        elif char == "|":
+            if depth == 0:
+                return []
+            i += 1
+        elif char in "*?{+":
+            quantifier = QUANTIFIER.match(pattern, i) if char == "{" else None
+            optional = char in "*?" or (quantifier is not None and int(quantifier.group(1) or 0) == 0)
+            if char == "{" and quantifier is None:
+                # A "{" that is not a quantifier is a literal brace
+                if depth == 0:
+                    current.append(char)
+                i += 1
+                continue
+            # The quantified character belongs to no run when it may be absent; when it
+            # repeats, the run ends with it (what follows is not adjacent to it)
+            if optional and current:
+                current.pop()
+            flush()
+            i = quantifier.end() if quantifier else i + 1
+            # Lazy / possessive suffix
+            if pattern[i:i + 1] in ("?", "+"):
+                i += 1
+        elif char in ".^$":
+            flush()
+            i += 1
+        else:
+            if depth == 0:
+                current.append(char)
+            i += 1
+
+    flush()
+    return [run for run in runs if len(run) >= 3]
+
+class TrigramIndex:
+    """
+    Inverted trigram index over the text files of one sandbox.
+
+    Built on first use, then kept current by a stat-only refresh (mtime/size) before
+    each query plus explicit update_file/remove_file calls from the write tools.
+    Queries only open files whose trigrams cover the query's required literals.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.stats: Dict[str, tuple] = {}
+        self.file_trigrams: Dict[str, Set[str]] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def _is_indexable(self, name: str) -> bool:
+        return not name.endswith(BINARY_SUFFIXES) and not name.startswith(TEMP_PREFIX)
+
+    def _scan(self) -> Dict[str, tuple]:
+        return scan_files(self.root, self._is_indexable)
+
+    def _read(self, rel_path: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, rel_path), 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _drop(self, rel_path: str):
+        for gram in self.file_trigrams.pop(rel_path, None) or ():
+            paths = self.postings.get(gram)
+            if paths is not None:
+                paths.discard(rel_path)
+                if not paths:
+                    del self.postings[gram]
+        self.stats.pop(rel_path, None)
+
+    def _add(self, rel_path: str, stat_key: tuple):
+        self._drop(rel_path)
+        self.stats[rel_path] = stat_key
+
+        # Oversized files stay searchable; they are just always candidates
+        if stat_key[1] > MAX_INDEXED_BYTES:
+            self.file_trigrams[rel_path] = None
+            return
+
+        text = self._read(rel_path)
+        if text is None or "\0" in text[:1024]:
+            self.file_trigrams[rel_path] = set()
+            return
+
+        grams = _trigrams(text)
+        self.file_trigrams[rel_path] = grams
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(rel_path)
+
+    def refresh(self) -> int:
+        """Re-indexes files whose mtime or size changed and forgets deleted ones. Returns files re-indexed."""
+        with self._lock:
+            current = self._scan()
+            changed = 0
+            for rel_path in set(self.stats) - set(current):
+                self._drop(rel_path)
+            for rel_path, stat_key in current.items():
+                if self.stats.get(rel_path) != stat_key:
+                    self._add(rel_path, stat_key)
+                    changed += 1
+            return changed
+
+    def update_file(self, full_path: str):
+        rel_path = os.path.relpath(full_path, self.root)
+        with self._lock:
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                self._drop(rel_path)
+                return
+            if self._is_indexable(os.path.basename(full_path)):
+                self._add(rel_path, (st.st_mtime_ns, st.st_size))
+
+    def remove_file(self, full_path: str):
+        with self._lock:
+            self._drop(os.path.relpath(full_path, self.root))
+
+    def candidates(self, literals: List[str]) -> List[str]:
+        """Files that contain every trigram of every literal (plus unindexed oversized files)."""
+        with self._lock:
+            required = set()
+            for literal in literals:
+                required |= _trigrams(literal)
+
+            if not required:
+                return sorted(self.stats)
+
+            unindexed = {path for path, grams in self.file_trigrams.items() if grams is None}
+            matched = None
+            for gram in sorted(required, key=lambda g: len(self.postings.get(g, ()))):
+                paths = self.postings.get(gram, set())
+                matched = set(paths) if matched is None else matched & paths
+                if not matched:
+                    break
+            return sorted((matched or set()) | unindexed)
+
+    def search(self, query: str, regex: bool = False, max_files: int = 50, context_lines: int = 0) -> dict:
+        """
+        Substring or regex search.
+
+        Returns:
+            {"files": [{"path", "count", "lines": [...], "snippets": [...]}], "truncated": bool, "scanned": int}
+        """
+        self.refresh()
+
+        if regex:
+            pattern = re.compile(query, re.MULTILINE)
+            literals = _required_literals(query)
+        else:
+            pattern = None
+            literals = [query]
+
+        candidates = self.candidates(literals)
+        results = []
+        truncated = False
+
+        for rel_path in candidates:
+            text = self._read(rel_path)
+            if not text:
+                continue
+
+            if pattern is not None:
+                offsets = [m.start() for m in pattern.finditer(text)]
+            else:
+                offsets = []
+                position = text.find(query)
+                while position != -1:
+                    offsets.append(position)
+                    position = text.find(query, position + max(len(query), 1))
+
+            if not offsets:
+                continue
+
+            if len(results) >= max_files:
+                truncated = True
+                break
+
+            newlines = [m.start() for m in NEWLINE.finditer(text)]
+            line_numbers = sorted({bisect.bisect_left(newlines, offset) + 1 for offset in offsets})
+
+            snippets = []
+            if context_lines > 0:
+                lines = text.split("\n")
+                for line_no in line_numbers[:5]:
+                    start = max(1, line_no - context_lines)
+                    end = min(len(lines), line_no + context_lines)
+                    snippets.append([(n, lines[n - 1]) for n in range(start, end + 1)])
+
+            results.append({
+                "path": rel_path,
+                "count": len(offsets),
+                "lines": line_numbers,
+                "snippets": snippets,
+            })
+
+        return {"files": results, "truncated": truncated, "scanned": len(candidates)}
+
+_indexes: Dict[str, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_index(root: str) -> TrigramIndex:
+    """Index for a sandbox root, kept for the life of the process (or the session)."""
+    with _indexes_lock:
+        if root not in _indexes:
+            _indexes[root] = TrigramIndex(root)
+        return _indexes[root]
+
+def _drop_index(root: str):
+    with _indexes_lock:
+        _indexes.pop(root, None)
+
+on_release(_drop_index)
@@ -0,0 +1,165 @@
+# ----- Per-session sandbox views @ services/ai_service/ai_tools/sessions.py -----
+
+import os
+import re
+import time
+import shutil
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional
+from langchain_core.runnables import RunnableConfig
+
+from backend.core.config import settings
+from backend.utils.cassette import release_cassettes, release_idle_cassettes
+from backend.utils.logger import get_logger
+from backend.utils.setup_sandbox import SANDBOX_ROOT, build_template, clone_tree
+
+logger = get_logger(__name__)
+
+SANDBOX_PATH = os.path.abspath(SANDBOX_ROOT)
+SESSIONS_ROOT = os.path.abspath("./services/ai_service/sessions")
+# <name>.last-used next to each session directory; its mtime is the session's last use in
+# any process (a directory's own mtime misses edits below its top level)
+MARKER_SUFFIX = ".last-used"
+
+_last_used: Dict[str, float] = {}
+_release_hooks: List[Callable[[str], None]] = []
+_lock = threading.Lock()
+_last_gc = 0.0
+
+def get_thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    """Extracts the LangGraph thread id from a runnable config, if any."""
+    if not config:
+        return None
+    return config.get("configurable", {}).get("thread_id")
+
+def _session_name(thread_id: str) -> str:
+    """Filesystem-safe directory name for a thread id."""
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", thread_id)[:64]
+    if safe == thread_id:
+        return safe
+    return f"{safe}-{hashlib.sha1(thread_id.encode()).hexdigest()[:12]}"
+
+def _marker(name: str) -> str:
+    return os.path.join(SESSIONS_ROOT, name + MARKER_SUFFIX)
+
+def _touch(name: str):
+    """Records a use of the session on disk, for collectors in other processes."""
+    path = _marker(name)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        with open(path, "a"):
+            pass
+
+def _create_session(root: str):
+    template_path = build_template()
+    staging = f"{root}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    # Only git objects are hardlinked; working files can be edited in place (`>>`, SQLite),
+    # so they are reflinked or copied and a write never reaches the template
+    clone_tree(template_path, staging)
+    os.rename(staging, root)
+    logger.info(f"🧬 Session sandbox cloned at {root}")
+
+def get_session_root(thread_id: Optional[str]) -> str:
+    """
+    Returns the sandbox directory for a thread, cloning it from the template on first use.
+    Calls without a thread id (scripts, direct tool invocations) use the shared sandbox.
+    """
+    if not thread_id:
+        return SANDBOX_PATH
+
+    name = _session_name(thread_id)
+    root = os.path.join(SESSIONS_ROOT, name)
+    now = time.time()
+
+    with _lock:
+        # Checked every time: another process may have collected the session
+        if not os.path.isdir(root):
+            os.makedirs(SESSIONS_ROOT, exist_ok=True)
+            _create_session(root)
+        _last_used[name] = now
+        _touch(name)
+
+    _maybe_collect(now)
+    return root
+
+def resolve_sandbox(config: Optional[RunnableConfig]) -> str:
+    """Sandbox root for the session a tool call belongs to."""
+    return get_session_root(get_thread_id(config))
+
+def on_release(hook: Callable[[str], None]):
+    """Registers a callback run with a session root just before it is deleted (close handles, drop caches)."""
+    _release_hooks.append(hook)
+
+def _release_cassette(root: str):
+    name = os.path.basename(root)
+    release_cassettes(lambda thread_id: _session_name(thread_id) == name)
+
+on_release(_release_cassette)
+
+def _release(name: str):
+    root = os.path.join(SESSIONS_ROOT, name)
+    for hook in _release_hooks:
+        try:
+            hook(root)
+        except Exception as e:
+            logger.warning(f"Session release hook failed for {name}: {e}")
+
+    shutil.rmtree(root, ignore_errors=True)
+    try:
+        os.remove(_marker(name))
+    except FileNotFoundError:
+        pass
+    _last_used.pop(name, None)
+    logger.info(f"🗑️ Session sandbox removed: {name}")
+
+def release_session(thread_id: str):
+    """Deletes a thread's sandbox immediately."""
+    with _lock:
+        _release(_session_name(thread_id))
+
+def collect_idle_sessions(max_idle: Optional[float] = None) -> List[str]:
+    """
+    Removes session sandboxes idle for longer than `max_idle` seconds, by their last-use
+    marker (shared by every process); directories without one by their modification time.
+
+    Returns:
+        Names of the removed sessions
+    """
+    max_idle = settings.SESSION_IDLE_TIMEOUT if max_idle is None else max_idle
+    if not os.path.isdir(SESSIONS_ROOT):
+        return []
+
+    now = time.time()
+    removed = []
+
+    with _lock:
+        with os.scandir(SESSIONS_ROOT) as entries:
+            candidates = [entry for entry in entries if entry.is_dir() and ".tmp-" not in entry.name]
+
+        for entry in candidates:
+            try:
+                last_used = os.stat(_marker(entry.name)).st_mtime
+            except FileNotFoundError:
+                last_used = entry.stat().st_mtime
+            last_used = max(last_used, _last_used.get(entry.name, 0))
+            if now - last_used > max_idle:
+                _release(entry.name)
+                removed.append(entry.name)
+
+    return removed
+
+def _maybe_collect(now: float):
+    global _last_gc
+    if now - _last_gc < settings.SESSION_GC_INTERVAL:
+        return
+    _last_gc = now
+
+    try:
+        collect_idle_sessions()
+        release_idle_cassettes()
+    except Exception as e:
+        logger.warning(f"Session garbage collection failed: {e}")
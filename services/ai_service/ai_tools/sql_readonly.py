@@ -0,0 +1,169 @@
+# ----- Read-only SQL fast path @ services/ai_service/ai_tools/sql_readonly.py -----
+#
+# A statement is treated as read-only only when SQLite itself agrees: it is prepared on a
+# `mode=ro` connection under an authorizer that denies every action except reads. Anything
+# else (writes, DDL, ATTACH, transactions, most PRAGMAs, multiple statements) is not
+# proven read-only and keeps going through the critical approval flow. Queries on the fast
+# path also run on a `mode=ro` connection under the same authorizer, so a misclassified
+# statement still cannot write. SQLite never asks the authorizer about VACUUM, and VACUUM
+# INTO writes a new file even from a `mode=ro` connection, so the compiled program is
+# checked too. Connections come from the database's reader pool.
+
+import time
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from backend.utils.logger import get_logger
+from backend.utils.sqlite_pool import get_pool
+
+logger = get_logger(__name__)
+
+DEFAULT_ROW_LIMIT = 100
+MAX_ROW_LIMIT = 1000
+QUERY_TIMEOUT_SECONDS = 5.0
+MAX_VALUE_LENGTH = 300
+PROGRESS_HANDLER_OPS = 10_000
+
+READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+SAFE_PRAGMAS = {"table_info", "table_xinfo", "index_list", "index_info", "foreign_key_list"}
+
+class QueryTimeout(Exception):
+    """The read-only query ran past QUERY_TIMEOUT_SECONDS."""
+
+def _authorizer(action, arg1, arg2, db_name, trigger):
+    if action == sqlite3.SQLITE_FUNCTION and arg2 and arg2.lower() == "load_extension":
+        return sqlite3.SQLITE_DENY
+    if action in READ_ACTIONS:
+        return sqlite3.SQLITE_OK
+    # Schema pragmas only read, whatever their argument (the table or index name)
+    if action == sqlite3.SQLITE_PRAGMA and arg1 and arg1.lower() in SAFE_PRAGMAS:
+        return sqlite3.SQLITE_OK
+    return sqlite3.SQLITE_DENY
+
+# Opcodes that write outside a write transaction; Transaction's p2 is non-zero for writes
+WRITE_OPCODES = {"Vacuum", "IncrVacuum"}
+
+def _write_opcode(conn: sqlite3.Connection, query: str) -> Optional[str]:
+    """First opcode in the query's compiled program that writes, if any."""
+    for _, opcode, _, p2, *_ in conn.execute(f"EXPLAIN {query}"):
+        if opcode in WRITE_OPCODES or (opcode == "Transaction" and p2):
+            return opcode
+    return None
+
+def _is_denied(error: sqlite3.Error) -> bool:
+    return getattr(error, "sqlite_errorcode", None) == sqlite3.SQLITE_AUTH or "not authorized" in str(error)
+
+@contextmanager
+def read_only_connection(db_path: str):
+    """Pooled read-only connection that also refuses to prepare anything but reads."""
+    with get_pool(db_path).reader() as conn:
+        conn.set_authorizer(_authorizer)
+        try:
+            yield conn
+        finally:
+            conn.set_authorizer(None)
+            conn.set_progress_handler(None, 0)
+
+def check_read_only(db_path: str, query: str) -> Tuple[bool, str]:
+    """
+    (True, "") only when SQLite prepares the query as a single read-only statement, else
+    (False, reason). Nothing is executed: EXPLAIN compiles the query without running it.
+    A statement that does not compile (syntax, unknown table) is not proven read-only either.
+    """
+    query = query.strip().rstrip(";").strip()
+    if not query:
+        return False, "empty query"
+
+    try:
+        with read_only_connection(db_path) as conn:
+            opcode = _write_opcode(conn, query)
+        if opcode:
+            return False, f"statement writes ({opcode})"
+        return True, ""
+    except sqlite3.ProgrammingError as e:
+        # e.g. "You can only execute one statement at a time."
+        return False, str(e)
+    except sqlite3.DatabaseError as e:
+        if _is_denied(e):
+            return False, "statement writes or uses a restricted feature"
+        if "unable to open database" in str(e):
+            return False, f"cannot open database read-only: {e}"
+        return False, f"does not compile: {e}"
+
+def _query_digest(query: str) -> str:
+    return hashlib.sha256(" ".join(query.split()).encode()).hexdigest()[:8]
+
+def make_page_token(query: str, offset: int) -> str:
+    return f"{_query_digest(query)}:{offset}"
+
+def parse_page_token(query: str, token: Optional[str]) -> int:
+    """Row offset from a page token; ValueError if it belongs to a different query."""
+    if not token:
+        return 0
+    digest, _, offset = token.partition(":")
+    if digest != _query_digest(query) or not offset.isdigit():
+        raise ValueError("page_token does not belong to this query; re-run it without page_token")
+    return int(offset)
+
+def truncate_value(value):
+    if isinstance(value, str) and len(value) > MAX_VALUE_LENGTH:
+        return value[:MAX_VALUE_LENGTH] + "..."
+    return value
+
+def run_read_only(db_path: str, query: str, limit: int = DEFAULT_ROW_LIMIT, page_token: Optional[str] = None,
+                  timeout: float = QUERY_TIMEOUT_SECONDS) -> dict:
+    """
+    Runs a read-only query on a `mode=ro` connection, streaming at most `limit` rows
+    after the page token's offset. A progress handler aborts it after `timeout` seconds.
+
+    Returns:
+        {"columns": [...], "rows": [tuple, ...], "offset": int, "next_page_token": str|None}
+    """
+    limit = max(1, min(limit, MAX_ROW_LIMIT))
+    offset = parse_page_token(query, page_token)
+    deadline = time.monotonic() + timeout
+    timed_out = False
+
+    def progress():
+        nonlocal timed_out
+        if time.monotonic() > deadline:
+            timed_out = True
+            return 1
+        return 0
+
+    try:
+        with read_only_connection(db_path) as conn:
+            statement = query.strip().rstrip(";")
+            opcode = _write_opcode(conn, statement)
+            if opcode:
+                raise sqlite3.DatabaseError(f"not authorized: statement writes ({opcode})")
+            conn.set_progress_handler(progress, PROGRESS_HANDLER_OPS)
+            cursor = conn.execute(statement)
+            columns = [c[0] for c in cursor.description or []]
+
+            # Pages re-run the query and skip ahead; rows are never buffered beyond the page
+            skipped = 0
+            while skipped < offset:
+                batch = cursor.fetchmany(min(500, offset - skipped))
+                if not batch:
+                    break
+                skipped += len(batch)
+
+            rows = cursor.fetchmany(limit + 1)
+            # Finish the statement before the connection goes back to the pool
+            cursor.close()
+    except sqlite3.OperationalError as e:
+        if timed_out:
+            raise QueryTimeout(f"query exceeded {timeout:.0f}s and was interrupted; add a WHERE clause or LIMIT")
+        raise
+
+    has_more = len(rows) > limit
+    rows = [tuple(truncate_value(v) for v in row) for row in rows[:limit]]
+    return {
+        "columns": columns,
+        "rows": rows,
+        "offset": offset,
+        "next_page_token": make_page_token(query, offset + limit) if has_more else None,
+    }
@@ -0,0 +1,171 @@
+# ----- AST symbol index for code navigation tools @ services/ai_service/ai_tools/symbol_index.py -----
+
+import os
+import ast
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+from backend.utils.logger import get_logger
+from services.ai_service.ai_tools.sessions import on_release
+from services.ai_service.ai_tools.search_index import scan_files
+
+logger = get_logger(__name__)
+
+# Parsed files keyed by content hash; session sandboxes share most of their sources with the template
+_parsed_cache: Dict[str, dict] = {}
+_parsed_lock = threading.Lock()
+MAX_PARSED_CACHE = 2048
+
+def _parse_source(source: str) -> dict:
+    """
+    Extracts definitions and name references from one Python file.
+
+    Returns:
+        {"symbols": [{"name", "qualname", "kind", "start", "end"}], "references": {name: [line, ...]}, "error": str|None}
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        return {"symbols": [], "references": {}, "error": f"{type(e).__name__}: {e}"}
+
+    symbols = []
+    references: Dict[str, set] = {}
+
+    def add_reference(name: str, line: int):
+        references.setdefault(name, set()).add(line)
+
+    def visit(node, scope: List[str], in_class: bool):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                if isinstance(child, ast.ClassDef):
+                    kind = "class"
+                else:
+                    kind = "method" if in_class else "function"
+                start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                symbols.append({
+                    "name": child.name,
+                    "qualname": ".".join(scope + [child.name]),
+                    "kind": kind,
+                    "start": start,
+                    "end": child.end_lineno,
+                })
+                visit(child, scope + [child.name], isinstance(child, ast.ClassDef))
+                continue
+
+            if isinstance(child, (ast.Import, ast.ImportFrom)):
+                for alias in child.names:
+                    local = alias.asname or alias.name.split(".")[0]
+                    symbols.append({
+                        "name": local,
+                        "qualname": ".".join(scope + [local]),
+                        "kind": "import",
+                        "start": child.lineno,
+                        "end": child.end_lineno,
+                    })
+                    add_reference(alias.name.split(".")[-1], child.lineno)
+            elif isinstance(child, ast.Name):
+                add_reference(child.id, child.lineno)
+            elif isinstance(child, ast.Attribute):
+                add_reference(child.attr, child.lineno)
+
+            visit(child, scope, in_class)
+
+    visit(tree, [], False)
+    return {
+        "symbols": symbols,
+        "references": {name: sorted(lines) for name, lines in references.items()},
+        "error": None,
+    }
+
+def parse_cached(source: str) -> dict:
+    digest = hashlib.sha256(source.encode("utf-8", errors="ignore")).hexdigest()
+    with _parsed_lock:
+        cached = _parsed_cache.get(digest)
+    if cached is not None:
+        return cached
+
+    parsed = _parse_source(source)
+    with _parsed_lock:
+        if len(_parsed_cache) >= MAX_PARSED_CACHE:
+            _parsed_cache.pop(next(iter(_parsed_cache)))
+        _parsed_cache[digest] = parsed
+    return parsed
+
+class SymbolIndex:
+    """
+    Definitions and references of the Python files in one sandbox.
+    Refreshed incrementally: only files whose mtime or size changed are re-read,
+    and only files whose content hash is new are re-parsed.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.files: Dict[str, tuple] = {}
+        self.parsed: Dict[str, dict] = {}
+        self._lock = threading.RLock()
+
+    def _scan(self) -> Dict[str, tuple]:
+        return scan_files(self.root, lambda name: name.endswith(".py"))
+
+    def refresh(self):
+        with self._lock:
+            current = self._scan()
+            for rel_path in set(self.files) - set(current):
+                self.files.pop(rel_path, None)
+                self.parsed.pop(rel_path, None)
+            for rel_path, stat_key in current.items():
+                if self.files.get(rel_path) == stat_key:
+                    continue
+                try:
+                    with open(os.path.join(self.root, rel_path), "r", encoding="utf-8", errors="ignore") as f:
+                        source = f.read()
+                except OSError:
+                    continue
+                self.files[rel_path] = stat_key
+                self.parsed[rel_path] = parse_cached(source)
+                if self.parsed[rel_path]["error"]:
+                    logger.warning(f"⚠️ Symbol index skipped {rel_path}: {self.parsed[rel_path]['error']}")
+
+    def find_definitions(self, name: str, kind: Optional[str] = None) -> List[dict]:
+        """Definitions whose name or dotted qualname matches (e.g. "verify" or "Ledger.verify")."""
+        self.refresh()
+        matches = []
+        with self._lock:
+            for rel_path in sorted(self.parsed):
+                for symbol in self.parsed[rel_path]["symbols"]:
+                    if name not in (symbol["name"], symbol["qualname"]):
+                        continue
+                    if kind and symbol["kind"] != kind:
+                        continue
+                    matches.append({"path": rel_path, **symbol})
+        return matches
+
+    def find_references(self, name: str) -> List[dict]:
+        """Lines using a name: calls, attribute access, imports."""
+        self.refresh()
+        short_name = name.split(".")[-1]
+        matches = []
+        with self._lock:
+            for rel_path in sorted(self.parsed):
+                parsed = self.parsed[rel_path]
+                lines = parsed["references"].get(short_name)
+                if not lines:
+                    continue
+                matches.append({"path": rel_path, "lines": lines})
+        return matches
+
+_indexes: Dict[str, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_symbol_index(root: str) -> SymbolIndex:
+    with _indexes_lock:
+        if root not in _indexes:
+            _indexes[root] = SymbolIndex(root)
+        return _indexes[root]
+
+def _drop_index(root: str):
+    with _indexes_lock:
+        _indexes.pop(root, None)
+
+on_release(_drop_index)
@@ -7,6 +7,8 @@ from langchain_core.messages import HumanMessage
 from services.ai_service.agent.graph import graph
 from services.ai_service.agent.prompts import format_rejection_message
 from backend.api.models import CriticalActionProposal
+from backend.core.config import settings
+from backend.utils import cassette
 
 # Import shared state (this won't cause circular import now)
 from backend.api.shared_state import pending_approvals, execution_status
@@ -30,6 +32,8 @@ def run_agent_interactive(user_query: str, thread_id: str = None):
     nodes_visited = []
     agent_messages = []
     
+    cassette.note(thread_id, "query", {"query": user_query})
+    
     events = graph.stream(
         {"messages": [HumanMessage(content=user_query)]},
         config,
@@ -151,10 +155,10 @@ def run_agent_interactive(user_query: str, thread_id: str = None):
         
         # Optional blockchain notification (don't fail if it's down)
         try:
-            import requests
-            BLOCKCHAIN_URL = "https://authchaingo.onrender.com/api"
-            requests.post(
-                f"{BLOCKCHAIN_URL}/actions",
+            cassette.post(
+                thread_id,
+                "notify_action",
+                f"{settings.BLOCKCHAIN_URL}/actions",
                 json={
                     "proposal_id": thread_id,
                     "checkpoint_id": thread_id,
@@ -202,6 +206,8 @@ def resume_after_approval(thread_id: str, approved: bool, rejection_reason: str
     
     agent_messages = []
     
+    cassette.note(thread_id, "decision", {"approved": approved, "reason": rejection_reason})
+    
     if approved:
         print("Action APPROVED - Executing critical tool...")
         print("-" * 80)
@@ -289,8 +295,24 @@ def resume_after_approval(thread_id: str, approved: bool, rejection_reason: str
 if __name__ == "__main__":
     import sys
     
-    # Check if we're resuming or starting fresh
-    if len(sys.argv) > 1 and sys.argv[1] == "--resume":
+    # Check if we're resuming, replaying a cassette or starting fresh
+    if len(sys.argv) > 2 and sys.argv[1] == "--replay":
+        # Re-runs a recorded session offline: LLM and blockchain responses come from the cassette
+        settings.CASSETTE_MODE = "replay"
+        settings.CASSETTE_REPLAY_FILE = sys.argv[2]
+        
+        thread_id = str(uuid.uuid4())
+        recorded_query = cassette.note(thread_id, "query", {})
+        if recorded_query is None:
+            sys.exit(f"No recorded query in cassette {sys.argv[2]}")
+        
+        thread_id, status, output = run_agent_interactive(recorded_query["query"], thread_id)
+        
+        decision = cassette.note(thread_id, "decision", {})
+        if status == "AWAITING_APPROVAL" and decision is not None:
+            resume_after_approval(thread_id, decision["approved"], decision.get("reason"))
+    
+    elif len(sys.argv) > 1 and sys.argv[1] == "--resume":
         thread_id = sys.argv[2]
         approved = sys.argv[3].lower() == "true"
         rejection_reason = sys.argv[4] if len(sys.argv) > 4 else "No reason provided"
@@ -310,4 +332,8 @@ if __name__ == "__main__":
         if status == "AWAITING_APPROVAL":
             print(f"\nSession saved. To resume:")
             print(f"  Approve: python -m services.ai_service.main --resume {thread_id} true")
-            print(f"  Reject: python -m services.ai_service.main --resume {thread_id} false 'your reason here'")
\ No newline at end of file
+            print(f"  Reject: python -m services.ai_service.main --resume {thread_id} false 'your reason here'")
+        
+        if settings.CASSETTE_MODE == "record":
+            print(f"\nCassette: {cassette.cassette_path(thread_id)}")
+            print(f"  Replay: python -m services.ai_service.main --replay {cassette.cassette_path(thread_id)}")
\ No newline at end of file
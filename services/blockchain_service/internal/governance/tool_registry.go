@@ -8,6 +8,8 @@ func NewToolRegistry() *ToolRegistry {
 	return &ToolRegistry{
 		CriticalTools: map[string]bool{
 			"write_file":           true,
+			"edit_file":            true,
+			"apply_patch":          true,
 			"delete_file":          true,
 			"deploy_to_production": true,
 			"delete_database":      true,
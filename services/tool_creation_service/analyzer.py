@@ -0,0 +1,630 @@
+# ----- single-pass AST analysis of generated tool code @ services/tool_creation_service/analyzer.py -----
+#
+# Replaces substring checks ("open(" in code) with one walk over the syntax tree:
+#   - imports and bindings (assignments, walrus, for/with targets) are tracked as aliases, so
+#     `import subprocess as sp; sp.run`, `m = os; m.system`, `from os import system as s` and
+#     `getattr(os, "system")` resolve to the real name. A module with sensitive members (os,
+#     sys, numpy) used as a plain value - passed, stored, returned - cannot be followed and
+#     counts as dynamic_exec, like sys.modules, vars() and __self__
+#   - every resolved name is classified as process, dynamic_exec, application, network,
+#     filesystem or environment by RULES (a denylist, for precise messages), and anything not
+#     on the PURE allowlist is "unvetted" - it needs the CRITICAL tier, so a human sees it.
+#     Comments are never matched, strings only for escape dunders, so "open(" in a docstring is fine.
+#     The one application module generated code may use is numeric_helpers, and only the
+#     names it exports: `nh.rsi` is harmless, `nh._np` or `nh._inspect` is application code.
+#     NumPy is allowed name by name (PURE_NUMPY); its file functions and the rest are not
+#   - loop nesting depth and cyclomatic complexity are measured on the same walk
+# Analyses are cached by code hash, so an unchanged implementation is parsed once per
+# process; audit_registry() re-checks every registered tool against the current rules.
+
+import ast
+import os
+import builtins
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Vectorized helpers generated code may import (numeric_helpers.py)
+HELPER_MODULE = "services.tool_creation_service.numeric_helpers"
+HELPER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "numeric_helpers.py")
+
+# Capabilities that are never allowed, and those that require the CRITICAL risk tier
+FORBIDDEN = ("process", "dynamic_exec", "application")
+CRITICAL_ONLY = ("network", "filesystem", "environment", "unvetted")
+DESCRIPTIONS = {
+    "process": "Shell command / process execution",
+    "dynamic_exec": "Dynamic code execution",
+    "application": "Import of application modules",
+    "network": "Network calls",
+    "filesystem": "File operations",
+    "environment": "Environment variables",
+    "unvetted": "Modules outside the vetted pure set",
+}
+
+# Dotted names (or module prefixes) and the capability they give the tool
+RULES = {
+    # Processes
+    "subprocess": "process", "multiprocessing": "process", "pty": "process", "ctypes": "process",
+    "os.system": "process", "os.popen": "process", "os.fork": "process", "os.forkpty": "process",
+    "os.kill": "process", "os.killpg": "process", "os.posix_spawn": "process", "os.posix_spawnp": "process",
+    "os.execl": "process", "os.execle": "process", "os.execlp": "process", "os.execlpe": "process",
+    "os.execv": "process", "os.execve": "process", "os.execvp": "process", "os.execvpe": "process",
+    "os.spawnl": "process", "os.spawnle": "process", "os.spawnlp": "process", "os.spawnlpe": "process",
+    "os.spawnv": "process", "os.spawnve": "process", "os.spawnvp": "process", "os.spawnvpe": "process",
+    "os.startfile": "process", "posix": "process", "nt": "process", "_posixsubprocess": "process",
+    "asyncio.subprocess": "process", "asyncio.create_subprocess_shell": "process",
+    "asyncio.create_subprocess_exec": "process", "concurrent.futures.ProcessPoolExecutor": "process",
+    "concurrent.futures.process": "process", "webbrowser": "process", "signal": "process",
+    # Dynamic code execution
+    "eval": "dynamic_exec", "exec": "dynamic_exec", "compile": "dynamic_exec", "__import__": "dynamic_exec",
+    "breakpoint": "dynamic_exec", "globals": "dynamic_exec", "importlib": "dynamic_exec",
+    "builtins": "dynamic_exec", "pickle": "dynamic_exec", "marshal": "dynamic_exec", "code": "dynamic_exec",
+    "runpy": "dynamic_exec", "vars": "dynamic_exec", "sys.modules": "dynamic_exec",
+    "sys._getframe": "dynamic_exec", "zipimport": "dynamic_exec", "shelve": "dynamic_exec",
+    "operator.attrgetter": "dynamic_exec", "operator.methodcaller": "dynamic_exec",
+    # Network
+    "socket": "network", "ssl": "network", "requests": "network", "urllib": "network", "urllib3": "network",
+    "http": "network", "httpx": "network", "aiohttp": "network", "ftplib": "network", "smtplib": "network",
+    "poplib": "network", "imaplib": "network", "telnetlib": "network", "xmlrpc": "network",
+    "websocket": "network", "websockets": "network", "paramiko": "network",
+    "asyncio.open_connection": "network", "asyncio.start_server": "network",
+    # Filesystem
+    "open": "filesystem", "io.open": "filesystem", "shutil": "filesystem", "pathlib": "filesystem",
+    "tempfile": "filesystem", "glob": "filesystem", "sqlite3": "filesystem", "fileinput": "filesystem",
+    "os.open": "filesystem", "os.remove": "filesystem", "os.unlink": "filesystem", "os.rmdir": "filesystem",
+    "os.removedirs": "filesystem", "os.rename": "filesystem", "os.renames": "filesystem",
+    "os.replace": "filesystem", "os.mkdir": "filesystem", "os.makedirs": "filesystem",
+    "os.chmod": "filesystem", "os.chown": "filesystem", "os.listdir": "filesystem", "os.scandir": "filesystem",
+    "os.walk": "filesystem", "os.truncate": "filesystem", "os.symlink": "filesystem", "os.link": "filesystem",
+    "os.chdir": "filesystem",
+    "io.FileIO": "filesystem", "io.open_code": "filesystem", "codecs.open": "filesystem",
+    "codecs.EncodedFile": "filesystem", "linecache": "filesystem", "gzip": "filesystem", "bz2": "filesystem",
+    "lzma": "filesystem", "zipfile": "filesystem", "tarfile": "filesystem", "dbm": "filesystem",
+    "mmap": "filesystem", "logging.FileHandler": "filesystem", "logging.handlers": "filesystem",
+    "logging.basicConfig": "filesystem",
+    "numpy.load": "filesystem", "numpy.save": "filesystem", "numpy.savez": "filesystem",
+    "numpy.savez_compressed": "filesystem", "numpy.loadtxt": "filesystem", "numpy.savetxt": "filesystem",
+    "numpy.genfromtxt": "filesystem", "numpy.fromfile": "filesystem", "numpy.memmap": "filesystem",
+    "numpy.DataSource": "filesystem", "numpy.ctypeslib": "process", "numpy.f2py": "process",
+    "numpy.fromregex": "filesystem", "numpy.lib.format": "filesystem", "numpy.lib.npyio": "filesystem",
+    "numpy.rec.fromfile": "filesystem", "numpy.core.records.fromfile": "filesystem",
+    "numpy.core.memmap": "filesystem", "numpy._core.memmap": "filesystem",
+    "numpy.core.multiarray.fromfile": "filesystem", "numpy._core.multiarray.fromfile": "filesystem",
+    # Secrets live in the environment
+    "os.environ": "environment", "os.environb": "environment", "os.getenv": "environment",
+    "os.getenvb": "environment", "os.putenv": "environment", "os.unsetenv": "environment",
+    # Application code (settings, registry, LLM clients) is off limits, except the vetted helpers
+    "services": "application", "backend": "application", "benchmarks": "application",
+}
+
+# Modules and names known to be pure computation (no I/O, processes or state outside the
+# call); an entry covers its members. Builtins are pure unless RULES says otherwise.
+PURE = frozenset({
+    "__future__", "typing", "dataclasses", "enum", "abc", "math", "cmath", "statistics", "decimal",
+    "fractions", "numbers", "random", "secrets", "itertools", "functools", "operator", "collections",
+    "heapq", "bisect", "array", "copy", "re", "string", "textwrap", "unicodedata", "difflib", "json",
+    "datetime", "calendar", "hashlib", "hmac", "base64", "struct",
+    "time.time", "time.perf_counter", "time.monotonic",
+    "os.sep", "os.linesep", "os.path.join", "os.path.basename", "os.path.dirname", "os.path.split",
+    "os.path.splitext", "os.path.normpath",
+    "sys.maxsize", "sys.float_info", "sys.version_info",
+    "langchain_core.tools.tool", "pydantic.BaseModel", "pydantic.Field",
+})
+
+# Whole modules on the allowlist (what a SAFE tool may import outright)
+PURE_MODULES = frozenset(name for name in PURE if "." not in name)
+
+# NumPy callables and constants known to be pure; the rest of numpy.* is unvetted
+PURE_NUMPY = frozenset("numpy." + name for name in (
+    # types and constants
+    "ndarray", "dtype", "generic", "number", "integer", "floating", "bool_", "int8", "int16", "int32",
+    "int64", "uint8", "uint16", "uint32", "uint64", "float16", "float32", "float64", "complex128",
+    "nan", "inf", "pi", "e", "newaxis", "errstate", "finfo", "iinfo",
+    # creation
+    "array", "asarray", "asanyarray", "ascontiguousarray", "copy", "zeros", "zeros_like", "ones",
+    "ones_like", "empty", "empty_like", "full", "full_like", "arange", "linspace", "logspace", "eye",
+    "identity", "diag", "meshgrid", "tri", "tril", "triu",
+    # shape and joining
+    "reshape", "ravel", "transpose", "swapaxes", "moveaxis", "expand_dims", "squeeze", "concatenate",
+    "stack", "vstack", "hstack", "column_stack", "split", "array_split", "tile", "repeat", "roll",
+    "flip", "append", "insert", "delete", "pad", "broadcast_to", "atleast_1d", "atleast_2d",
+    # elementwise math
+    "abs", "absolute", "sign", "sqrt", "square", "power", "exp", "expm1", "log", "log1p", "log2",
+    "log10", "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2", "sinh", "cosh", "tanh",
+    "add", "subtract", "multiply", "divide", "true_divide", "floor_divide", "mod", "remainder",
+    "maximum", "minimum", "fmax", "fmin", "clip", "round", "around", "floor", "ceil", "trunc", "rint",
+    "isnan", "isinf", "isfinite", "nan_to_num", "where", "select", "piecewise", "logical_and",
+    "logical_or", "logical_not", "logical_xor", "greater", "less", "equal", "isclose", "allclose",
+    "array_equal",
+    # reductions and statistics
+    "sum", "prod", "cumsum", "cumprod", "mean", "average", "median", "std", "var", "min", "max",
+    "amin", "amax", "ptp", "argmin", "argmax", "percentile", "quantile", "nansum", "nanmean",
+    "nanmedian", "nanstd", "nanvar", "nanmin", "nanmax", "nanpercentile", "nanquantile", "cov",
+    "corrcoef", "histogram", "bincount", "digitize", "diff", "gradient", "convolve", "correlate",
+    "interp", "polyfit", "polyval", "trapz", "trapezoid", "count_nonzero", "all", "any",
+    # sorting and searching
+    "sort", "argsort", "searchsorted", "unique", "nonzero", "argwhere", "flatnonzero",
+    "dot", "matmul", "outer", "inner", "cross", "einsum", "linalg", "fft", "random",
+    "lib.stride_tricks",
+))
+
+# Method names that write files whatever object they are called on (ndarray.tofile)
+METHOD_RULES = {"tofile": "filesystem"}
+
+# Attribute names used to climb out of a namespace (object.__subclasses__() and friends)
+ESCAPE_ATTRIBUTES = {
+    "__globals__", "__builtins__", "__subclasses__", "__code__", "__getattribute__",
+    "__bases__", "__mro__", "__dict__", "__closure__", "__loader__", "__spec__",
+    # print.__self__ is the builtins module; frames expose their globals and builtins
+    "__self__", "__import__", "f_globals", "f_builtins", "f_locals", "f_back",
+    "gi_frame", "cr_frame", "tb_frame",
+}
+
+ESCAPE_DUNDERS = sorted(name for name in ESCAPE_ATTRIBUTES if name.startswith("__"))
+
+# Warning thresholds
+MAX_LOOP_DEPTH = 3
+MAX_COMPLEXITY = 15
+
+CACHE_SIZE = 1024
+
+BUILTIN_NAMES = frozenset(dir(builtins))
+# Modules some of whose members are classified ("os", "numpy", ...)
+SENSITIVE_MODULES = frozenset(
+    ".".join(name.split(".")[:end]) for name in RULES for end in range(1, name.count(".") + 1)
+) | {HELPER_MODULE}
+
+def _exported_names(path: str) -> frozenset:
+    """A module's __all__, read from its source so NumPy need not be importable here."""
+    try:
+        with open(path, "r") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError) as e:
+        logger.warning(f"⚠️ Cannot read {path}, no helper is allowed: {e}")
+        return frozenset()
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "__all__" for t in node.targets):
+            return frozenset(ast.literal_eval(node.value))
+    return frozenset()
+
+# The only helper names generated code may reach
+HELPER_EXPORTS = _exported_names(HELPER_FILE)
+
+def code_hash(code: str) -> str:
+    """Same hash the registry stores for an implementation."""
+    return hashlib.sha256(code.encode()).hexdigest()[:16]
+
+def _fully_pure(module: str) -> bool:
+    """Every member of the module is pure (the module itself, or a parent, is on the allowlist)."""
+    parts = module.split(".")
+    return any(".".join(parts[:end]) in PURE for end in range(1, len(parts) + 1))
+
+# Namespaces of allowed names ("os", "os.path", "numpy.lib"): importing them is judged by use
+ALLOWED_NAMESPACES = frozenset(
+    ".".join(name.split(".")[:end]) for name in PURE | PURE_NUMPY for end in range(1, name.count(".") + 1)
+)
+
+def _rule(name: str) -> Optional[str]:
+    """RULES category of the longest matching prefix."""
+    parts = name.split(".")
+    for end in range(len(parts), 0, -1):
+        category = RULES.get(".".join(parts[:end]))
+        if category is not None:
+            return category
+    return None
+
+def classify(name: str) -> Optional[str]:
+    """
+    Capability of a dotted name: the RULES category of its longest matching prefix, else
+    None when it is pure (PURE, PURE_NUMPY, a builtin, a namespace of those), else "unvetted".
+    """
+    if name == HELPER_MODULE or name.startswith(HELPER_MODULE + "."):
+        rest = name[len(HELPER_MODULE) + 1:]
+        if not rest or rest in HELPER_EXPORTS:
+            return None
+        # Anything else reached through the helpers: what it leads to, or their internals
+        return _rule(rest) or "application"
+    category = _rule(name)
+    if category is not None:
+        return category
+    parts = name.split(".")
+    prefixes = [".".join(parts[:end]) for end in range(len(parts), 0, -1)]
+    if parts[0] in BUILTIN_NAMES or name in ALLOWED_NAMESPACES \
+            or any(prefix in PURE or prefix in PURE_NUMPY for prefix in prefixes):
+        return None
+    return "unvetted"
+
+class CodeAnalysis:
+    """Facts about one piece of code; independent of the risk tier it is proposed with."""
+
+    def __init__(self):
+        self.syntax_error: Optional[str] = None
+        self.capabilities: Dict[str, set] = {}
+        self.dynamic_attributes: List[str] = []
+        self.tool_functions: List[str] = []
+        self.has_function = False
+        self.returns_value = False
+        self.star_imports: List[str] = []
+        self.unbounded_loops = 0
+        self.max_loop_depth = 0
+        self.complexity = 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "capabilities": {category: sorted(names) for category, names in sorted(self.capabilities.items())},
+            "max_loop_depth": self.max_loop_depth,
+            "complexity": self.complexity,
+        }
+
+class _Visitor(ast.NodeVisitor):
+    """One pass: resolves names through aliases, records capabilities, loops and branches."""
+
+    def __init__(self, analysis: CodeAnalysis):
+        self.analysis = analysis
+        # name -> dotted name it refers to; None for a local that shadows a builtin or import
+        self.aliases: Dict[str, Optional[str]] = {}
+        # ids of Name nodes used as an attribute base, a getattr target or a bound value
+        self.consumed: set = set()
+        self.loop_depth = 0
+
+    # --- name resolution ---
+
+    def resolve(self, node: ast.AST) -> Optional[str]:
+        """Dotted name an expression refers to (`sp.run` -> "subprocess.run"), or None."""
+        if isinstance(node, ast.Name):
+            if node.id in self.aliases:
+                return self.aliases[node.id]
+            # Unimported names are locals, except builtins (open, eval, ...)
+            return node.id if node.id in BUILTIN_NAMES else None
+        if isinstance(node, ast.Attribute):
+            base = self.resolve(node.value)
+            return f"{base}.{node.attr}" if base else None
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "getattr" \
+                and len(node.args) >= 2 and isinstance(node.args[1], ast.Constant) and isinstance(node.args[1].value, str):
+            base = self.resolve(node.args[0])
+            return f"{base}.{node.args[1].value}" if base else None
+        if isinstance(node, ast.NamedExpr):
+            return self.resolve(node.value)
+        return None
+
+    def record(self, name: Optional[str]):
+        if not name:
+            return
+        category = classify(name)
+        if category is not None:
+            self.analysis.capabilities.setdefault(category, set()).add(name)
+
+    def escape(self, name: str):
+        self.analysis.capabilities.setdefault("dynamic_exec", set()).add(name)
+
+    def consume(self, node: ast.AST):
+        if isinstance(node, ast.Name):
+            self.consumed.add(id(node))
+
+    # --- imports and aliases ---
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+            else:
+                root = alias.name.split(".")[0]
+                self.aliases[root] = root
+            self.record(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        module = node.module or ""
+        for alias in node.names:
+            if alias.name == "*":
+                self.analysis.star_imports.append(module)
+                self.record(module)
+                if module != HELPER_MODULE and not _fully_pure(module):
+                    # The imported names cannot be told apart from locals afterwards
+                    self.analysis.capabilities.setdefault("unvetted", set()).add(f"{module}.*")
+                continue
+            full = f"{module}.{alias.name}" if module else alias.name
+            self.aliases[alias.asname or alias.name] = full
+            self.record(full)
+
+    def bind(self, target: ast.AST, values: List[ast.AST]):
+        """
+        Binds a target to what it may refer to: one value for an assignment, every element
+        of a literal list/tuple for a loop. `run = subprocess.run` makes `run` an alias; a
+        value that does not resolve shadows the name.
+        """
+        if isinstance(target, ast.Name):
+            names = []
+            for value in values:
+                resolved = self.resolve(value)
+                if resolved and resolved not in names:
+                    names.append(resolved)
+                    self.consume(value)
+            sensitive = [name for name in names if classify(name) or name in SENSITIVE_MODULES]
+            if len(names) == 1:
+                self.aliases[target.id] = names[0]
+            elif len(sensitive) > 1:
+                # `for m in [os, numpy]` - one alias cannot follow both
+                self.aliases[target.id] = sensitive[0]
+                self.escape(f"{target.id} in [{', '.join(sensitive)}]")
+            else:
+                self.aliases[target.id] = sensitive[0] if sensitive else None
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            # `a, b = os, sys` unpacks position by position
+            width = len(target.elts)
+            for index, element in enumerate(target.elts):
+                self.bind(element, [value.elts[index] for value in values
+                                    if isinstance(value, (ast.Tuple, ast.List)) and len(value.elts) == width])
+        elif isinstance(target, ast.Starred):
+            self.bind(target.value, [])
+
+    def _loop_values(self, iterable: ast.AST) -> List[ast.AST]:
+        """Elements a loop target takes from a literal collection; none for anything else."""
+        if isinstance(iterable, (ast.List, ast.Tuple, ast.Set)):
+            return list(iterable.elts)
+        return []
+
+    def visit_Assign(self, node: ast.Assign):
+        for target in node.targets:
+            self.bind(target, [node.value])
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        if node.value is not None:
+            self.bind(node.target, [node.value])
+        self.generic_visit(node)
+
+    def visit_NamedExpr(self, node: ast.NamedExpr):
+        self.bind(node.target, [node.value])
+        self.generic_visit(node)
+
+    def _visit_with(self, node):
+        for item in node.items:
+            if item.optional_vars is not None:
+                self.bind(item.optional_vars, [item.context_expr])
+        self.generic_visit(node)
+
+    visit_With = _visit_with
+    visit_AsyncWith = _visit_with
+
+    # --- references ---
+
+    def visit_Constant(self, node: ast.Constant):
+        # "{0.__globals__}".format(f) walks attributes without an attribute node
+        if isinstance(node.value, str):
+            for attribute in ESCAPE_DUNDERS:
+                if attribute in node.value:
+                    self.escape(f"'{attribute}' in a string")
+
+    def visit_Name(self, node: ast.Name):
+        if node.id in ESCAPE_ATTRIBUTES:
+            self.escape(node.id)
+        elif isinstance(node.ctx, ast.Load):
+            resolved = self.resolve(node)
+            self.record(resolved)
+            if resolved in SENSITIVE_MODULES and id(node) not in self.consumed:
+                # Passed, stored or returned: whatever uses it next is out of sight
+                self.escape(f"{resolved} (as a value)")
+
+    def visit_Attribute(self, node: ast.Attribute):
+        if node.attr in ESCAPE_ATTRIBUTES:
+            self.escape(node.attr)
+        self.consume(node.value)
+        if node.attr in METHOD_RULES:
+            self.analysis.capabilities.setdefault(METHOD_RULES[node.attr], set()).add(f".{node.attr}()")
+        resolved = self.resolve(node)
+        if resolved is not None:
+            # The whole chain resolved; `subprocess` alone would add a second, shorter entry
+            self.record(resolved)
+            if classify(resolved) is None:
+                self.generic_visit(node)
+            else:
+                base = node.value
+                while isinstance(base, ast.Attribute):
+                    base = base.value
+                if not isinstance(base, ast.Name):
+                    # `(m := os).system` still binds m, `getattr(...)` still gets checked
+                    self.visit(base)
+        else:
+            self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Name) and func.id == "getattr" and len(node.args) >= 2:
+            target = self.resolve(node.args[0])
+            name = node.args[1]
+            self.consume(node.args[0])
+            if isinstance(name, ast.Constant) and isinstance(name.value, str):
+                self.record(self.resolve(node))
+                if name.value in ESCAPE_ATTRIBUTES:
+                    self.escape(name.value)
+            elif target and (classify(target) is not None or target in SENSITIVE_MODULES):
+                # getattr(os, "sys" + "tem") - a computed name on a sensitive module
+                self.escape(f"getattr({target}, ...)")
+            else:
+                self.analysis.dynamic_attributes.append(target or "<expression>")
+        self.generic_visit(node)
+
+    # --- structure ---
+
+    def _visit_function(self, node):
+        self.analysis.has_function = True
+        for decorator in node.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            if self.resolve(target) in ("tool", "langchain_core.tools.tool", "langchain.tools.tool"):
+                self.analysis.tool_functions.append(node.name)
+        # Loops in a nested function run when it is called, not where it is defined
+        outer_depth, self.loop_depth = self.loop_depth, 0
+        self.generic_visit(node)
+        self.loop_depth = outer_depth
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_Return(self, node: ast.Return):
+        if node.value is not None:
+            self.analysis.returns_value = True
+        self.generic_visit(node)
+
+    # --- loops and branches ---
+
+    def _enter_loop(self, levels: int = 1):
+        self.loop_depth += levels
+        self.analysis.max_loop_depth = max(self.analysis.max_loop_depth, self.loop_depth)
+
+    def _visit_loop(self, node):
+        if not isinstance(node, ast.While):
+            self.bind(node.target, self._loop_values(node.iter))
+        self.analysis.complexity += 1
+        if isinstance(node, ast.While) and isinstance(node.test, ast.Constant) and node.test.value \
+                and not any(isinstance(child, ast.Break) for child in ast.walk(node)):
+            self.analysis.unbounded_loops += 1
+        self._enter_loop()
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    visit_For = _visit_loop
+    visit_AsyncFor = _visit_loop
+    visit_While = _visit_loop
+
+    def _visit_comprehension(self, node):
+        for generator in node.generators:
+            self.bind(generator.target, self._loop_values(generator.iter))
+        self.analysis.complexity += sum(1 + len(gen.ifs) for gen in node.generators)
+        self._enter_loop(len(node.generators))
+        self.generic_visit(node)
+        self.loop_depth -= len(node.generators)
+
+    visit_ListComp = _visit_comprehension
+    visit_SetComp = _visit_comprehension
+    visit_DictComp = _visit_comprehension
+    visit_GeneratorExp = _visit_comprehension
+
+    def _visit_branch(self, node):
+        self.analysis.complexity += 1
+        self.generic_visit(node)
+
+    visit_If = _visit_branch
+    visit_IfExp = _visit_branch
+    visit_ExceptHandler = _visit_branch
+    visit_Assert = _visit_branch
+
+    def visit_BoolOp(self, node: ast.BoolOp):
+        self.analysis.complexity += len(node.values) - 1
+        self.generic_visit(node)
+
+def analyze(code: str) -> CodeAnalysis:
+    """Parses and walks the code once (uncached; see analyze_cached)."""
+    analysis = CodeAnalysis()
+    try:
+        tree = ast.parse(code, "<generated_tool>")
+    except SyntaxError as e:
+        analysis.syntax_error = str(e)
+        return analysis
+    _Visitor(analysis).visit(tree)
+    return analysis
+
+_cache: "OrderedDict[str, CodeAnalysis]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def analyze_cached(code: str) -> CodeAnalysis:
+    """analyze(), memoized by code hash (LRU of CACHE_SIZE)."""
+    key = code_hash(code)
+    with _cache_lock:
+        analysis = _cache.get(key)
+        if analysis is not None:
+            _cache.move_to_end(key)
+            return analysis
+
+    analysis = analyze(code)
+    with _cache_lock:
+        _cache[key] = analysis
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return analysis
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+def verdict(analysis: CodeAnalysis, risk_tier: str) -> Dict[str, Any]:
+    """
+    Applies the rules to an analysis
+
+    Returns:
+        {"safe": bool, "issues": [str], "warnings": [str], "analysis": {...}}
+    """
+    issues, warnings = [], []
+
+    if analysis.syntax_error:
+        issues.append(f"Syntax error: {analysis.syntax_error}")
+        return {"safe": False, "issues": issues, "warnings": warnings, "analysis": analysis.summary()}
+
+    for category in FORBIDDEN:
+        names = analysis.capabilities.get(category)
+        if names:
+            issues.append(f"Dangerous pattern detected: {DESCRIPTIONS[category]} ({', '.join(sorted(names))})")
+    if risk_tier != "CRITICAL":
+        for category in CRITICAL_ONLY:
+            names = analysis.capabilities.get(category)
+            if names:
+                issues.append(f"{DESCRIPTIONS[category]} require CRITICAL risk tier ({', '.join(sorted(names))})")
+
+    if not analysis.has_function:
+        issues.append("Missing function definition")
+    if not analysis.tool_functions:
+        issues.append("Missing @tool decorator")
+
+    if analysis.has_function and not analysis.returns_value:
+        warnings.append("Function may not return a value")
+    if analysis.star_imports:
+        warnings.append(f"Star imports hide which names are used: {', '.join(analysis.star_imports)}")
+    if analysis.dynamic_attributes:
+        warnings.append(f"Dynamic attribute access on: {', '.join(sorted(set(analysis.dynamic_attributes)))}")
+    if analysis.unbounded_loops:
+        warnings.append("`while True` loop without a break")
+    if analysis.max_loop_depth >= MAX_LOOP_DEPTH:
+        warnings.append(f"Loops nested {analysis.max_loop_depth} deep (~O(n^{analysis.max_loop_depth})); may be slow on large inputs")
+    if analysis.complexity > MAX_COMPLEXITY:
+        warnings.append(f"High cyclomatic complexity ({analysis.complexity})")
+
+    return {"safe": not issues, "issues": issues, "warnings": warnings, "analysis": analysis.summary()}
+
+def audit(code: str, risk_tier: str) -> Dict[str, Any]:
+    """Verdict for one implementation; the parse is cached by code hash."""
+    return verdict(analyze_cached(code), risk_tier)
+
+def audit_batch(items: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Verdicts for many (code, risk_tier) pairs; identical code is analyzed once."""
+    return [audit(code, risk_tier) for code, risk_tier in items]
+
+def audit_registry(registry=None) -> Dict[str, Dict[str, Any]]:
+    """
+    Re-checks every current registry entry against the current rules
+
+    Returns:
+        {tool_name: verdict}; a tool whose file cannot be read gets an unsafe verdict
+    """
+    if registry is None:
+        from services.tool_creation_service.registry import tool_registry as registry
+
+    results = {}
+    for entry in registry.list_tools():
+        try:
+            with open(entry["filepath"], "r") as f:
+                code = f.read()
+        except OSError as e:
+            results[entry["name"]] = {"safe": False, "issues": [f"Tool file unreadable: {e}"], "warnings": [], "analysis": {}}
+            continue
+        results[entry["name"]] = audit(code, entry["risk_tier"])
+
+    failing = sorted(name for name, result in results.items() if not result["safe"])
+    if failing:
+        logger.warning(f"⚠️ Registry audit: {len(failing)}/{len(results)} tool(s) fail the current rules: {', '.join(failing)}")
+    else:
+        logger.info(f"✅ Registry audit: all {len(results)} tool(s) pass")
+    return results
@@ -0,0 +1,133 @@
+# ----- near-duplicate lookup in front of tool generation @ services/tool_creation_service/dedup.py -----
+#
+# Agents ask for the same capability in different words ("compute RSI", "relative strength
+# index of these prices"). Before tool_creation_gate pays for an LLM generation and a human
+# approval, the request is matched against the registry:
+#   1. normalized-text hash - same words as a registered tool's name or description
+#   2. lexical score       - BM25 picks the best candidate, which is accepted when
+#                            - the idf-weighted share of the request's specific terms it covers reaches
+#                              TOOL_DEDUP_THRESHOLD,
+#                            - the request in turn covers TOOL_DEDUP_TOOL_COVERAGE of the tool's
+#                              name or description terms, and
+#                            - they share MIN_MATCHED_TERMS specific (non-GENERIC) terms
+#                            so "compute price" does not land on compute_rsi just because both
+#                            words appear in its description.
+# The index is rebuilt only when the registry's change counter moves.
+
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+from backend.core.config import settings
+from backend.utils.logger import get_logger
+from services.ai_service.agent.tool_retrieval import BM25Index, tokenize, tool_document
+
+logger = get_logger(__name__)
+
+# BM25 candidates checked against the threshold
+CANDIDATES = 3
+# Specific terms a request must share with a tool (fewer if the request has fewer)
+MIN_MATCHED_TERMS = 2
+# Words that describe almost any numeric tool; they never make two requests the same (tokenized form)
+GENERIC = {
+    "compute", "calculate", "calculation", "calc", "get", "fetch", "find", "return", "value",
+    "list", "number", "price", "data", "result", "period", "time", "given", "series",
+    "historical", "input", "output", "tool", "function", "based", "asset",
+    "these", "those", "each", "all", "some", "current",
+}
+
+def normalized_hash(text: str) -> str:
+    """Hash of the sorted distinct tokens, so word order, case, plurals and filler words do not matter."""
+    return hashlib.sha256(" ".join(sorted(set(tokenize(text)))).encode()).hexdigest()[:16]
+
+class ToolMatcher:
+    """Registry snapshot indexed for duplicate lookups."""
+
+    def __init__(self, entries: List[dict]):
+        self.entries = {entry["name"]: entry for entry in entries}
+        self.hashes: Dict[str, str] = {}
+        for entry in entries:
+            self.hashes.setdefault(normalized_hash(entry["description"]), entry["name"])
+            self.hashes.setdefault(normalized_hash(entry["name"]), entry["name"])
+        self.index = BM25Index({
+            entry["name"]: tool_document(entry["name"], entry["description"], entry.get("parameters", []))
+            for entry in entries
+        })
+        self.terms = {name: set(tokenize(tool_document(name, e["description"], e.get("parameters", []))))
+                      for name, e in self.entries.items()}
+        # What the tool is, without generic words: its name, and its description
+        self.identity = {name: [set(tokenize(text)) - GENERIC for text in (name, e["description"])]
+                         for name, e in self.entries.items()}
+
+    def _share(self, terms: set, covering: set) -> float:
+        """Idf-weighted share of `terms` found in `covering` (0..1)."""
+        if not terms:
+            return 0.0
+        # Terms no registered tool uses are the most specific ones; weigh them as rare
+        unseen = max(self.index.idf.values(), default=1.0)
+        weights = {term: self.index.idf.get(term, unseen) for term in terms}
+        covered = sum(weight for term, weight in weights.items() if term in covering)
+        return covered / sum(weights.values())
+
+    def coverage(self, query_terms: set, name: str) -> float:
+        """Idf-weighted share of the query's terms found in the tool's document (0..1)."""
+        return self._share(query_terms, self.terms[name])
+
+    def tool_coverage(self, query_terms: set, name: str) -> float:
+        """Share of the tool's specific name terms, or description terms, the query covers - whichever is higher."""
+        return max(self._share(terms, query_terms) for terms in self.identity[name])
+
+    def accepts(self, query_terms: set, name: str, threshold: float) -> bool:
+        """Both directions of coverage hold and enough specific terms are shared."""
+        specific = query_terms - GENERIC
+        matched = specific & self.terms[name]
+        return (
+            len(matched) >= max(1, min(MIN_MATCHED_TERMS, len(specific)))
+            and self.coverage(specific, name) >= threshold
+            and self.tool_coverage(query_terms, name) >= settings.TOOL_DEDUP_TOOL_COVERAGE
+        )
+
+    def match(self, capability: str, threshold: float) -> Optional[dict]:
+        """Best existing tool for the capability, or None. Adds "match" (how) and "score"."""
+        name = self.hashes.get(normalized_hash(capability))
+        if name is not None:
+            return {**self.entries[name], "match": "normalized text", "score": 1.0}
+
+        query_terms = set(tokenize(capability))
+        best = None
+        for name, _ in self.index.top_k(capability, CANDIDATES):
+            if not self.accepts(query_terms, name, threshold):
+                continue
+            score = self.coverage(query_terms - GENERIC, name)
+            if best is None or score > best[1]:
+                best = (name, score)
+
+        if best is not None:
+            return {**self.entries[best[0]], "match": "lexical", "score": round(best[1], 3)}
+        return None
+
+_matcher: Optional[ToolMatcher] = None
+_matcher_version = None
+_lock = threading.Lock()
+
+def find_existing_tool(capability: str, registry=None, threshold: float = None) -> Optional[dict]:
+    """
+    Registered tool that already provides `capability`, or None.
+
+    Returns:
+        The registry entry plus "match" ("normalized text" or "lexical") and "score"
+    """
+    global _matcher, _matcher_version
+    if registry is None:
+        from services.tool_creation_service.registry import tool_registry as registry
+    if threshold is None:
+        threshold = settings.TOOL_DEDUP_THRESHOLD
+
+    version = (id(registry), registry.change_counter())
+    with _lock:
+        if _matcher is None or _matcher_version != version:
+            _matcher = ToolMatcher(registry.list_tools())
+            _matcher_version = version
+        matcher = _matcher
+
+    return matcher.match(capability, threshold)
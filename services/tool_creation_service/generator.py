@@ -1,9 +1,11 @@
 # deterministcally build tool boilerplate from LLM-generated function spec @ services/tool_creation_service/generator.py -----
 from pydantic import BaseModel
-from typing import Dict, Any, Literal, List
+from typing import Dict, Any, Literal, List, Optional
 import json
 from backend.core.llm_factory import get_llm
+from backend.utils import cassette
 from backend.utils.logger import get_logger
+from services.tool_creation_service.analyzer import PURE_MODULES, audit
 
 logger = get_logger(__name__)
 
@@ -28,18 +30,20 @@ class FunctionSpec(BaseModel):
     risk_tier: Literal["SAFE", "CRITICAL"]
     reasoning: str
 
-def generate_tool_proposal(task_description: str, context: str = "") -> ToolCreationProposal:
+def generate_tool_proposal(task_description: str, context: str = "", thread_id: Optional[str] = None) -> ToolCreationProposal:
     """
     Uses LLM to generate function specification, then we wrap it deterministically
     
     Args:
         task_description: What capability the agent needs
         context: Recent conversation context for better understanding
+        thread_id: Session the request belongs to (used for cassette record/replay)
     
     Returns:
         ToolCreationProposal with complete implementation
     """
     llm = get_llm()
+    helpers = _numeric_helpers_section()
     
     # Step 1: Get structured specification from LLM
     prompt = f"""You are generating a Python function specification.
@@ -77,9 +81,9 @@ PARAMETER TYPES (choose from):
 - "bool" for true/false
 - "list" for arrays
 - "dict" for objects
-
+{helpers}
 RISK CLASSIFICATION:
-- SAFE: Pure computation, data processing, no external effects
+- SAFE: Pure computation, data processing, no external effects; imports limited to {', '.join(sorted(PURE_MODULES - {'__future__'}))}, numpy
 - CRITICAL: File I/O, database access, network calls, system commands
 
 Example for "convert celsius to fahrenheit":
@@ -98,7 +102,7 @@ Now generate the specification for: {task_description}
 
 Respond with ONLY the JSON object:"""
 
-    response = llm.invoke(prompt)
+    response = cassette.invoke_llm(llm, prompt, thread_id, "generate_tool_proposal")
     content = response.content if hasattr(response, 'content') else str(response)
 
     try:
@@ -140,6 +144,23 @@ Respond with ONLY the JSON object:"""
     
     return proposal
 
+def _numeric_helpers_section() -> str:
+    """
+    Prompt section advertising numeric_helpers; empty when NumPy is not installed.
+    Imported here, not at module level, so importing the generator stays cheap
+    """
+    try:
+        from services.tool_creation_service.numeric_helpers import describe_helpers
+    except ImportError:
+        return ""
+    return f"""
+NUMERIC HELPERS (vectorized NumPy; use them instead of Python loops over lists of numbers):
+Import inside function_body, e.g. "    from services.tool_creation_service.numeric_helpers import rsi, rolling_mean\\n"
+No other application module may be imported. Helpers accept plain lists and return NumPy
+arrays (last value: float(result[-1])) - convert to float/list before formatting the result.
+{describe_helpers()}
+"""
+
 def _build_complete_tool(spec: FunctionSpec) -> str:
     """
     Deterministically builds complete tool code from specification
@@ -213,59 +234,10 @@ def _generate_example_usage(spec: FunctionSpec) -> str:
 
 def validate_tool_code(code: str, risk_tier: str) -> Dict[str, Any]:
     """
-    Performs static analysis on generated tool code
+    Performs static analysis on generated tool code (AST-based, cached by code hash;
+    see analyzer.py)
     
     Returns:
-        {"safe": bool, "issues": [str], "warnings": [str]}
+        {"safe": bool, "issues": [str], "warnings": [str], "analysis": {...}}
     """
-    issues = []
-    warnings = []
-    
-    # Check for dangerous patterns
-    dangerous_patterns = [
-        ("subprocess", "Shell command execution"),
-        ("os.system", "Shell command execution"),
-        ("eval(", "Code evaluation"),
-        ("exec(", "Code execution"),
-        ("__import__", "Dynamic imports"),
-    ]
-    
-    for pattern, description in dangerous_patterns:
-        if pattern in code:
-            issues.append(f"Dangerous pattern detected: {description} ({pattern})")
-    
-    # Check for network calls
-    network_patterns = ["requests.", "urllib.", "http.client", "socket."]
-    has_network = any(pattern in code for pattern in network_patterns)
-    
-    if has_network and risk_tier != "CRITICAL":
-        issues.append("Network calls require CRITICAL risk tier")
-    
-    # Check for file operations
-    file_patterns = ["open(", "with open", "os.remove", "shutil."]
-    has_file_ops = any(pattern in code for pattern in file_patterns)
-    
-    if has_file_ops and risk_tier != "CRITICAL":
-        issues.append("File operations require CRITICAL risk tier")
-    
-    # Syntax validation
-    try:
-        compile(code, '<generated_tool>', 'exec')
-    except SyntaxError as e:
-        issues.append(f"Syntax error: {e}")
-    
-    # Check structure
-    if "@tool" not in code:
-        issues.append("Missing @tool decorator")
-    
-    if "def " not in code:
-        issues.append("Missing function definition")
-    
-    if "return" not in code:
-        warnings.append("Function may not return a value")
-    
-    return {
-        "safe": len(issues) == 0,
-        "issues": issues,
-        "warnings": warnings
-    }
\ No newline at end of file
+    return audit(code, risk_tier)
@@ -1,22 +1,29 @@
 # ----- boilerplate for integrating langchain generated code into agent graph @ services/tool_creation_service/graph_integration.py -----
 
 from typing import Literal
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
 from services.ai_service.agent.state import AgentState
+from services.tool_creation_service.dedup import find_existing_tool
 from services.tool_creation_service.generator import generate_tool_proposal, validate_tool_code
+from services.tool_creation_service.microbench import benchmark_proposal, skip_reason
+from backend.core.config import settings
 from backend.core.llm_factory import get_llm
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-def tool_creation_gate(state: AgentState):
+def tool_creation_gate(state: AgentState, config: RunnableConfig = None):
     """
     Handles tool creation requests - similar to critical_gate
     
     This node:
     1. Extracts the capability description from tool call
-    2. Generates tool code using LLM
-    3. Validates the generated code
-    4. Prepares approval summary for human review
+    2. Returns an existing registered tool if one already provides it
+    3. Generates tool code using LLM
+    4. Validates the generated code
+    5. Benchmarks it on synthetic inputs in a tool worker and rejects it when over budget
+    6. Prepares approval summary for human review
     """
     last_msg = state["messages"][-1]
     
@@ -28,6 +35,33 @@ def tool_creation_gate(state: AgentState):
     # Extract the capability description
     capability_needed = tool_call['args'].get('capability_needed', '')
     
+    # Reuse before generating: no LLM call, no approval round
+    try:
+        existing = find_existing_tool(capability_needed)
+    except Exception as e:
+        logger.warning(f"Duplicate tool lookup failed, generating a new tool: {e}")
+        existing = None
+
+    if existing:
+        logger.info(f"[TOOL CREATION GATE] ♻️ Reusing {existing['name']} ({existing['match']} match, score {existing['score']})")
+        params = ", ".join(f"{p['name']}: {p['type']}" for p in existing.get("parameters", []))
+        return {
+            "messages": [ToolMessage(
+                content=(
+                    f"An existing tool already provides this capability; no new tool was created.\n\n"
+                    f"Tool: {existing['name']}({params})\n"
+                    f"Description: {existing['description']}\n\n"
+                    f"Call {existing['name']} directly."
+                ),
+                name=tool_call["name"],
+                tool_call_id=tool_call["id"],
+                # Lets the per-turn tool retrieval bind this tool on the next turn
+                artifact={"suggested_tools": [existing["name"]]},
+            )],
+            "reasoning_summary": f"Reused existing tool {existing['name']} instead of generating a new one",
+            "pending_critical_tool": None
+        }
+
     logger.info(f"[TOOL CREATION GATE] Generating proposal for: {capability_needed}")
     
     # Generate tool proposal using LLM
@@ -39,7 +73,8 @@ def tool_creation_gate(state: AgentState):
             for msg in recent_history
         ])
         
-        proposal = generate_tool_proposal(capability_needed, context)
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        proposal = generate_tool_proposal(capability_needed, context, thread_id)
         
         # Validate the generated code
         validation = validate_tool_code(proposal.implementation, proposal.risk_tier)
@@ -51,6 +86,16 @@ def tool_creation_gate(state: AgentState):
                 "reasoning_summary": error_msg,
                 "pending_critical_tool": None
             }
+
+        # Runtime cost on synthetic inputs, measured before anyone is asked to approve;
+        # tools that touch files or the network only run after approval
+        not_measured = skip_reason(proposal, validation) if settings.TOOL_BENCHMARK else "TOOL_BENCHMARK is off"
+        benchmark = benchmark_proposal(proposal) if not_measured is None else None
+        if benchmark and not benchmark["within_budget"]:
+            return {
+                "reasoning_summary": f"Tool generation failed the runtime budget: {benchmark['reason']}\n{benchmark['summary']}",
+                "pending_critical_tool": None
+            }
         
         # Create approval summary
         param_list = "\n".join([
@@ -78,7 +123,11 @@ Generated Code Preview:
 
 Validation:
 ✓ No security issues detected
+Loop nesting: {validation['analysis']['max_loop_depth']}, cyclomatic complexity: {validation['analysis']['complexity']}
 {f"⚠ Warnings: {', '.join(validation['warnings'])}" if validation['warnings'] else "✓ No warnings"}
+
+Runtime (synthetic inputs):
+{benchmark['summary'] if benchmark else f"  not measured ({not_measured})"}
 """
 
         return {
@@ -87,7 +136,8 @@ Validation:
                 "name": "create_tool",
                 "args": {
                     "proposal": proposal.dict(),
-                    "validation": validation
+                    "validation": validation,
+                    "benchmark": benchmark
                 }
             }
         }
@@ -107,7 +157,7 @@ def execute_tool_creation(state: AgentState):
     This node:
     1. Extracts the approved proposal from state
     2. Registers the tool in the registry (saves to disk)
-    3. Loads the tool into memory
+    3. Makes the tool available (it runs in a sandboxed worker process when called)
     4. Returns success message to agent
     """
     from services.tool_creation_service.registry import tool_registry
@@ -132,8 +182,9 @@ def execute_tool_creation(state: AgentState):
     
     logger.info(f"✓ Tool created and registered: {proposal.tool_name} (hash: {tool_hash})")
 
-    new_tool = tool_registry.load_tool(proposal.tool_name)
-    logger.info(f"✓ Tool loaded and ready: {new_tool.name}")
+    # A proxy: the generated code only ever runs in a tool worker process
+    new_tool = tool_registry.get_tool(proposal.tool_name)
+    logger.info(f"✓ Tool registered and ready: {new_tool.name}")
 
     success_msg = f"""
 ✅ New tool created successfully!
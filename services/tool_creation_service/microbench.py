@@ -0,0 +1,145 @@
+# ----- runtime cost of candidate tools, measured before approval @ services/tool_creation_service/microbench.py -----
+#
+# tool_creation_gate benchmarks proposals that pass static analysis and do no I/O (CRITICAL
+# tier, or filesystem/network capabilities, would run before anyone approved them):
+#   1. synthetic arguments are derived from the parameter types (like _generate_example_usage)
+#      at each of TOOL_BENCH_SIZES - lists and dicts grow with the size, or strings, or numbers
+#      when the tool takes nothing larger
+#   2. a tool worker (worker_pool.py, same CPU/memory/wall limits as registered tools) times
+#      the candidate on each size and traces its peak allocation
+#   3. the scaling exponent is fitted between the two largest measured sizes
+# A proposal over TOOL_BENCH_MAX_SECONDS per call or TOOL_BENCH_MAX_PEAK_MB is rejected.
+# Inputs the tool refuses ("ERROR: ..." or an exception) are reported as unmeasured, not as a failure.
+
+import math
+import random
+from typing import Any, Dict, List, Optional
+
+from backend.core.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Parameter types that grow with the input size, most specific first
+SCALING_TYPES = [("list", "dict"), ("str",), ("int", "float")]
+WORDS = ["price", "volume", "open", "close", "high", "low", "trend", "signal"]
+
+def _series(size: int, seed: int) -> List[float]:
+    """Deterministic positive random walk (price-like)."""
+    rng = random.Random(seed)
+    value, series = 100.0, []
+    for _ in range(size):
+        value = max(1.0, value + rng.uniform(-2.0, 2.0))
+        series.append(round(value, 2))
+    return series
+
+def synthetic_value(param_type: str, name: str, size: int, scaled: bool) -> Any:
+    """One argument value; `scaled` values grow with `size`, the others stay small and valid."""
+    if param_type == "list":
+        return _series(size if scaled else 10, seed=size)
+    if param_type == "dict":
+        return {f"{name}_{i}": value for i, value in enumerate(_series(size if scaled else 10, seed=size))}
+    if param_type == "str":
+        if scaled:
+            rng = random.Random(size)
+            return " ".join(rng.choice(WORDS) for _ in range(size))
+        return f"{name}_value"
+    if param_type == "int":
+        # Small enough to be a valid window/period for the smallest series
+        return size if scaled else max(1, min(14, size // 2))
+    if param_type == "float":
+        return float(size) if scaled else 1.5
+    if param_type == "bool":
+        return True
+    return f"{name}_value"
+
+def synthetic_args(parameters: List[Dict[str, str]], size: int) -> Dict[str, Any]:
+    """Arguments for one benchmark case of the given size."""
+    types = {p["type"] for p in parameters}
+    scaling = next((group for group in SCALING_TYPES if types & set(group)), ())
+    return {
+        p["name"]: synthetic_value(p["type"], p["name"], size, p["type"] in scaling)
+        for p in parameters
+    }
+
+def scaling_exponent(results: List[dict]):
+    """k in time ~ n^k between the two largest measured sizes, or None."""
+    measured = [r for r in results if "seconds" in r]
+    if len(measured) < 2:
+        return None
+    small, large = measured[-2], measured[-1]
+    if small["seconds"] <= 0 or large["size"] == small["size"]:
+        return None
+    return round(math.log(large["seconds"] / small["seconds"]) / math.log(large["size"] / small["size"]), 2)
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+def summarize(report: Dict[str, Any]) -> str:
+    """Approval-text summary of a benchmark report."""
+    if report.get("error"):
+        return f"✗ {report['error']}"
+    lines = []
+    for r in report["results"]:
+        if "seconds" in r:
+            lines.append(f"  n={r['size']:<6} {_format_seconds(r['seconds']):>9}/call   peak {r['peak_bytes'] / 1024:.0f} KiB")
+        elif r.get("skipped"):
+            lines.append(f"  n={r['size']:<6} skipped (previous size over budget)")
+        else:
+            lines.append(f"  n={r['size']:<6} not measured: {r['error']}")
+    if report["exponent"] is not None:
+        lines.append(f"  Scaling: ~O(n^{report['exponent']:.1f})")
+    lines.append(f"  {'✓ Within budget' if report['within_budget'] else '✗ ' + report['reason']}")
+    return "\n".join(lines)
+
+def skip_reason(proposal, validation: Dict[str, Any]) -> Optional[str]:
+    """Why a proposal must not run before approval (it performs I/O), or None."""
+    io = sorted(set(validation["analysis"]["capabilities"]) & {"filesystem", "network"})
+    if io:
+        return f"{' and '.join(io)} access; runs only after approval"
+    if proposal.risk_tier == "CRITICAL":
+        return "CRITICAL tier; runs only after approval"
+    return None
+
+def benchmark_proposal(proposal, pool=None) -> Dict[str, Any]:
+    """
+    Times a tool proposal on synthetic inputs in a tool worker
+
+    Returns:
+        {"results": [{"size", "seconds", "runs", "peak_bytes"} | {"size", "error"} | {"size", "skipped"}],
+         "exponent": float | None, "within_budget": bool, "reason": str | None, "summary": str}
+    """
+    if pool is None:
+        from services.tool_creation_service.worker_pool import get_worker_pool
+        pool = get_worker_pool()
+
+    max_seconds = settings.TOOL_BENCH_MAX_SECONDS
+    max_peak = settings.TOOL_BENCH_MAX_PEAK_MB * 1024 * 1024
+    cases = [{"size": size, "args": synthetic_args(proposal.parameters, size)} for size in sorted(settings.TOOL_BENCH_SIZES)]
+
+    results = pool.benchmark(proposal.tool_name, proposal.implementation, cases, settings.TOOL_BENCH_REPEAT, max_seconds)
+    if isinstance(results, str):
+        # Crash, CPU/memory/wall limit or a tool that fails to load
+        report = {"results": [], "exponent": None, "within_budget": False, "reason": results, "error": results}
+        report["summary"] = summarize(report)
+        logger.warning(f"⏱️ Benchmark of {proposal.tool_name} failed: {results}")
+        return report
+
+    reason = None
+    for r in results:
+        if r.get("seconds", 0) > max_seconds:
+            reason = f"{_format_seconds(r['seconds'])} per call at n={r['size']} exceeds the {_format_seconds(max_seconds)} budget"
+            break
+        if r.get("peak_bytes", 0) > max_peak:
+            reason = (f"peak allocation {r['peak_bytes'] / 1024 / 1024:.1f} MiB at n={r['size']} exceeds "
+                      f"the {settings.TOOL_BENCH_MAX_PEAK_MB:.0f} MiB budget")
+            break
+
+    report = {"results": results, "exponent": scaling_exponent(results), "within_budget": reason is None, "reason": reason}
+    report["summary"] = summarize(report)
+    logger.info(f"⏱️ Benchmarked {proposal.tool_name}: exponent {report['exponent']}, within budget: {reason is None}")
+    return report
@@ -0,0 +1,179 @@
+# ----- vetted vectorized primitives for generated numeric tools @ services/tool_creation_service/numeric_helpers.py -----
+#
+# Generated tools receive plain Python lists; looping over them in list comprehensions is
+# orders of magnitude slower than NumPy on long price histories. This module is the one
+# first-party import generated code may use (analyzer.py allows the names in __all__, the generator
+# prompt lists it via describe_helpers()).
+#
+# Every function accepts a list or an array and works along the last axis, so a 2-D input
+# (one series per row) is processed in a single call. Rolling outputs are aligned to the
+# end of the input: rolling_*(values, w) has len(values) - w + 1 entries.
+#
+# Only NumPy is imported here: tool workers preload this file by path without importing
+# the package (see tool_worker.py).
+
+# Private names: generated code may only reach what __all__ exports (see analyzer.py)
+import inspect as _inspect
+
+import numpy as _np
+
+__all__ = [
+    "as_array", "diff", "pct_change", "gains_losses",
+    "rolling_window", "rolling_sum", "rolling_mean", "rolling_std", "rolling_min", "rolling_max",
+    "ema", "rsi", "zscore", "stats",
+]
+
+# Decades of dynamic range one EMA block may span before it is rescaled
+_EMA_BLOCK_DECADES = 150
+
+def as_array(values) -> _np.ndarray:
+    """Float64 array of the values (a list of numbers, or a list of equal-length lists)."""
+    array = _np.asarray(values, dtype=_np.float64)
+    if array.ndim == 0:
+        raise ValueError("expected a sequence of numbers, got a scalar")
+    return array
+
+def _check_window(array: _np.ndarray, window: int):
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    if array.shape[-1] < window:
+        raise ValueError(f"window {window} is longer than the series ({array.shape[-1]} values)")
+
+def diff(values, lag: int = 1) -> _np.ndarray:
+    """values[t] - values[t - lag]; `lag` shorter than the input."""
+    array = as_array(values)
+    return array[..., lag:] - array[..., :-lag]
+
+def pct_change(values, lag: int = 1) -> _np.ndarray:
+    """Relative change over `lag` steps (0.05 = +5%); division by zero gives inf/nan."""
+    array = as_array(values)
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        return (array[..., lag:] - array[..., :-lag]) / array[..., :-lag]
+
+def gains_losses(values):
+    """(gains, losses) of consecutive changes, both non-negative: diff clipped above and below zero."""
+    changes = diff(values)
+    return _np.clip(changes, 0, None), _np.clip(-changes, 0, None)
+
+def rolling_window(values, window: int) -> _np.ndarray:
+    """Read-only view of every `window`-long slice (shape [..., n - window + 1, window]); no copy."""
+    array = as_array(values)
+    _check_window(array, window)
+    return _np.lib.stride_tricks.sliding_window_view(array, window, axis=-1)
+
+def rolling_sum(values, window: int) -> _np.ndarray:
+    """Sum of each `window`-long slice, O(n) via a cumulative sum."""
+    array = as_array(values)
+    _check_window(array, window)
+    padded = _np.concatenate([_np.zeros(array.shape[:-1] + (1,)), _np.cumsum(array, axis=-1)], axis=-1)
+    return padded[..., window:] - padded[..., :-window]
+
+def rolling_mean(values, window: int) -> _np.ndarray:
+    """Simple moving average."""
+    return rolling_sum(values, window) / window
+
+def rolling_std(values, window: int, ddof: int = 0) -> _np.ndarray:
+    """Standard deviation of each `window`-long slice (ddof=1 for the sample deviation)."""
+    return rolling_window(values, window).std(axis=-1, ddof=ddof)
+
+def rolling_min(values, window: int) -> _np.ndarray:
+    """Minimum of each `window`-long slice."""
+    return rolling_window(values, window).min(axis=-1)
+
+def rolling_max(values, window: int) -> _np.ndarray:
+    """Maximum of each `window`-long slice."""
+    return rolling_window(values, window).max(axis=-1)
+
+def ema(values, span: int = None, alpha: float = None) -> _np.ndarray:
+    """
+    Exponential moving average; give `span` (alpha = 2 / (span + 1)) or `alpha` (Wilder: 1 / period).
+
+    y[0] = x[0], y[t] = alpha * x[t] + (1 - alpha) * y[t-1], as pandas ewm(adjust=False).
+
+    Vectorized per block: within a block the recurrence is a scaled cumulative sum, and
+    blocks are kept short enough that the scale factors stay within float range.
+    """
+    if (span is None) == (alpha is None):
+        raise ValueError("give exactly one of span or alpha")
+    if alpha is None:
+        if span < 1:
+            raise ValueError(f"span must be >= 1, got {span}")
+        alpha = 2.0 / (span + 1)
+    if not 0 < alpha <= 1:
+        raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+
+    array = as_array(values)
+    if alpha == 1 or array.shape[-1] == 0:
+        return array.copy()
+
+    decay = 1.0 - alpha
+    block = max(1, min(array.shape[-1], int(_EMA_BLOCK_DECADES * _np.log(10) / -_np.log(decay))))
+    # decay^k for one block, shared by every block
+    powers = decay ** _np.arange(block)
+    out = _np.empty_like(array)
+    previous = array[..., 0]
+    for start in range(0, array.shape[-1], block):
+        chunk = array[..., start:start + block]
+        scale = powers[:chunk.shape[-1]]
+        # y[k] = decay^(k+1) * previous + alpha * decay^k * sum_{i<=k} x[i] / decay^i
+        weighted = _np.cumsum(chunk / scale, axis=-1)
+        out[..., start:start + block] = scale * (decay * previous[..., None] + alpha * weighted)
+        previous = out[..., start + chunk.shape[-1] - 1]
+    return out
+
+def rsi(values, period: int = 14) -> _np.ndarray:
+    """
+    Wilder's Relative Strength Index (0-100); returns len(values) - period values, the last is the current RSI.
+
+    Seeded with the simple average of the first `period` changes. A flat stretch gives 50.
+    """
+    array = as_array(values)
+    if period < 1:
+        raise ValueError(f"period must be >= 1, got {period}")
+    if array.shape[-1] <= period:
+        raise ValueError(f"need more than {period} prices for RSI({period}), got {array.shape[-1]}")
+
+    gains, losses = gains_losses(array)
+    seed_gain = gains[..., :period].mean(axis=-1, keepdims=True)
+    seed_loss = losses[..., :period].mean(axis=-1, keepdims=True)
+    avg_gain = ema(_np.concatenate([seed_gain, gains[..., period:]], axis=-1), alpha=1.0 / period)
+    avg_loss = ema(_np.concatenate([seed_loss, losses[..., period:]], axis=-1), alpha=1.0 / period)
+
+    total = avg_gain + avg_loss
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        result = _np.where(total > 0, 100.0 * avg_gain / total, 50.0)
+    return result
+
+def zscore(values, ddof: int = 0) -> _np.ndarray:
+    """(x - mean) / std along the last axis; a constant series gives zeros."""
+    array = as_array(values)
+    std = array.std(axis=-1, ddof=ddof, keepdims=True)
+    centered = array - array.mean(axis=-1, keepdims=True)
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        return _np.where(std > 0, centered / std, 0.0)
+
+def stats(values) -> dict:
+    """Summary statistics of a 1-D series as plain floats: count, mean, std, min, max, median, p05, p95."""
+    array = as_array(values).ravel()
+    if array.size == 0:
+        raise ValueError("no values")
+    p05, median, p95 = _np.percentile(array, [5, 50, 95])
+    return {
+        "count": int(array.size),
+        "mean": float(array.mean()),
+        "std": float(array.std()),
+        "min": float(array.min()),
+        "max": float(array.max()),
+        "median": float(median),
+        "p05": float(p05),
+        "p95": float(p95),
+    }
+
+def describe_helpers() -> str:
+    """One line per helper (signature and first docstring line), for the generator prompt."""
+    lines = []
+    for name in __all__:
+        func = globals()[name]
+        doc = (_inspect.getdoc(func) or "").split("\n")[0]
+        lines.append(f"- {name}{_inspect.signature(func)}: {doc}" if doc else f"- {name}{_inspect.signature(func)}")
+    return "\n".join(lines)
@@ -0,0 +1,136 @@
+# ----- lazy proxies for generated tools @ services/tool_creation_service/proxy.py -----
+#
+# A proxy is a StructuredTool built only from registry metadata (name, description,
+# parameters), so binding generated tools to the LLM imports nothing. Its args schema is
+# plain JSON schema rather than a pydantic model - building hundreds of models costs
+# milliseconds each - and arguments are validated by the real tool when it runs. The generated
+# module is compiled and executed on first use; compiled code objects are
+# cached by tool hash, so a module evicted after a re-registration or in another
+# registry instance is not compiled twice. Where the call runs is up to the registry:
+# normally a worker process (worker_pool.py), in-process when TOOL_SANDBOX is off.
+# proxy.batch([args, ...]) sends every argument set in one call instead of one per set;
+# with callbacks in the config it takes the standard per-call path, so tracing still sees
+# every call.
+
+import json
+import threading
+import types
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool, StructuredTool
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Parameter types the generator allows (see generator.py) -> JSON schema types
+PARAMETER_TYPES = {
+    "str": "string",
+    "int": "integer",
+    "float": "number",
+    "bool": "boolean",
+    "list": "array",
+    "dict": "object",
+}
+
+_code_cache: Dict[str, types.CodeType] = {}
+_code_lock = threading.Lock()
+
+def compile_tool_source(tool_hash: str, filepath: str) -> types.CodeType:
+    """Compiled code of a generated tool file, compiled once per hash."""
+    with _code_lock:
+        code = _code_cache.get(tool_hash)
+    if code is None:
+        with open(filepath, "r") as f:
+            code = compile(f.read(), filepath, "exec")
+        with _code_lock:
+            _code_cache[tool_hash] = code
+    return code
+
+def import_tool(tool_name: str, tool_hash: str, filepath: str) -> BaseTool:
+    """Executes a generated tool module and returns its @tool object."""
+    module = types.ModuleType(tool_name)
+    module.__file__ = filepath
+    exec(compile_tool_source(tool_hash, filepath), module.__dict__)
+
+    # The generator names the function after the tool; fall back to any BaseTool in the module
+    candidate = module.__dict__.get(tool_name)
+    if isinstance(candidate, BaseTool):
+        return candidate
+    for value in module.__dict__.values():
+        if isinstance(value, BaseTool):
+            return value
+    raise ValueError(f"No tool found in {filepath}")
+
+def build_args_schema(parameters: list) -> Dict[str, Any]:
+    """JSON schema from the registry's [{"name", "type", "description"}] parameter list."""
+    properties = {}
+    for param in parameters:
+        prop = {"description": param.get("description", "")}
+        if param.get("type") in PARAMETER_TYPES:
+            prop["type"] = PARAMETER_TYPES[param["type"]]
+        properties[param["name"]] = prop
+    return {"type": "object", "properties": properties, "required": list(properties)}
+
+class ProxyTool(StructuredTool):
+    """StructuredTool whose batch() hands all argument sets to the registry at once."""
+
+    run_batch: Optional[Callable[[List[dict]], List[Any]]] = None
+
+    def batch(self, inputs: List[dict], config: Optional[RunnableConfig] = None, *,
+              return_exceptions: bool = False, **kwargs) -> List[Any]:
+        """
+        Same results as invoke() per input: plain outputs ("ERROR: ..." for a failing set),
+        a ToolMessage for a ToolCall input. An exception from the batch itself is returned
+        per input with return_exceptions, raised otherwise.
+        """
+        configs = config if isinstance(config, list) else [config]
+        if self.run_batch is None or not inputs or any(c and c.get("callbacks") for c in configs):
+            return super().batch(inputs, config, return_exceptions=return_exceptions, **kwargs)
+
+        # {"name", "args", "id", "type": "tool_call"} -> its args
+        tool_calls = [item if _is_tool_call(item) else None for item in inputs]
+        arg_sets = [dict(call["args"]) if call else dict(item) for call, item in zip(tool_calls, inputs)]
+        try:
+            results = self.run_batch(arg_sets)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            return [e] * len(inputs)
+
+        return [
+            ToolMessage(content=_stringify(result), name=self.name, tool_call_id=call["id"]) if call else result
+            for call, result in zip(tool_calls, results)
+        ]
+
+def _is_tool_call(item: Any) -> bool:
+    return isinstance(item, dict) and item.get("type") == "tool_call"
+
+def _stringify(result: Any) -> str:
+    if isinstance(result, str):
+        return result
+    try:
+        return json.dumps(result, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return str(result)
+
+def make_proxy_tool(entry: Dict[str, Any], run: Callable[[Dict[str, Any], dict], Any],
+                    run_batch: Callable[[Dict[str, Any], List[dict]], List[Any]] = None) -> StructuredTool:
+    """
+    Proxy for a registry entry. Calls are forwarded as `run(entry, args)` and batches as
+    `run_batch(entry, arg_sets)`; the registry decides where the tool actually runs
+    (worker process or in-process).
+    """
+    def _call(**kwargs):
+        return run(entry, kwargs)
+
+    return ProxyTool(
+        func=_call,
+        name=entry["name"],
+        description=entry["description"],
+        args_schema=build_args_schema(entry.get("parameters", [])),
+        metadata={"registry_hash": entry["hash"], "risk_tier": entry["risk_tier"], "version": entry.get("version")},
+        run_batch=(lambda arg_sets: run_batch(entry, arg_sets)) if run_batch else None,
+    )
@@ -4,37 +4,46 @@ import os
 import hashlib
 from typing import List, Dict, Any
 from datetime import datetime
-import json
 from langchain_core.tools import BaseTool
 
+from backend.core.config import settings
 from backend.utils.logger import get_logger
 from services.tool_creation_service.generator import ToolCreationProposal
+from services.tool_creation_service.registry_store import RegistryStore
+from services.tool_creation_service.proxy import import_tool, make_proxy_tool
 
 logger = get_logger(__name__)
 
 TOOLS_DIR = "./services/tool_creation_service/generated_tools"
-REGISTRY_FILE = os.path.join(TOOLS_DIR, "registry.json")
-
-os.makedirs(TOOLS_DIR, exist_ok=True)
+# Legacy JSON registry; imported into the SQLite store once, never written again
+REGISTRY_FILE_NAME = "registry.json"
+REGISTRY_DB_NAME = "registry.sqlite"
+REGISTRY_FILE = os.path.join(TOOLS_DIR, REGISTRY_FILE_NAME)
+REGISTRY_DB = os.path.join(TOOLS_DIR, REGISTRY_DB_NAME)
 
 class DynamicToolRegistry:
     """Manages dynamically created tools"""
     
-    def __init__(self):
-        self.registry = self._load_registry()
+    def __init__(self, tools_dir: str = TOOLS_DIR, sandboxed: bool = None):
+        self.tools_dir = tools_dir
+        self.sandboxed = settings.TOOL_SANDBOX if sandboxed is None else sandboxed
+        os.makedirs(tools_dir, exist_ok=True)
+
+        self.store = RegistryStore(os.path.join(tools_dir, REGISTRY_DB_NAME))
         self.loaded_tools: Dict[str, BaseTool] = {}
+
+        legacy_file = os.path.join(tools_dir, REGISTRY_FILE_NAME)
+        if os.path.exists(legacy_file):
+            self.store.import_json(legacy_file)
     
-    def _load_registry(self) -> Dict[str, Any]:
-        """Load registry from disk"""
-        if os.path.exists(REGISTRY_FILE):
-            with open(REGISTRY_FILE, 'r') as f:
-                return json.load(f)
-        return {"tools": {}}
+    @property
+    def registry(self) -> Dict[str, Any]:
+        """Read-only snapshot in the old registry.json shape: {"tools": {name: info}}"""
+        return {"tools": {entry.pop("name"): entry for entry in self.store.list_current()}}
     
-    def _save_registry(self):
-        """Persist registry to disk"""
-        with open(REGISTRY_FILE, 'w') as f:
-            json.dump(self.registry, f, indent=2)
+    def change_counter(self) -> int:
+        """Changes whenever any process registers a tool"""
+        return self.store.change_counter()
     
     def register_tool(self, proposal: 'ToolCreationProposal', approved_by: str) -> str:
         """
@@ -54,7 +63,7 @@ class DynamicToolRegistry:
         
         # Create tool file
         tool_filename = f"{proposal.tool_name}_{tool_hash}.py"
-        tool_filepath = os.path.join(TOOLS_DIR, tool_filename)
+        tool_filepath = os.path.join(self.tools_dir, tool_filename)
         
         # Write tool implementation to file
         with open(tool_filepath, 'w') as f:
@@ -66,8 +75,8 @@ class DynamicToolRegistry:
 {proposal.implementation}
 """)
         
-        # Update registry
-        self.registry["tools"][proposal.tool_name] = {
+        # Update registry (a new version if the name already exists)
+        version = self.store.register(proposal.tool_name, {
             "hash": tool_hash,
             "filepath": tool_filepath,
             "description": proposal.description,
@@ -76,11 +85,10 @@ class DynamicToolRegistry:
             "created_at": datetime.now().isoformat(),
             "approved_by": approved_by,
             "reasoning": proposal.reasoning
-        }
+        })
+        self.loaded_tools.pop(proposal.tool_name, None)
         
-        self._save_registry()
-        
-        logger.info(f"Registered tool: {proposal.tool_name} (hash: {tool_hash})")
+        logger.info(f"Registered tool: {proposal.tool_name} v{version} (hash: {tool_hash})")
         
         return tool_hash
     
@@ -97,46 +105,65 @@ class DynamicToolRegistry:
         if tool_name in self.loaded_tools:
             return self.loaded_tools[tool_name]
         
-        if tool_name not in self.registry["tools"]:
+        tool_info = self.store.get(tool_name)
+        if tool_info is None:
             raise ValueError(f"Tool '{tool_name}' not found in registry")
         
-        tool_info = self.registry["tools"][tool_name]
-        filepath = tool_info["filepath"]
-        
-        # Dynamic import
-        import importlib.util
-        spec = importlib.util.spec_from_file_location(tool_name, filepath)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        
-        # Find the @tool decorated function
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if isinstance(attr, BaseTool):
-                self.loaded_tools[tool_name] = attr
-                logger.info(f"Loaded tool: {tool_name}")
-                return attr
-        
-        raise ValueError(f"No tool found in {filepath}")
+        # Dynamic import (code objects are cached per tool hash)
+        loaded = import_tool(tool_name, tool_info["hash"], tool_info["filepath"])
+        self.loaded_tools[tool_name] = loaded
+        logger.info(f"Loaded tool: {tool_name}")
+        return loaded
     
     def list_tools(self) -> List[Dict[str, Any]]:
         """Returns all registered tools"""
-        return [
-            {
-                "name": name,
-                **info
-            }
-            for name, info in self.registry["tools"].items()
-        ]
+        return self.store.list_current()
+    
+    def run_tool(self, entry: Dict[str, Any], args: dict) -> Any:
+        """
+        Runs a registered tool: in a worker process with CPU, memory and wall-clock
+        limits, or in this process when sandboxing is off
+        """
+        if self.sandboxed:
+            from services.tool_creation_service.worker_pool import get_worker_pool
+            return get_worker_pool().call(entry, args)
+        return self.load_tool(entry["name"]).invoke(args)
+    
+    def run_batch(self, entry: Dict[str, Any], arg_sets: List[dict]) -> List[Any]:
+        """
+        Runs a registered tool over many argument sets: one worker round trip when
+        sandboxed, a loop in this process otherwise. Failing sets get "ERROR: ..." results
+        """
+        if self.sandboxed:
+            from services.tool_creation_service.worker_pool import get_worker_pool
+            return get_worker_pool().batch(entry, arg_sets)
+        tool = self.load_tool(entry["name"])
+        results = []
+        for args in arg_sets:
+            try:
+                results.append(tool.invoke(args))
+            except Exception as e:
+                results.append(f"ERROR: {type(e).__name__}: {e}")
+        return results
+    
+    def get_tool(self, tool_name: str) -> BaseTool:
+        """Proxy for one registered tool; its code only runs when the proxy is called"""
+        tool_info = self.store.get(tool_name)
+        if tool_info is None:
+            raise ValueError(f"Tool '{tool_name}' not found in registry")
+        return make_proxy_tool(tool_info, self.run_tool, self.run_batch)
     
     def get_all_tools(self) -> List[BaseTool]:
-        """Loads and returns all registered tools"""
+        """
+        Returns all registered tools as proxies built from registry metadata.
+        Nothing is imported until a tool is called, and then only in a worker process.
+        """
         tools = []
-        for tool_name in self.registry["tools"].keys():
+        for entry in self.store.list_current():
             try:
-                tools.append(self.load_tool(tool_name))
+                tools.append(make_proxy_tool(entry, self.run_tool, self.run_batch))
             except Exception as e:
-                logger.error(f"Failed to load tool {tool_name}: {e}")
+                logger.error(f"Failed to build proxy for tool {entry['name']}: {e}")
         return tools
 
 tool_registry = DynamicToolRegistry()
\ No newline at end of file
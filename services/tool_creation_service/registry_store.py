@@ -0,0 +1,142 @@
+# ----- SQLite store behind the dynamic tool registry @ services/tool_creation_service/registry_store.py -----
+#
+# Replaces the rewrite-the-whole-registry.json approach. Every registration is one
+# transaction that appends a new version row for the tool name, moves the "current"
+# flag to it and bumps a change counter. Other processes poll that counter (a single
+# indexed row) to know when their view of the registry is stale.
+
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from backend.utils.logger import get_logger
+from backend.utils.sqlite_pool import close_pool, get_pool
+
+logger = get_logger(__name__)
+
+SCHEMA_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS tools (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        hash TEXT NOT NULL,
+        filepath TEXT NOT NULL,
+        description TEXT NOT NULL,
+        risk_tier TEXT NOT NULL,
+        parameters TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        approved_by TEXT,
+        reasoning TEXT,
+        is_current INTEGER NOT NULL DEFAULT 1,
+        UNIQUE (name, version)
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_tools_current ON tools (name) WHERE is_current = 1",
+    "CREATE INDEX IF NOT EXISTS idx_tools_hash ON tools (hash)",
+    "CREATE INDEX IF NOT EXISTS idx_tools_risk_tier ON tools (risk_tier, is_current)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO meta (key, value) VALUES ('changes', 0)",
+]
+
+ENTRY_FIELDS = ["hash", "filepath", "description", "risk_tier", "parameters", "created_at", "approved_by", "reasoning"]
+
+def _to_entry(row: sqlite3.Row) -> Dict[str, Any]:
+    """Row -> the dict shape registry.json used per tool (plus name and version)."""
+    entry = {field: row[field] for field in ENTRY_FIELDS}
+    entry["parameters"] = json.loads(entry["parameters"])
+    entry["name"] = row["name"]
+    entry["version"] = row["version"]
+    return entry
+
+class RegistryStore:
+    """Versioned tool entries in a SQLite database shared by every process."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.pool = get_pool(db_path)
+        with self.pool.writer() as conn:
+            for statement in SCHEMA_SQL:
+                conn.execute(statement)
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            return cursor.execute(sql, params).fetchall()
+
+    def change_counter(self) -> int:
+        """Bumped by every registration, in any process. Cheap enough to poll per request."""
+        return self._query("SELECT value FROM meta WHERE key = 'changes'")[0]["value"]
+
+    def register(self, name: str, entry: Dict[str, Any], skip_if_present: bool = False) -> Optional[int]:
+        """
+        Adds a new version of `name` and makes it current, atomically. With `skip_if_present`,
+        nothing is added when a version with the same hash exists - checked in the same
+        transaction, so concurrent callers cannot both add it.
+
+        Returns:
+            The new version number (1 for a new tool), or None when skipped
+        """
+        values = dict(entry, parameters=json.dumps(entry.get("parameters", [])))
+        with self.pool.writer() as conn:
+            # IMMEDIATE takes the write lock up front, so concurrent registrations queue on the
+            # busy timeout instead of failing to upgrade a read transaction
+            conn.execute("BEGIN IMMEDIATE")
+            if skip_if_present and conn.execute(
+                    "SELECT 1 FROM tools WHERE name = ? AND hash = ?", (name, entry.get("hash"))).fetchone():
+                return None
+            version = conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM tools WHERE name = ?", (name,)).fetchone()[0]
+            conn.execute("UPDATE tools SET is_current = 0 WHERE name = ? AND is_current = 1", (name,))
+            conn.execute(
+                f"INSERT INTO tools (name, version, {', '.join(ENTRY_FIELDS)}) VALUES (?, ?, {', '.join('?' * len(ENTRY_FIELDS))})",
+                (name, version, *(values.get(field) for field in ENTRY_FIELDS)),
+            )
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'changes'")
+        return version
+
+    def get(self, name: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Current entry for `name`, or a specific version."""
+        if version is None:
+            rows = self._query("SELECT * FROM tools WHERE name = ? AND is_current = 1", (name,))
+        else:
+            rows = self._query("SELECT * FROM tools WHERE name = ? AND version = ?", (name, version))
+        return _to_entry(rows[0]) if rows else None
+
+    def history(self, name: str) -> List[Dict[str, Any]]:
+        """All versions of `name`, oldest first."""
+        return [_to_entry(row) for row in self._query("SELECT * FROM tools WHERE name = ? ORDER BY version", (name,))]
+
+    def find_by_hash(self, tool_hash: str) -> List[Dict[str, Any]]:
+        return [_to_entry(row) for row in self._query("SELECT * FROM tools WHERE hash = ? ORDER BY name, version", (tool_hash,))]
+
+    def list_current(self, risk_tier: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Current version of every tool, optionally only one risk tier."""
+        if risk_tier is None:
+            rows = self._query("SELECT * FROM tools WHERE is_current = 1 ORDER BY name")
+        else:
+            rows = self._query("SELECT * FROM tools WHERE risk_tier = ? AND is_current = 1 ORDER BY name", (risk_tier,))
+        return [_to_entry(row) for row in rows]
+
+    def import_json(self, json_path: str) -> int:
+        """
+        Imports a legacy registry.json. Entries already present (same name and hash) are
+        skipped, so importing the same file again - or from several processes at once - is a no-op.
+
+        Returns:
+            Number of entries imported
+        """
+        with open(json_path, "r") as f:
+            tools = json.load(f).get("tools", {})
+
+        imported = 0
+        for name, info in tools.items():
+            if self.register(name, info, skip_if_present=True) is not None:
+                imported += 1
+
+        if imported:
+            logger.info(f"📥 Imported {imported} tool(s) from {json_path}")
+        return imported
+
+    def close(self):
+        close_pool(self.db_path)
@@ -0,0 +1,237 @@
+# ----- worker process that runs generated tools under resource limits @ services/tool_creation_service/tool_worker.py -----
+#
+# Started by worker_pool.py as `python <this file> <memory_mb>` - run as a script, not as a
+# package module, so the worker does not import the package __init__ (generator, LLM
+# clients, registry). It only needs the standard library and langchain_core.
+#
+# The worker imports langchain_core once, caps its address space, announces itself ready
+# and then serves calls until stdin closes. Each call gets a fresh CPU-time budget
+# (RLIMIT_CPU soft limit); the parent enforces wall-clock time and recycles workers.
+# Besides running registered tools ("call"), a worker runs one tool over many argument
+# sets in one round trip ("batch") and times candidate tools before approval ("benchmark",
+# see microbench.py).
+#
+# numeric_helpers.py (NumPy) is preloaded by file path under its package name, so generated
+# code can `from services.tool_creation_service.numeric_helpers import ...` without the
+# package __init__ being imported.
+#
+# Channel: 4-byte big-endian length + compact JSON, in both directions, on the worker's
+# original stdout/stdin. Anything a tool prints goes to stderr instead.
+
+import json
+import os
+import resource
+import signal
+import struct
+import sys
+import time
+
+HEADER = struct.Struct(">I")
+
+HELPER_MODULE = "services.tool_creation_service.numeric_helpers"
+HELPER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "numeric_helpers.py")
+
+class CpuLimitExceeded(Exception):
+    """Raised in the worker when RLIMIT_CPU's soft limit sends SIGXCPU."""
+
+def read_message(stream):
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    (length,) = HEADER.unpack(header)
+    return json.loads(stream.read(length))
+
+def write_message(stream, message: dict):
+    payload = json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+    stream.write(HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+def _on_sigxcpu(signum, frame):
+    raise CpuLimitExceeded()
+
+def _set_cpu_budget(seconds: float):
+    """Soft CPU limit `seconds` past what this process has used so far (the limit is cumulative)."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(used + seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def _clear_cpu_budget():
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+def load_tool(name: str, filepath: str, source: str = None):
+    """Executes a generated tool file (or its source) and returns its @tool object (same lookup as proxy.import_tool)."""
+    from langchain_core.tools import BaseTool
+
+    if source is None:
+        with open(filepath, "r") as f:
+            source = f.read()
+    code = compile(source, filepath, "exec")
+    namespace = {"__name__": name, "__file__": filepath}
+    exec(code, namespace)
+
+    candidate = namespace.get(name)
+    if isinstance(candidate, BaseTool):
+        return candidate
+    for value in namespace.values():
+        if isinstance(value, BaseTool):
+            return value
+    raise ValueError(f"No tool found in {filepath}")
+
+def preload_helpers():
+    """Imports numeric_helpers (and NumPy) into sys.modules; skipped with a note when NumPy is missing."""
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(HELPER_MODULE, HELPER_FILE)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError as e:
+        print(f"numeric helpers unavailable: {e}", file=sys.stderr)
+        return
+    sys.modules[HELPER_MODULE] = module
+
+def _address_space() -> int:
+    """Current virtual memory size in bytes (Linux), 0 when unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def _registered_tool(request: dict, tools: dict):
+    tool = tools.get(request["hash"])
+    if tool is None:
+        tool = load_tool(request["name"], request["filepath"])
+        tools[request["hash"]] = tool
+    return tool
+
+def run_call(request: dict, tools: dict):
+    return _registered_tool(request, tools).invoke(request["args"])
+
+def run_batch(request: dict, tools: dict) -> list:
+    """One result per argument set; a failing set gets an "ERROR: ..." string instead of failing the batch."""
+    tool = _registered_tool(request, tools)
+    results = []
+    for args in request["arg_sets"]:
+        try:
+            results.append(tool.invoke(args))
+        except Exception as e:
+            results.append(f"ERROR: {type(e).__name__}: {e}")
+    return results
+
+def run_benchmark(request: dict) -> list:
+    """
+    Times a candidate tool on each case, smallest first. Per case: one traced call through
+    the tool (validates the arguments, records peak allocation), then timed calls of the
+    underlying function until `repeat` runs or `max_seconds` of calls, so the fixed cost
+    of tool.invoke does not hide how the tool scales. Cases after one whose best time
+    exceeds `max_seconds` are skipped.
+    """
+    tool = load_tool(request["name"], f"<candidate {request['name']}>", request["source"])
+    func = getattr(tool, "func", None) or (lambda **kwargs: tool.invoke(kwargs))
+    max_seconds = request["max_seconds"]
+
+    # First-call costs (schema building, lazy imports) are not the tool's
+    if request["cases"]:
+        try:
+            tool.invoke(request["cases"][0]["args"])
+        except Exception:
+            pass
+
+    results = []
+    for case in request["cases"]:
+        if results and results[-1].get("seconds", 0) > max_seconds:
+            results.append({"size": case["size"], "skipped": True})
+            continue
+
+        try:
+            results.append(_benchmark_case(tool, func, case, request["repeat"], max_seconds))
+        except (CpuLimitExceeded, MemoryError):
+            # The worker's limits, not the input: the whole benchmark fails and the worker is recycled
+            raise
+        except Exception as e:
+            # An input the tool refuses is unmeasured; the sizes already measured are kept
+            results.append({"size": case["size"], "error": f"{type(e).__name__}: {e}"[:200]})
+    return results
+
+def _benchmark_case(tool, func, case: dict, repeat: int, max_seconds: float) -> dict:
+    """One traced tool.invoke, then timed calls of the function; {"size", "error"} when the tool returns an error."""
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        output = tool.invoke(case["args"])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if isinstance(output, str) and output.startswith("ERROR"):
+        return {"size": case["size"], "error": output[:200]}
+
+    timings = []
+    while len(timings) < repeat and sum(timings) < max_seconds:
+        start = time.perf_counter()
+        func(**case["args"])
+        timings.append(time.perf_counter() - start)
+    return {"size": case["size"], "seconds": min(timings), "runs": len(timings), "peak_bytes": peak}
+
+def handle(request: dict, tools: dict) -> dict:
+    """Runs one request. "recycle" tells the parent the worker's state can no longer be trusted."""
+    try:
+        _set_cpu_budget(request["cpu_seconds"])
+        try:
+            if request.get("op") == "benchmark":
+                result = run_benchmark(request)
+            elif request.get("op") == "batch":
+                result = run_batch(request, tools)
+            else:
+                result = run_call(request, tools)
+        finally:
+            _clear_cpu_budget()
+        return {"ok": True, "result": result}
+    except CpuLimitExceeded:
+        return {"ok": False, "error": f"CPU time limit of {request['cpu_seconds']}s exceeded", "recycle": True}
+    except MemoryError:
+        return {"ok": False, "error": "memory limit exceeded", "recycle": True}
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+def main():
+    memory_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+
+    # The channel keeps the real stdin/stdout; tools read /dev/null and print to stderr
+    channel_in = os.fdopen(os.dup(0), "rb")
+    channel_out = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+    sys.stdin = open(os.devnull, "r")
+    sys.stdout = sys.stderr
+
+    # Warm imports before the memory cap; the cap is headroom on top of the warmed worker
+    import langchain_core.tools  # noqa: F401
+    preload_helpers()
+
+    if memory_mb:
+        limit = _address_space() + memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    signal.signal(signal.SIGXCPU, _on_sigxcpu)
+    # The parent handles Ctrl+C; a worker just finishes its call
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    write_message(channel_out, {"ready": True, "pid": os.getpid()})
+
+    tools = {}
+    while True:
+        request = read_message(channel_in)
+        if request is None:
+            break
+        write_message(channel_out, handle(request, tools))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# ----- warm worker processes for generated tools @ services/tool_creation_service/worker_pool.py -----
+#
+# Generated tools never run in the API process. Calls are handed to a small pool of
+# long-lived worker processes (tool_worker.py) that already have langchain_core imported:
+#   - memory: RLIMIT_AS in the worker, TOOL_WORKER_MEMORY_MB above its warmed footprint
+#   - CPU: RLIMIT_CPU soft limit of TOOL_CPU_SECONDS per call, set by the worker
+#   - wall clock: TOOL_WALL_SECONDS, enforced here; a worker that overruns is killed
+#   - environment: only worker_env() - no API keys or settings from this process - and an
+#     empty temporary directory as cwd and HOME
+# A worker is replaced after TOOL_WORKER_MAX_CALLS calls or after hitting a limit; the
+# replacement is started in the background, so no call waits for a process spawn unless
+# every worker is gone at once. Candidate tools are benchmarked in the same workers
+# before approval (microbench.py).
+
+import atexit
+import os
+import queue
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from backend.core.config import settings
+from backend.utils.logger import get_logger
+from services.tool_creation_service.tool_worker import read_message, write_message
+
+logger = get_logger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_worker.py")
+# Time a fresh worker gets to import langchain_core and report ready
+STARTUP_TIMEOUT = 30.0
+# One thread per BLAS/OpenMP pool: the CPU limit is per process, and workers run side by side
+WORKER_ENV = {"OPENBLAS_NUM_THREADS": "1", "OMP_NUM_THREADS": "1", "MKL_NUM_THREADS": "1"}
+
+def worker_env(workdir: str) -> Dict[str, str]:
+    """The whole environment of a worker: enough to run Python and import its dependencies."""
+    env = {
+        "PATH": os.environ.get("PATH", os.defpath),
+        "LANG": os.environ.get("LANG", "C.UTF-8"),
+        "HOME": workdir,
+        "PYTHONIOENCODING": "utf-8",
+        "PYTHONDONTWRITEBYTECODE": "1",
+        **WORKER_ENV,
+    }
+    # Where langchain_core/NumPy live when they are not in the interpreter's site-packages
+    if os.environ.get("PYTHONPATH"):
+        env["PYTHONPATH"] = os.environ["PYTHONPATH"]
+    return env
+
+class WorkerDied(Exception):
+    """The worker exited or closed its channel mid-call."""
+
+class ToolWorker:
+    """One worker process and its framed JSON channel."""
+
+    def __init__(self, memory_mb: int):
+        # Relative paths in a tool resolve here, not in the API's working directory
+        self.workdir = tempfile.mkdtemp(prefix="tool-worker-")
+        try:
+            self.proc = subprocess.Popen(
+                [sys.executable, WORKER_SCRIPT, str(memory_mb)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                cwd=self.workdir,
+                env=worker_env(self.workdir),
+            )
+        except OSError:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            raise
+        self.calls = 0
+        ready = self._receive(STARTUP_TIMEOUT)
+        if not ready or not ready.get("ready"):
+            self.kill()
+            raise WorkerDied("tool worker did not start")
+
+    def _receive(self, timeout: float) -> Optional[dict]:
+        """Next message, or None when `timeout` passes first."""
+        stdout = self.proc.stdout
+        deadline = time.monotonic() + timeout
+        remaining = timeout
+        # Wait for the length header, then read the (small) body without a timeout
+        while True:
+            readable, _, _ = select.select([stdout], [], [], max(remaining, 0))
+            if readable:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+        message = read_message(stdout)
+        if message is None:
+            raise WorkerDied(f"tool worker {self.proc.pid} exited with code {self.proc.poll()}")
+        return message
+
+    def call(self, request: dict, timeout: float) -> Optional[dict]:
+        """Response to one request, or None on wall-clock timeout."""
+        self.calls += 1
+        try:
+            write_message(self.proc.stdin, request)
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerDied(f"tool worker {self.proc.pid} is gone: {e}")
+        return self._receive(timeout)
+
+    def kill(self):
+        try:
+            self.proc.kill()
+        except OSError:
+            pass
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def close(self):
+        """Graceful stop: closing stdin ends the worker's loop."""
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+            return
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+class WorkerPool:
+    """Fixed-size pool of warm tool workers."""
+
+    def __init__(self, size: int, max_calls: int, cpu_seconds: float, wall_seconds: float, memory_mb: int):
+        self.size = size
+        self.max_calls = max_calls
+        self.cpu_seconds = cpu_seconds
+        self.wall_seconds = wall_seconds
+        self.memory_mb = memory_mb
+        self.idle: "queue.Queue[ToolWorker]" = queue.Queue()
+        self.lock = threading.Lock()
+        self.live = 0
+        self.closed = False
+
+    def _spawn(self):
+        try:
+            worker = ToolWorker(self.memory_mb)
+        except Exception as e:
+            with self.lock:
+                self.live -= 1
+            logger.error(f"Failed to start tool worker: {e}")
+            return
+        if self.closed:
+            worker.close()
+            return
+        self.idle.put(worker)
+
+    def _spawn_async(self):
+        with self.lock:
+            if self.closed or self.live >= self.size:
+                return
+            self.live += 1
+        threading.Thread(target=self._spawn, name="tool-worker-spawn", daemon=True).start()
+
+    def start(self):
+        """Brings the pool up to size in the background."""
+        for _ in range(self.size):
+            self._spawn_async()
+
+    def _retire(self, worker: ToolWorker, reason: str, kill: bool = False):
+        worker.kill() if kill else worker.close()
+        with self.lock:
+            self.live -= 1
+        logger.info(f"♻️ Tool worker {worker.proc.pid} retired ({reason})")
+        self._spawn_async()
+
+    def _submit(self, request: dict, label: str) -> Any:
+        """
+        Runs one request in a worker. Failures (limits, crashes, busy pool) come back
+        as "ERROR: ..." strings, the convention generated tools use themselves.
+        """
+        self.start()
+        try:
+            worker = self.idle.get(timeout=self.wall_seconds)
+        except queue.Empty:
+            return f"ERROR: no tool worker available within {self.wall_seconds:.0f}s; try again"
+
+        request["cpu_seconds"] = self.cpu_seconds
+        try:
+            response = worker.call(request, self.wall_seconds)
+        except WorkerDied as e:
+            self._retire(worker, str(e), kill=True)
+            return f"ERROR: tool {label} crashed its worker process"
+
+        if response is None:
+            self._retire(worker, f"{label} exceeded {self.wall_seconds:.0f}s wall clock", kill=True)
+            return f"ERROR: tool {label} exceeded the {self.wall_seconds:.0f}s time limit and was stopped"
+
+        if response.get("recycle"):
+            self._retire(worker, response.get("error", "limit hit"), kill=True)
+        elif worker.calls >= self.max_calls:
+            self._retire(worker, f"{worker.calls} calls")
+        else:
+            self.idle.put(worker)
+
+        if response.get("ok"):
+            return response["result"]
+        return f"ERROR: {response.get('error')}"
+
+    def call(self, entry: Dict[str, Any], args: dict) -> Any:
+        """Runs a registered tool in a worker."""
+        return self._submit({
+            "name": entry["name"],
+            "hash": entry["hash"],
+            "filepath": os.path.abspath(entry["filepath"]),
+            "args": args,
+        }, entry["name"])
+
+    def batch(self, entry: Dict[str, Any], arg_sets: List[dict]) -> List[Any]:
+        """
+        Runs a registered tool over many argument sets in one worker round trip, under one
+        call's CPU and wall-clock limits. A failure of the whole request is repeated per set.
+        """
+        results = self._submit({
+            "op": "batch",
+            "name": entry["name"],
+            "hash": entry["hash"],
+            "filepath": os.path.abspath(entry["filepath"]),
+            "arg_sets": arg_sets,
+        }, entry["name"])
+        if isinstance(results, str):
+            return [results] * len(arg_sets)
+        return results
+
+    def benchmark(self, name: str, source: str, cases: List[dict], repeat: int, max_seconds: float) -> Any:
+        """Timings of a candidate tool's source on each case (see tool_worker.run_benchmark), or "ERROR: ..."."""
+        return self._submit({
+            "op": "benchmark",
+            "name": name,
+            "source": source,
+            "cases": cases,
+            "repeat": repeat,
+            "max_seconds": max_seconds,
+        }, name)
+
+    def shutdown(self):
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+_pool: Optional[WorkerPool] = None
+_pool_lock = threading.Lock()
+
+def get_worker_pool() -> WorkerPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(
+                size=settings.TOOL_WORKERS,
+                max_calls=settings.TOOL_WORKER_MAX_CALLS,
+                cpu_seconds=settings.TOOL_CPU_SECONDS,
+                wall_seconds=settings.TOOL_WALL_SECONDS,
+                memory_mb=settings.TOOL_WORKER_MEMORY_MB,
+            )
+            atexit.register(_pool.shutdown)
+        return _pool
+
+def warm_worker_pool():
+    """Startup warm-up: workers import langchain_core while the API finishes booting."""
+    get_worker_pool().start()
+    logger.info(f"🔥 Tool worker pool starting ({settings.TOOL_WORKERS} workers)")
@@ -0,0 +1,8 @@
+# ----- pytest setup @ tests/conftest.py -----
+
+import os
+import sys
+
+# Settings require a key at import time; tests never call the model
+os.environ.setdefault("GEMINI_API_KEY", "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
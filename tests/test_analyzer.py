@@ -0,0 +1,166 @@
+# ----- static analysis of generated tools @ tests/test_analyzer.py -----
+
+import textwrap
+
+import pytest
+
+from services.tool_creation_service.analyzer import analyze, verdict
+
+def tool(body: str, imports: str = "import os\nimport sys\nimport numpy as np") -> str:
+    """A minimal @tool whose body is `body`."""
+    return f"{imports}\nfrom langchain_core.tools import tool\n\n@tool\ndef probe(x: str) -> str:\n    \"\"\"Probe.\"\"\"\n" \
+        + textwrap.indent(textwrap.dedent(body).strip(), "    ") + "\n    return 'ok'\n"
+
+def check(code: str, risk_tier: str = "SAFE") -> dict:
+    return verdict(analyze(code), risk_tier)
+
+@pytest.mark.parametrize("body", [
+    "m = os\nm.system(x)",
+    "a, b = os, sys\na.system(x)",
+    "m: object = os\nm.system(x)",
+    "for m in [os]:\n    m.system(x)",
+    "for m in (os,):\n    m.popen(x)",
+    "[m.system(x) for m in [os]]",
+    "(m := os).system(x)",
+    "if (m := os):\n    m.system(x)",
+    "sys.modules['os'].system(x)",
+    "vars(os)['system'](x)",
+    "print.__self__.eval(x)",
+    "getattr(print, '__self__').exec(x)",
+    "len.__self__.__import__('os').system(x)",
+    "sys._getframe().f_globals['os'].system(x)",
+    "f = eval\nf(x)",
+    "[eval][0](x)",
+    "holder = [os]\nholder[0].system(x)",
+    "run = getattr(os, 'system')\nrun(x)",
+    "for m in [np, os]:\n    m.load(x)",
+])
+def test_escape_paths_are_rejected(body):
+    result = check(tool(body))
+    assert not result["safe"], result
+
+@pytest.mark.parametrize("body", [
+    "m = np\nm.load(x)",
+    "for loader in [np.load]:\n    loader(x)",
+    "with open(x) as f:\n    f.read()",
+])
+def test_aliased_file_access_needs_critical(body):
+    assert not check(tool(body))["safe"]
+    assert check(tool(body), "CRITICAL")["safe"]
+
+@pytest.mark.parametrize("body", [
+    "values = np.asarray([1.0, 2.0])\ntotal = values.sum()",
+    "xp = np\ntotal = xp.mean(xp.asarray([1.0, 2.0]))",
+    "for f in [min, max]:\n    f([1, 2])",
+    "parts = [p.strip() for p in x.split(',')]",
+    "m = os.path\nname = m.basename(x)",
+])
+def test_plain_numeric_code_passes(body):
+    result = check(tool(body))
+    assert result["safe"], result
+
+def test_walrus_inside_a_call_chain_binds_the_alias():
+    result = check(tool("(m := os).system(x)\nm.popen(x)"))
+    assert "os.popen" in result["analysis"]["capabilities"]["process"]
+
+HELPERS = "from services.tool_creation_service import numeric_helpers as nh"
+
+@pytest.mark.parametrize("body", [
+    "nh._inspect.os.system(x)",
+    "nh._np.load(x)",
+    "nh.inspect.os.system(x)",
+    "nh.np.load(x)",
+    "nh.rsi.__globals__['_np'].load(x)",
+])
+def test_helper_internals_are_not_trusted(body):
+    result = check(tool(body, imports=HELPERS))
+    assert not result["safe"], result
+
+def test_helper_exports_are_trusted():
+    code = tool("series = nh.rolling_mean([1.0, 2.0, 3.0], 2)\nlast = nh.rsi(list(range(30)))[-1]", imports=HELPERS)
+    assert check(code)["safe"]
+    code = tool("series = rolling_mean([1.0, 2.0, 3.0], 2)",
+                imports="from services.tool_creation_service.numeric_helpers import rolling_mean")
+    assert check(code)["safe"]
+
+@pytest.mark.parametrize("imports, body", [
+    ("import posix", "posix.system(x)"),
+    ("import asyncio", "asyncio.create_subprocess_shell(x)"),
+    ("import asyncio", "asyncio.create_subprocess_exec(x)"),
+    ("import concurrent.futures", "concurrent.futures.ProcessPoolExecutor()"),
+    ("from concurrent.futures import ProcessPoolExecutor", "ProcessPoolExecutor()"),
+    ("import _posixsubprocess", "_posixsubprocess.fork_exec"),
+    ("import webbrowser", "webbrowser.open(x)"),
+    ("import codecs", "codecs.open(x).read()"),
+    ("import io", "io.FileIO(x).read()"),
+    ("import linecache", "linecache.getlines(x)"),
+    ("import gzip", "gzip.open(x).read()"),
+    ("import bz2", "bz2.open(x).read()"),
+    ("import lzma", "lzma.open(x).read()"),
+    ("import zipfile", "zipfile.ZipFile(x).extractall()"),
+    ("import tarfile", "tarfile.open(x).extractall()"),
+    ("import logging", "logging.FileHandler(x)"),
+    ("import os", "key = os.environ['GEMINI_API_KEY']"),
+    ("import os", "key = os.getenv('GEMINI_API_KEY')"),
+    ("from os import environ", "key = environ.get('GEMINI_API_KEY')"),
+])
+def test_known_bypasses_are_not_safe(imports, body):
+    result = check(tool(body, imports=imports))
+    assert not result["safe"], result
+
+@pytest.mark.parametrize("imports, body", [
+    ("import csv", "rows = list(csv.reader(x.splitlines()))"),
+    ("import platform", "name = platform.node()"),
+    ("import os", "cwd = os.getcwd()"),
+    ("from numpy import *", "data = load(x)"),
+    ("import operator", "operator.attrgetter('__globals__')"),
+    ("", "'{0.__init__.__globals__}'.format(x)"),
+])
+def test_unvetted_modules_need_critical(imports, body):
+    assert not check(tool(body, imports=imports))["safe"]
+
+@pytest.mark.parametrize("imports, body", [
+    ("import math\nimport statistics", "value = math.sqrt(statistics.mean([1.0, 4.0]))"),
+    ("from collections import deque", "window = deque(maxlen=3)"),
+    ("import json", "data = json.loads(x)"),
+    ("from math import *", "value = sqrt(4.0)"),
+])
+def test_pure_modules_pass(imports, body):
+    result = check(tool(body, imports=imports))
+    assert result["safe"], result
+
+@pytest.mark.parametrize("body", [
+    "np.lib.format.open_memmap(x, mode='w+')",
+    "np.fromregex(x, r'(\\d+)', [('n', np.int64)])",
+    "np.rec.fromfile(x)",
+    "np.core.records.fromfile(x)",
+    "np.core.memmap(x)",
+    "np.core.multiarray.fromfile(x)",
+    "np.load(x)",
+    "np.lib.npyio.loadtxt(x)",
+])
+def test_numpy_file_access_needs_critical(body):
+    assert not check(tool(body, imports="import numpy as np"))["safe"]
+
+@pytest.mark.parametrize("body", [
+    "np.testing.assert_equal(1, 1)",
+    "np.set_printoptions(threshold=5)",
+    "np.frompyfunc(len, 1, 1)",
+    "from numpy.core import umath",
+])
+def test_numpy_outside_the_pure_list_is_unvetted(body):
+    result = check(tool(body, imports="import numpy as np"))
+    assert "unvetted" in result["analysis"]["capabilities"], result
+
+def test_helper_internals_are_forbidden_even_for_critical_tools():
+    code = tool("nh._inspect.os.system(x)", imports=HELPERS)
+    assert not check(code, "CRITICAL")["safe"]
+
+def test_pure_numpy_passes():
+    code = tool("a = np.asarray([1.0, 2.0, 3.0])\n"
+                "b = np.lib.stride_tricks.sliding_window_view(a, 2).mean(axis=-1)\n"
+                "c = np.where(np.isnan(a), 0.0, np.clip(a, 0, None)).astype(np.float64)\n"
+                "d = np.linalg.norm(a) + np.percentile(a, 95) + np.random.default_rng(0).normal()",
+                imports="import numpy as np")
+    result = check(code)
+    assert result["safe"], result
@@ -0,0 +1,51 @@
+# ----- duplicate tool lookup @ tests/test_dedup.py -----
+
+import pytest
+
+from services.tool_creation_service.dedup import ToolMatcher
+
+ENTRIES = [
+    {
+        "name": "compute_rsi",
+        "description": "Calculates Relative Strength Index (RSI) of an asset's price movement",
+        "parameters": [
+            {"name": "prices", "type": "list", "description": "List of historical prices"},
+            {"name": "period", "type": "int", "description": "Time period for RSI calculation"},
+        ],
+    },
+    {
+        "name": "moving_average",
+        "description": "Simple moving average of prices over a window",
+        "parameters": [
+            {"name": "prices", "type": "list", "description": "List of prices"},
+            {"name": "window", "type": "int", "description": "Window length"},
+        ],
+    },
+]
+
+@pytest.fixture(scope="module")
+def matcher():
+    return ToolMatcher(ENTRIES)
+
+@pytest.mark.parametrize("request_text, expected", [
+    ("compute RSI", "compute_rsi"),
+    ("relative strength index of these prices", "compute_rsi"),
+    ("Calculate the RSI of an asset", "compute_rsi"),
+    ("compute moving average", "moving_average"),
+    ("simple moving average of prices", "moving_average"),
+])
+def test_paraphrases_reuse_the_tool(matcher, request_text, expected):
+    match = matcher.match(request_text, 0.75)
+    assert match is not None and match["name"] == expected
+
+@pytest.mark.parametrize("request_text", [
+    "compute RSS",
+    "compute SR",
+    "compute price",
+    "compute period returns of prices",
+    "strength of asset",
+    "exponential moving average",
+    "average true range",
+])
+def test_different_capabilities_are_not_reused(matcher, request_text):
+    assert matcher.match(request_text, 0.75) is None
@@ -0,0 +1,121 @@
+# ----- sandbox file tools @ tests/test_file_tools.py -----
+
+import json
+import re
+from unittest import mock
+
+import pytest
+
+from services.ai_service.ai_tools import manager
+
+CONFIG = {"configurable": {"thread_id": "test"}}
+
+@pytest.fixture
+def sandbox(tmp_path):
+    with mock.patch.object(manager, "resolve_sandbox", return_value=str(tmp_path)):
+        yield tmp_path
+
+def call(tool, **args):
+    return tool.invoke(args, config=CONFIG)
+
+def sha_of(output: str, path: str) -> str:
+    return re.search(rf"--- {re.escape(path)} \([^)]*sha256 (\w+)\)", output).group(1)
+
+# --- read_many_files ---
+
+def test_single_long_line_is_cut_not_skipped(sandbox):
+    (sandbox / "small.py").write_text("x = 1\n")
+    (sandbox / "data.json").write_text(json.dumps(list(range(20000))))
+
+    output = call(manager.read_many_files, paths=["small.py", "data.json"], max_total_bytes=2000)
+    assert "skipped" not in output
+    assert "(+" in output and "characters)" in output
+    assert sha_of(output, "data.json") == manager._file_hash(str(sandbox / "data.json"))
+
+def test_file_is_skipped_only_when_the_budget_is_spent(sandbox):
+    (sandbox / "a.txt").write_text("a" * 990 + "\n")
+    (sandbox / "b.txt").write_text("b" * 500 + "\n")
+
+    output = call(manager.read_many_files, paths=["a.txt", "b.txt"], max_total_bytes=1000)
+    assert "--- b.txt" in output and "skipped: size budget used up" in output
+    # The hash is still given, so the file can be edited without another read
+    assert sha_of(output, "b.txt") == manager._file_hash(str(sandbox / "b.txt"))
+
+def test_empty_file_is_not_skipped(sandbox):
+    (sandbox / "empty.py").write_text("")
+    output = call(manager.read_many_files, paths=["empty.py"])
+    assert "skipped" not in output and "sha256" in output
+
+# --- apply_patch ---
+
+MODULE = "".join(f"line {n}\n" for n in range(1, 21))
+
+def patch(old, new, *hunks):
+    return "\n".join([f"--- {old}", f"+++ {new}", *hunks]) + "\n"
+
+def test_hunks_apply_in_order(sandbox):
+    (sandbox / "m.py").write_text(MODULE)
+    output = call(manager.apply_patch, patch=patch(
+        "a/m.py", "b/m.py",
+        "@@ -2,3 +2,3 @@", " line 2", "-line 3", "+line three", " line 4",
+        "@@ -15,3 +15,4 @@", " line 15", " line 16", "+line 16.5", " line 17",
+    ))
+    assert "patched m.py (+1 lines" in output
+    expected = MODULE.replace("line 3\n", "line three\n").replace("line 16\n", "line 16\nline 16.5\n")
+    assert (sandbox / "m.py").read_text() == expected
+
+def test_hunk_found_at_an_offset(sandbox):
+    (sandbox / "m.py").write_text("# header\n" * 7 + MODULE)
+    output = call(manager.apply_patch, patch=patch("m.py", "m.py", "@@ -9,2 +9,2 @@", " line 9", "-line 10", "+line ten"))
+    assert "patched m.py" in output
+    assert "line ten\nline 11\n" in (sandbox / "m.py").read_text()
+
+def test_context_must_match_exactly(sandbox):
+    (sandbox / "m.py").write_text(MODULE)
+    output = call(manager.apply_patch, patch=patch("m.py", "m.py", "@@ -9,2 +9,2 @@", " line  9", "-line 10", "+line ten"))
+    assert "CONFLICT" in output and "context not found" in output
+    assert (sandbox / "m.py").read_text() == MODULE
+
+def test_one_failing_file_leaves_every_file_untouched(sandbox):
+    (sandbox / "a.py").write_text(MODULE)
+    (sandbox / "b.py").write_text(MODULE)
+    output = call(manager.apply_patch, patch=(
+        patch("a.py", "a.py", "@@ -1,1 +1,1 @@", "-line 1", "+line one")
+        + patch("b.py", "b.py", "@@ -1,1 +1,1 @@", "-nope", "+line one")
+    ))
+    assert "CONFLICT" in output and "b.py" in output
+    assert (sandbox / "a.py").read_text() == MODULE
+
+def test_base_hash_mismatch_is_refused(sandbox):
+    (sandbox / "m.py").write_text(MODULE)
+    current = manager.content_hash(MODULE)
+    diff = patch("m.py", "m.py", "@@ -1,1 +1,1 @@", "-line 1", "+line one")
+
+    output = call(manager.apply_patch, patch=diff, base_hashes={"m.py": "0" * len(current)})
+    assert "file changed since it was read" in output
+    assert (sandbox / "m.py").read_text() == MODULE
+
+    output = call(manager.apply_patch, patch=diff, base_hashes={"m.py": current})
+    assert "patched m.py" in output
+
+def test_patching_an_empty_file_is_not_a_creation(sandbox):
+    (sandbox / "empty.py").write_text("")
+    output = call(manager.apply_patch, patch=patch("empty.py", "empty.py", "@@ -0,0 +1,1 @@", "+x = 1"))
+    assert "patched empty.py" in output and "created" not in output
+
+def test_creation_comes_from_dev_null(sandbox):
+    output = call(manager.apply_patch, patch=patch("/dev/null", "b/new.py", "@@ -0,0 +1,2 @@", "+a = 1", "+b = 2"))
+    assert "created new.py" in output
+    assert (sandbox / "new.py").read_text() == "a = 1\nb = 2\n"
+
+def test_delete_removes_the_whole_file(sandbox):
+    (sandbox / "old.py").write_text("a = 1\nb = 2\n")
+    output = call(manager.apply_patch, patch=patch("a/old.py", "/dev/null", "@@ -1,2 +0,0 @@", "-a = 1", "-b = 2"))
+    assert "deleted old.py" in output
+    assert not (sandbox / "old.py").exists()
+
+def test_delete_that_leaves_content_is_refused(sandbox):
+    (sandbox / "old.py").write_text("a = 1\nb = 2\nc = 3\n")
+    output = call(manager.apply_patch, patch=patch("a/old.py", "/dev/null", "@@ -1,2 +0,0 @@", "-a = 1", "-b = 2"))
+    assert "CONFLICT" in output and "do not remove all of its content" in output
+    assert (sandbox / "old.py").read_text() == "a = 1\nb = 2\nc = 3\n"
@@ -0,0 +1,51 @@
+# ----- batched calls through tool proxies @ tests/test_proxy.py -----
+
+import pytest
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import ToolMessage
+
+from services.tool_creation_service.proxy import make_proxy_tool
+
+ENTRY = {"name": "increment", "description": "Adds one", "hash": "0" * 16, "risk_tier": "SAFE",
+         "parameters": [{"name": "a", "type": "int", "description": "Number"}]}
+
+def proxy(run_batch, calls):
+    def run(entry, args):
+        calls.append(("run", args))
+        return args["a"] + 1
+    return make_proxy_tool(ENTRY, run, run_batch)
+
+def test_batch_sends_all_sets_at_once_and_unwraps_tool_calls():
+    calls = []
+    def run_batch(entry, arg_sets):
+        calls.append(("batch", arg_sets))
+        return [args["a"] + 1 for args in arg_sets]
+
+    results = proxy(run_batch, calls).batch([
+        {"a": 1},
+        {"name": "increment", "args": {"a": 2}, "id": "call-1", "type": "tool_call"},
+    ])
+    assert calls == [("batch", [{"a": 1}, {"a": 2}])]
+    assert results[0] == 2
+    assert isinstance(results[1], ToolMessage) and results[1].content == "3" and results[1].tool_call_id == "call-1"
+
+def test_batch_with_callbacks_runs_each_call():
+    calls = []
+    class Recorder(BaseCallbackHandler):
+        def on_tool_start(self, *args, **kwargs):
+            calls.append("start")
+
+    results = proxy(lambda entry, arg_sets: pytest.fail("batched despite callbacks"), calls) \
+        .batch([{"a": 1}, {"a": 5}], config={"callbacks": [Recorder()]})
+    assert results == [2, 6]
+    assert calls.count("start") == 2
+
+def test_batch_failure_honours_return_exceptions():
+    def run_batch(entry, arg_sets):
+        raise RuntimeError("pool down")
+
+    tool = proxy(run_batch, [])
+    results = tool.batch([{"a": 1}, {"a": 2}], return_exceptions=True)
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    with pytest.raises(RuntimeError):
+        tool.batch([{"a": 1}])
@@ -0,0 +1,42 @@
+# ----- versioned tool registry in SQLite @ tests/test_registry_store.py -----
+
+import json
+import multiprocessing
+
+from services.tool_creation_service.registry_store import RegistryStore
+
+def _entry(tool_hash: str) -> dict:
+    return {"hash": tool_hash, "filepath": f"./{tool_hash}.py", "description": "d", "risk_tier": "SAFE",
+            "parameters": [], "created_at": "2026-01-01T00:00:00", "approved_by": "test", "reasoning": "r"}
+
+def _import(db_path: str, json_path: str, start) -> int:
+    start.wait()
+    return RegistryStore(db_path).import_json(json_path)
+
+def test_import_is_idempotent(tmp_path):
+    json_path = tmp_path / "registry.json"
+    json_path.write_text(json.dumps({"tools": {"a": _entry("1" * 16), "b": _entry("2" * 16)}}))
+    store = RegistryStore(str(tmp_path / "registry.sqlite"))
+
+    assert store.import_json(str(json_path)) == 2
+    assert store.import_json(str(json_path)) == 0
+    assert [len(store.history(name)) for name in ("a", "b")] == [1, 1]
+
+def test_concurrent_imports_add_each_entry_once(tmp_path):
+    tools = {f"tool_{i}": _entry(f"{i:016x}") for i in range(200)}
+    json_path = tmp_path / "registry.json"
+    json_path.write_text(json.dumps({"tools": tools}))
+    db_path = str(tmp_path / "registry.sqlite")
+    RegistryStore(db_path).close()
+
+    context = multiprocessing.get_context("spawn")
+    start = context.Manager().Event()
+    with context.Pool(8) as pool:
+        pending = [pool.apply_async(_import, (db_path, str(json_path), start)) for _ in range(8)]
+        start.set()
+        counts = [result.get(timeout=60) for result in pending]
+
+    assert sum(counts) == len(tools)
+    store = RegistryStore(db_path)
+    assert all(len(store.history(name)) == 1 for name in tools)
+    assert store.change_counter() == len(tools)
@@ -0,0 +1,118 @@
+# ----- trigram-indexed search @ tests/test_search_index.py -----
+
+import re
+
+import pytest
+
+from services.ai_service.ai_tools.search_index import TrigramIndex, _required_literals
+
+CORPUS = {
+    "colors.py": "color = 'red'\ncolour = 'blue'\nCOLOR = None\n",
+    "defs.py": "def foo():\n    pass\n\ndef  foo_bar(x):\n    return x\nasync def bar():\n    ...\n",
+    "nums.txt": "abc\nabcd\nabcdd\nabx\nAbcd\nABCD\n",
+    "escapes.txt": "a.bcd\naxbcd\nf(x)[0]\nprice: $100\nback\\slash\nbrace {x}\n",
+    "words.md": "cat\ncot\ncut\ncart\ncaat\nfoobar\nfoo bar\nbarfoo\n",
+    "empty.txt": "",
+}
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    root = tmp_path_factory.mktemp("corpus")
+    for name, text in CORPUS.items():
+        (root / name).write_text(text)
+    return TrigramIndex(str(root))
+
+def brute_force(pattern):
+    compiled = re.compile(pattern, re.MULTILINE)
+    found = {}
+    for name, text in CORPUS.items():
+        lines = sorted({text.count("\n", 0, m.start()) + 1 for m in compiled.finditer(text)})
+        if lines:
+            found[name] = lines
+    return found
+
+def indexed(index, pattern):
+    result = index.search(pattern, regex=True, max_files=len(CORPUS))
+    return {f["path"]: f["lines"] for f in result["files"]}
+
+def assert_same_as_re(index, pattern):
+    assert indexed(index, pattern) == brute_force(pattern), pattern
+    # Every match contains every required literal, so no matching file can be pruned
+    for literal in _required_literals(pattern):
+        for match in re.finditer(pattern, "\n".join(CORPUS.values()), re.MULTILINE):
+            assert literal in match.group(0), (pattern, literal, match.group(0))
+
+@pytest.mark.parametrize("pattern", [
+    "colou?r|COLOR",
+    "abc|xyz",
+    "def (foo|bar)",
+    "(foo|bar)bar",
+    "c(a|o|u)t",
+    "foo(?:bar| bar)",
+])
+def test_alternation(index, pattern):
+    assert_same_as_re(index, pattern)
+
+@pytest.mark.parametrize("pattern", [
+    "c[aou]t",
+    "[^a]bcd",
+    "ab[]c]d",
+    "a[.]bcd",
+    r"f\(x\)[\[\]0]+",
+    "[A-Z]BCD",
+])
+def test_character_classes(index, pattern):
+    assert_same_as_re(index, pattern)
+
+@pytest.mark.parametrize("pattern", [
+    "colou?r",
+    "abcd?",
+    "abcd*",
+    "abcd+",
+    "abcd{0,2}$",
+    "abcd{,2}$",
+    "abcd{00,2}$",
+    "abcd{2}",
+    "ca{1,2}t",
+    "ca{0}rt",
+    "def {1,2}foo",
+    "(async )?def bar",
+    "foo(bar)?",
+    "colou??r",
+])
+def test_optional_and_repeated(index, pattern):
+    assert_same_as_re(index, pattern)
+
+@pytest.mark.parametrize("pattern", [
+    r"a\.bcd",
+    r"\$100",
+    r"back\\slash",
+    r"brace \{x\}",
+    r"brace {x}",
+    r"\x41bcd",
+    r"Abcd",
+    r"\101bcd",
+    r"\N{LATIN CAPITAL LETTER A}bcd",
+    r"(abc)\1d",
+    r"def\s+foo",
+    r"\bcat\b",
+    r"\w+bar",
+])
+def test_escapes(index, pattern):
+    assert_same_as_re(index, pattern)
+
+@pytest.mark.parametrize("pattern", [
+    "(?i)color",
+    "(?i)abcd",
+    "(?i:ABC)d",
+    "a(?i:BC)d",
+    "(?-i:abc)d",
+    "(?x) a b c d",
+    "(?s)foo.bar",
+])
+def test_inline_flags(index, pattern):
+    assert_same_as_re(index, pattern)
+
+def test_literals_prune_candidates(index):
+    assert _required_literals(r"def\s+foo") == ["def", "foo"]
+    assert index.search(r"def\s+foo", regex=True)["scanned"] == 1
@@ -0,0 +1,64 @@
+# ----- per-session sandbox clones @ tests/test_sessions.py -----
+
+import os
+import shutil
+import time
+
+import pytest
+
+from backend.utils.setup_sandbox import build_template
+from services.ai_service.ai_tools import sessions
+
+@pytest.fixture
+def sessions_root(monkeypatch):
+    # Next to the template, so hardlinks would be possible (a tmp dir may be another filesystem)
+    root = os.path.join(os.path.dirname(os.path.abspath(build_template())), f"test-sessions-{os.getpid()}")
+    monkeypatch.setattr(sessions, "SESSIONS_ROOT", root)
+    monkeypatch.setattr(sessions, "_last_used", {})
+    yield root
+    shutil.rmtree(root, ignore_errors=True)
+
+def _working_file(root: str) -> str:
+    """Some source file of the sandbox (not under .git, not the database)."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        for name in filenames:
+            if name.endswith((".py", ".md")):
+                return os.path.relpath(os.path.join(dirpath, name), root)
+    raise AssertionError("template has no source files")
+
+def test_in_place_write_stays_in_its_session(sessions_root):
+    template = build_template()
+    first = sessions.get_session_root("first")
+    second = sessions.get_session_root("second")
+    rel_path = _working_file(first)
+    with open(os.path.join(template, rel_path), "rb") as f:
+        original = f.read()
+
+    with open(os.path.join(first, rel_path), "ab") as f:
+        f.write(b"\nappended in place\n")
+
+    for root in (template, second):
+        with open(os.path.join(root, rel_path), "rb") as f:
+            assert f.read() == original
+
+def test_idle_collection_ages_sessions_by_their_marker(sessions_root):
+    root = sessions.get_session_root("busy")
+    # Another process used the session recently; this one never did
+    sessions._last_used.clear()
+    old = time.time() - 3600
+    os.utime(root, (old, old))
+    assert sessions.collect_idle_sessions(max_idle=60) == []
+    assert os.path.isdir(root)
+
+    marker = os.path.join(sessions.SESSIONS_ROOT, "busy" + sessions.MARKER_SUFFIX)
+    os.utime(marker, (old, old))
+    assert sessions.collect_idle_sessions(max_idle=60) == ["busy"]
+    assert not os.path.exists(root) and not os.path.exists(marker)
+
+def test_session_collected_elsewhere_is_recreated(sessions_root):
+    root = sessions.get_session_root("again")
+    # Removed by another process's collector; this process still remembers it
+    shutil.rmtree(root)
+    assert sessions.get_session_root("again") == root
+    assert os.path.isdir(root)
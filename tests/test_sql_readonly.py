@@ -0,0 +1,89 @@
+# ----- read-only SQL classification and routing @ tests/test_sql_readonly.py -----
+
+import sqlite3
+from unittest import mock
+
+import pytest
+
+from backend.utils.sqlite_pool import close_pool
+from services.ai_service.ai_tools import db_setup
+from services.ai_service.ai_tools.sql_readonly import check_read_only, run_read_only
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "task_tracker.db")
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT)")
+    conn.execute("INSERT INTO tasks (title) VALUES ('first')")
+    conn.commit()
+    conn.close()
+    yield path
+    close_pool(path)
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM tasks",
+    "SELECT count(*) FROM tasks WHERE title LIKE 'f%'",
+    "WITH recent AS (SELECT * FROM tasks) SELECT title FROM recent",
+    "PRAGMA table_info(tasks)",
+])
+def test_reads_are_read_only(db_path, query):
+    assert check_read_only(db_path, query) == (True, "")
+
+@pytest.mark.parametrize("query", [
+    "ATTACH DATABASE ':memory:' AS other",
+    "PRAGMA writable_schema = ON",
+    "PRAGMA writable_schema",
+    "WITH doomed AS (SELECT id FROM tasks) INSERT INTO tasks (title) SELECT 'x' FROM doomed",
+    "WITH doomed AS (SELECT id FROM tasks) DELETE FROM tasks WHERE id IN (SELECT id FROM doomed)",
+    "CREATE TEMP TABLE scratch (x)",
+    "CREATE TEMP VIEW scratch AS SELECT 1",
+    "VACUUM INTO '/tmp/copy.db'",
+    "SELECT load_extension('/tmp/evil.so')",
+    "SELECT * FROM tasks; DELETE FROM tasks",
+    "UPDATE tasks SET title = 'x'",
+    "BEGIN",
+    "SELEC * FROM tasks",
+    "SELECT * FROM no_such_table",
+    "",
+])
+def test_everything_else_is_not_read_only(db_path, query):
+    read_only, reason = check_read_only(db_path, query)
+    assert not read_only and reason
+
+CONFIG = {"configurable": {"thread_id": "test"}}
+
+def _sql(db_path, query, node=None):
+    config = dict(CONFIG, metadata={"langgraph_node": node} if node else {})
+    with mock.patch.object(db_setup, "session_db_path", return_value=db_path):
+        return db_setup.sql_db_query.invoke({"query": query}, config=config)
+
+def test_select_stays_on_the_read_only_connection(db_path):
+    with mock.patch.object(db_setup, "_run_write", side_effect=AssertionError("routed to the writer")):
+        assert "first" in _sql(db_path, "SELECT title FROM tasks", node="safe_tools")
+
+@pytest.mark.parametrize("query", [
+    "INSERT INTO tasks (title) VALUES ('second')",
+    "WITH doomed AS (SELECT id FROM tasks) INSERT INTO tasks (title) SELECT 'x' FROM doomed",
+    "CREATE TEMP TABLE scratch (x)",
+])
+def test_writes_are_refused_outside_the_approval_flow(db_path, query):
+    with mock.patch.object(db_setup, "_run_write", side_effect=AssertionError("routed to the writer")):
+        assert "requires human approval" in _sql(db_path, query, node="safe_tools")
+    assert _sql(db_path, "SELECT count(*) FROM tasks") == "[(1,)]"
+
+def test_approved_writes_go_to_the_writer(db_path):
+    with mock.patch.object(db_setup, "_run_write", return_value="") as write:
+        _sql(db_path, "INSERT INTO tasks (title) VALUES ('second')", node="execute_critical")
+    write.assert_called_once()
+
+def test_read_only_connection_cannot_write_even_if_misclassified(db_path):
+    with pytest.raises(sqlite3.Error):
+        run_read_only(db_path, "DELETE FROM tasks")
+    assert _sql(db_path, "SELECT count(*) FROM tasks") == "[(1,)]"
+
+def test_read_only_connection_refuses_vacuum_into(db_path, tmp_path):
+    copy = tmp_path / "copy.db"
+    with pytest.raises(sqlite3.DatabaseError):
+        run_read_only(db_path, f"VACUUM INTO '{copy}'")
+    assert not copy.exists()
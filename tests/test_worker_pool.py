@@ -0,0 +1,34 @@
+# ----- isolation of tool worker processes @ tests/test_worker_pool.py -----
+
+import os
+
+import pytest
+
+from services.tool_creation_service.worker_pool import WorkerPool
+
+PROBE = '''
+import os
+from langchain_core.tools import tool
+
+@tool
+def probe(name: str) -> str:
+    """Reports what the worker sees."""
+    return f"{os.environ.get(name)}|{os.getcwd()}|{sorted(os.listdir('.'))}"
+'''
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(size=1, max_calls=10, cpu_seconds=5.0, wall_seconds=30.0, memory_mb=0)
+    yield pool
+    pool.shutdown()
+
+def test_worker_cannot_see_api_secrets_or_the_api_directory(pool, tmp_path, monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "secret-key")
+    tool_file = tmp_path / "probe.py"
+    tool_file.write_text(PROBE)
+
+    result = pool.call({"name": "probe", "hash": "0" * 16, "filepath": str(tool_file)}, {"name": "GEMINI_API_KEY"})
+    secret, cwd, listing = result.split("|")
+    assert secret == "None"
+    assert os.path.realpath(cwd) != os.path.realpath(os.getcwd())
+    assert listing == "[]"